@@ -0,0 +1,79 @@
+"""
+Measures the memory held by a full regular season of parsed games: 1,312 games, parsed with nhl_api_client.parse_game
+from the landing fixtures in tests/res in turn, as the bot would hold them when every game of the season is live at once.
+
+Reported:
+    retained      the memory allocated (tracemalloc) by the season of games and still held once it is built
+    per game      retained / games
+    per object    sys.getsizeof of one instance of each datatype, with its __dict__ if it has one
+
+Run from the root of the repo:
+    python -m benchmarks.bench_datatypes_memory
+"""
+import argparse
+import gc
+import glob
+import json
+import sys
+import tracemalloc
+
+import tests.test_constants as test_constants
+from src.utils import nhl_api_client
+
+LANDING_FIXTURES = sorted(glob.glob(f"{test_constants.TEST_RES_PATH}/*_landing*.json"))
+GAMES_PER_SEASON = 1312
+
+
+def _get_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def _build_season(landings: list[dict], games: int) -> list:
+    return [nhl_api_client.parse_game(landings[i % len(landings)]) for i in range(games)]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--games", type=int, default=GAMES_PER_SEASON)
+    args = arg_parser.parse_args()
+
+    landings = []
+    for fixture in LANDING_FIXTURES:
+        with open(fixture, "r") as file:
+            landings.append(json.load(file))
+    # Warm up the memos (start times, team lookups), so that only the games are measured
+    _build_season(landings, len(landings))
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    season = _build_season(landings, args.games)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    retained = after - before
+    print(f"{len(season)} games from {len(landings)} landing fixtures")
+    print(f"{'retained':<12} {retained / 1024:10.1f} KiB")
+    print(f"{'per game':<12} {retained / len(season):10.0f} B")
+
+    game = max(season, key=lambda g: len(g.goals) + len(g.penalties))
+    samples = {
+        "Game": game,
+        "GameInfo": game.game_info,
+        "TeamStats": game.home_team_stats,
+        "Period": game.home_team_stats.periods[0],
+        "Shootout": game.home_team_stats.shootout,
+        "Goal": game.goals[0],
+        "Penalty": game.penalties[0],
+        "Team": game.home_team,
+    }
+    for name, sample in samples.items():
+        print(f"{name:<12} {_get_size(sample):10d} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures datetime_util.parse_datetime over the start times of a full regular season: 1,312 games, each with a
+`startTimeUTC` like the NHL API sends, e.g. '2023-10-10T23:00:00Z'.
+
+Every cycle the bot parses the start time of each game in the schedule and in each landing, so the same strings are
+parsed over and over. The season is parsed:
+    dateutil      with dateutil.parser.parse, which is how parse_datetime parsed before
+    fast path     with parse_datetime and an empty memo, so every distinct string goes through datetime.fromisoformat
+    memoized      with parse_datetime and a warm memo, as in every cycle after the first
+
+Run from the root of the repo:
+    python -m benchmarks.bench_datetime_parse [--iterations N]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from dateutil import parser
+
+from src.utils import datetime_util
+
+SEASON_START = datetime(2023, 10, 10, tzinfo=timezone.utc)
+SEASON_DAYS = 180
+GAMES_PER_SEASON = 1312
+# Start times in UTC: 7:00, 7:30, 8:00, 9:00 and 10:00 PM ET, and the odd afternoon game
+START_TIMES_UTC = [timedelta(hours=23), timedelta(hours=23, minutes=30), timedelta(hours=24), timedelta(hours=25),
+                   timedelta(hours=26), timedelta(hours=17)]
+
+
+def _get_season_start_times() -> list[str]:
+    start_times = []
+    for game in range(GAMES_PER_SEASON):
+        day = SEASON_START + timedelta(days=game * SEASON_DAYS // GAMES_PER_SEASON)
+        start_time = day + START_TIMES_UTC[game % len(START_TIMES_UTC)]
+        start_times.append(start_time.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return start_times
+
+
+def _time(function: Callable, iterations: int, before_each: Callable = lambda: None) -> float:
+    timings = []
+    for _ in range(iterations):
+        before_each()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    start_times = _get_season_start_times()
+    for start_time in start_times:
+        if datetime_util.parse_datetime(start_time) != parser.parse(start_time):
+            raise AssertionError(f"parse_datetime and dateutil disagree on {start_time}")
+
+    dateutil_seconds = _time(lambda: [parser.parse(start_time) for start_time in start_times], args.iterations)
+    fast_path_seconds = _time(lambda: [datetime_util.parse_datetime(start_time) for start_time in start_times], args.iterations,
+                              datetime_util.parse_datetime.cache_clear)
+    memoized_seconds = _time(lambda: [datetime_util.parse_datetime(start_time) for start_time in start_times], args.iterations)
+
+    print(f"{len(start_times)} start times, {len(set(start_times))} distinct (median of {args.iterations})")
+    print(f"{'':<12} {'season':>10} {'per string':>12} {'speedup':>8}")
+    for name, seconds in [("dateutil", dateutil_seconds), ("fast path", fast_path_seconds), ("memoized", memoized_seconds)]:
+        print(f"{name:<12} {seconds * 1e3:7.2f} ms {seconds / len(start_times) * 1e6:9.2f} us {dateutil_seconds / seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
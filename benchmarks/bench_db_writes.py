@@ -0,0 +1,63 @@
+"""
+Measures SQLite write latency under each pragma profile in db_manager.PRAGMA_PROFILES, for writes that commit one by
+one (as the DAOs do outside of a transaction) and for a cycle of writes grouped with DbManager.transaction().
+
+Each profile gets a fresh database in a temporary directory, so the results depend on the disk that directory is on.
+Pass --dir to measure on the disk the bot's database lives on.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_db_writes [--writes N] [--cycles N] [--dir PATH]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from src.db.comments.comments_dao import CommentsDao
+from src.db.db_manager import DbManager, PRAGMA_PROFILES
+
+
+def _autocommit(comments_dao: CommentsDao, first_id: int, writes: int) -> list[float]:
+    timings = []
+    for comment_id in range(first_id, first_id + writes):
+        start = time.perf_counter()
+        comments_dao.insert_comment(comment_id, comment_id)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _batched(db_manager: DbManager, comments_dao: CommentsDao, first_id: int, writes: int, cycles: int) -> list[float]:
+    timings = []
+    comment_id = first_id
+    for _ in range(cycles):
+        start = time.perf_counter()
+        with db_manager.transaction():
+            for _ in range(writes):
+                comments_dao.insert_comment(comment_id, comment_id)
+                comment_id += 1
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--writes", type=int, default=200, help="The number of writes per profile, and per cycle when batched")
+    arg_parser.add_argument("--cycles", type=int, default=20, help="The number of batched cycles per profile")
+    arg_parser.add_argument("--dir", default=None, help="The directory to create the databases in. Defaults to a temporary directory")
+    args = arg_parser.parse_args()
+
+    print(f"{'profile':<10} {'commit per write (median / p95)':>34} {'batched cycle of ' + str(args.writes) + ' writes':>28}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        for profile in PRAGMA_PROFILES:
+            db_manager = DbManager(os.path.join(directory, f"{profile}.db"), profile)
+            comments_dao = CommentsDao(db_manager)
+            single = _autocommit(comments_dao, 0, args.writes)
+            batched = _batched(db_manager, comments_dao, args.writes, args.writes, args.cycles)
+            db_manager.connection.close()
+            print(f"{profile:<10} {statistics.median(single) * 1000:15.3f} ms / {sorted(single)[int(len(single) * 0.95) - 1] * 1000:8.3f} ms "
+                  f"{statistics.median(batched) * 1000:19.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures how long it takes to import the bot's modules, from a `python -X importtime` report of a fresh interpreter
+per module, and checks that importing them has no side effects: no Lemmy login, no database connection and no .env
+read.
+
+For each module the report shows the cumulative import time of the module and the slowest imports below it.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_import_time [--repeat N] [--top N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "src.utils.environment_util",
+    "src.db.db_manager",
+    "src.utils.lemmy_client",
+    "src.main",
+]
+
+# Run in the child interpreter after the import, to report whether it did anything besides defining things.
+SIDE_EFFECTS_CHECK = """
+from src.utils.environment_util import environment_util
+from src.db.db_manager import db_manager
+from src.utils import lemmy_client
+print("env loaded:", environment_util.is_loaded, "| db connected:", db_manager.is_connected,
+      "| lemmy logged in:", lemmy_client.lemmy_client._lemmy is not None)
+"""
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return imports
+
+
+def _import(module: str) -> tuple[list[tuple[int, int, str]], str]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}\n{SIDE_EFFECTS_CHECK}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return _parse_importtime(result.stderr), result.stdout.strip()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=5, help="The number of interpreters to start per module")
+    arg_parser.add_argument("--top", type=int, default=5, help="The number of slowest imports to list per module")
+    args = arg_parser.parse_args()
+
+    for module in MODULES:
+        cumulatives = []
+        imports = []
+        side_effects = ""
+        for _ in range(args.repeat):
+            imports, side_effects = _import(module)
+            cumulatives.append(next(cumulative for _, cumulative, name in imports if name.strip() == module))
+        print(f"{module}: {statistics.median(cumulatives) / 1000:.1f} ms (median of {args.repeat})")
+        print(f"    {side_effects}")
+        for self_us, cumulative_us, name in sorted(imports, reverse=True)[:args.top]:
+            print(f"    {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures nhl_api_client.parse_game per landing fixture in tests/res, with the compiled field accessors and with the
+same paths looked up through pydash.get string paths, which is how the parser read landings before.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_landing_parse
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import pydash
+
+import tests.test_constants as test_constants
+from src.utils import nhl_api_client
+
+LANDING_FIXTURES = sorted(glob.glob(f"{test_constants.TEST_RES_PATH}/*_landing*.json"))
+
+
+def _pydash_getter(path: str):
+    def get(obj, default=None):
+        return pydash.get(obj, path, default)
+    return get
+
+
+@contextmanager
+def _pydash_getters():
+    """Temporarily swap every compiled getter in nhl_api_client for a pydash.get with the same path."""
+    originals = {name: value for name, value in vars(nhl_api_client).items() if name.startswith("GET_") and hasattr(value, "path")}
+    try:
+        for name, getter in originals.items():
+            setattr(nhl_api_client, name, _pydash_getter(getter.path))
+        yield
+    finally:
+        for name, getter in originals.items():
+            setattr(nhl_api_client, name, getter)
+
+
+def _run(landing: dict, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        nhl_api_client.parse_game(landing)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=500)
+    args = arg_parser.parse_args()
+
+    print(f"{'fixture':<44} {'pydash.get':>12} {'compiled':>12} {'speedup':>8}")
+    for fixture in LANDING_FIXTURES:
+        with open(fixture, "r") as file:
+            landing = json.load(file)
+        with _pydash_getters():
+            before = _run(landing, args.iterations)
+        after = _run(landing, args.iterations)
+        print(f"{os.path.basename(fixture):<44} {before * 1e6:9.1f} us {after * 1e6:9.1f} us {before / after:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compares opening a new connection for every NHL API request (plain requests.get) with the pooled keep-alive
+session in nhl_api_client. A local stub server serves a landing fixture, so no network access is needed.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_nhl_api_session
+"""
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import tests.test_constants as test_constants
+from src.utils import nhl_api_client
+
+LANDING_FIXTURE = f"{test_constants.TEST_RES_PATH}/2022020158_landing.json"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b""
+    connections = 0
+    connections_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with _StubHandler.connections_lock:
+            _StubHandler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _run(get, url: str, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        get(url, timeout=nhl_api_client.REQUEST_TIMEOUT).content
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(name: str, timings: list[float], connections: int):
+    print(f"{name:<24} mean {statistics.mean(timings) * 1000:8.3f} ms   "
+          f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:8.3f} ms   "
+          f"connections opened {connections}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    with open(LANDING_FIXTURE, "rb") as file:
+        _StubHandler.body = file.read()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1/gamecenter/2022020158/landing"
+
+    try:
+        _StubHandler.connections = 0
+        _report("requests.get per call", _run(requests.get, url, args.iterations), _StubHandler.connections)
+
+        _StubHandler.connections = 0
+        session = nhl_api_client.create_session()
+        _report("pooled session", _run(session.get, url, args.iterations), _StubHandler.connections)
+        session.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
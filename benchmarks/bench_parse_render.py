@@ -0,0 +1,150 @@
+"""
+Replays every JSON fixture in tests/res through the parse -> render pipeline and reports, per stage, the median time,
+the memory allocated (tracemalloc) and the throughput in games per second. Fixtures that are not NHL landings (old
+statsapi feeds, PWHL summaries) are reported as skipped.
+
+Stages:
+    load          json.loads of the fixture
+    parse         nhl_api_client.parse_game
+    gdt_cold      post_util.get_gdt_body with an empty render cache, as when a game is first rendered
+    gdt_body      post_util.get_gdt_body with a warm render cache, as in every cycle the game hasn't changed
+    daily_body    post_util.get_daily_thread_body over all parsed fixtures at once
+
+The results are also written as JSON, so runs can be compared with e.g. `diff` or `jq`.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_parse_render [--iterations N] [--output PATH] [--baseline PATH]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable
+
+import tests.test_constants as test_constants
+from src.utils import constants, nhl_api_client, post_util
+
+FIXTURES = sorted(glob.glob(f"{test_constants.TEST_RES_PATH}/*.json"))
+DEFAULT_OUTPUT = f"{constants.OUT_PATH}/benchmarks/parse_render.json"
+
+
+def _time(function: Callable, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _allocations(function: Callable) -> dict:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        function()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"retained_bytes": after - before, "peak_bytes": peak - before}
+
+
+def _measure(function: Callable, iterations: int) -> dict:
+    return {"median_seconds": _time(function, iterations), **_allocations(function)}
+
+
+def _load_landing(fixture: str):
+    with open(fixture, "r") as file:
+        text = file.read()
+    try:
+        landing = json.loads(text)
+        game = nhl_api_client.parse_game(landing)
+    except Exception as e:
+        return text, None, f"{type(e).__name__}: {e}"
+    if game is None:
+        return text, None, "parse_game returned None"
+    return text, landing, None
+
+
+def _compare(results: dict, baseline: dict):
+    print(f"Compared to the baseline from {baseline['timestamp']}:")
+    for name, fixture in results["fixtures"].items():
+        baseline_fixture = baseline["fixtures"].get(name)
+        if not baseline_fixture:
+            continue
+        for stage_name, stage in fixture["stages"].items():
+            baseline_stage = baseline_fixture["stages"].get(stage_name)
+            if baseline_stage:
+                change = stage["median_seconds"] / baseline_stage["median_seconds"] - 1
+                print(f"{name:<44} {stage_name:<10} {change * 100:+7.1f}%")
+    if "games_per_second" in results and "games_per_second" in baseline:
+        change = results["games_per_second"] / baseline["games_per_second"] - 1
+        print(f"{'all landings':<44} {'games/s':<10} {change * 100:+7.1f}%")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=200)
+    arg_parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"Where to write the JSON results. Defaults to {DEFAULT_OUTPUT}")
+    arg_parser.add_argument("--baseline", help="The JSON results of an earlier run to compare against")
+    args = arg_parser.parse_args()
+
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "fixtures": {},
+        "skipped": {},
+    }
+    games = []
+    print(f"{'fixture':<44} {'stage':<10} {'median':>10} {'peak alloc':>12} {'games/s':>10}")
+    for fixture in FIXTURES:
+        name = os.path.basename(fixture)
+        text, landing, error = _load_landing(fixture)
+        if error:
+            results["skipped"][name] = error
+            continue
+        game = nhl_api_client.parse_game(landing)
+        games.append(game)
+        stages = {
+            "load": _measure(lambda: json.loads(text), args.iterations),
+            "parse": _measure(lambda: nhl_api_client.parse_game(landing), args.iterations),
+            "gdt_cold": _measure(lambda: (post_util.render_cache.invalidate(), post_util.get_gdt_body(game)), args.iterations),
+            "gdt_body": _measure(lambda: post_util.get_gdt_body(game), args.iterations),
+        }
+        total = sum(stages[stage]["median_seconds"] for stage in ("load", "parse", "gdt_body"))
+        results["fixtures"][name] = {"stages": stages, "games_per_second": 1 / total}
+        for stage_name, stage in stages.items():
+            print(f"{name:<44} {stage_name:<10} {stage['median_seconds'] * 1e6:7.1f} us {stage['peak_bytes'] / 1024:9.1f} KiB")
+        print(f"{name:<44} {'total':<10} {total * 1e6:7.1f} us {'':>12} {1 / total:10.1f}")
+
+    if games:
+        daily_body = _measure(lambda: post_util.get_daily_thread_body(games), args.iterations)
+        results["daily_body"] = {**daily_body, "games": len(games)}
+        print(f"{'all landings':<44} {'daily_body':<10} {daily_body['median_seconds'] * 1e6:7.1f} us {daily_body['peak_bytes'] / 1024:9.1f} KiB")
+        pipeline = sum(fixture["stages"][stage]["median_seconds"] for fixture in results["fixtures"].values() for stage in ("load", "parse", "gdt_body"))
+        pipeline += daily_body["median_seconds"]
+        results["games_per_second"] = len(games) / pipeline
+        print(f"{'all landings':<44} {'pipeline':<10} {pipeline * 1e6:7.1f} us {'':>12} {len(games) / pipeline:10.1f}")
+
+    for name, error in results["skipped"].items():
+        print(f"skipped {name}: {error}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            _compare(results, json.load(file))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
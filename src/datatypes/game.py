@@ -17,7 +17,7 @@ class GameType(Enum):
     ALLSTAR = 4
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Game:
     id: int
     away_team: Team
@@ -27,8 +27,16 @@ class Game:
     game_info: GameInfo
     away_team_stats: Optional[TeamStats]
     home_team_stats: Optional[TeamStats]
-    goals: Optional[list[Goal]]
-    penalties: Optional[list[Penalty]]
+    goals: Optional[tuple[Goal, ...]]
+    penalties: Optional[tuple[Penalty, ...]]
+
+    def __post_init__(self):
+        # Games are frozen, so the goals and penalties are converted through object.__setattr__. They are stored as
+        #  tuples, so that the game is hashable. The parser builds them as lists.
+        if self.goals is not None:
+            object.__setattr__(self, "goals", tuple(self.goals))
+        if self.penalties is not None:
+            object.__setattr__(self, "penalties", tuple(self.penalties))
 
     # This gets the game type by retrieving the 6th character in the game id.
     # 1 -> preseason
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from src.datatypes.goal import Goal
+from src.datatypes.penalty import Penalty
+
+
+@dataclass(frozen=True, slots=True)
+class GoalAdded:
+    game_id: int
+    goal: Goal
+
+
+@dataclass(frozen=True, slots=True)
+class PenaltyAdded:
+    game_id: int
+    penalty: Penalty
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodChanged:
+    game_id: int
+    old_period: Optional[str]
+    new_period: str
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreChanged:
+    game_id: int
+    away_goals: int
+    home_goals: int
+
+
+@dataclass(frozen=True, slots=True)
+class GameFinalized:
+    game_id: int
+
+
+GameEvent = Union[GoalAdded, PenaltyAdded, PeriodChanged, ScoreChanged, GameFinalized]
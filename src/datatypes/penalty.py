@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from src.datatypes.teams import Team
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Penalty:
     period: str
     time: str
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class StartTimes:
+    # The day the game is listed under, in ET, e.g. '2023-11-10'
+    day_key: str
+    # The start time in ET with the time zone, e.g. '07:00PM EST'
+    formatted: str
+    # The start time in each time zone of the start time table, e.g. '04:00PM'
+    pt: str
+    mt: str
+    ct: str
+    et: str
+    at: str
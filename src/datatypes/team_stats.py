@@ -5,7 +5,7 @@ from src.datatypes.shootout import Shootout
 
 
 # TODO: consider renaming this class and file
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TeamStats:
     goals: int
     shots: int
@@ -15,5 +15,9 @@ class TeamStats:
     giveaways: int
     takeaways: int
     pp_fraction: str
-    periods: list[Period]
+    periods: tuple[Period, ...]
     shootout: Shootout
+
+    def __post_init__(self):
+        # Stored as a tuple, so that the stats are hashable. The parser builds the periods as a list.
+        object.__setattr__(self, "periods", tuple(self.periods))
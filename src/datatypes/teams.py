@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from enum import Enum, EnumMeta
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Team:
     id: int
     abbreviation: str
@@ -36,8 +36,13 @@ class Team:
         return table_entry
 
     def __eq__(self, other: Team):
+        if not isinstance(other, Team):
+            return NotImplemented
         return self.id == other.id
 
+    def __hash__(self):
+        return hash(self.id)
+
 
 class TeamsEnumMeta(EnumMeta):
 
@@ -2,6 +2,7 @@ from typing import Optional
 
 from src.db.comments.comments_record import CommentsRecord
 from src.db.db_manager import db_manager, DbManager
+from src.db.record_cache import RecordCache, MISSING
 from src.utils.log_util import LOGGER
 
 # Keeping these here for reference, but don't use them because formatted strings in queries are bad.
@@ -21,6 +22,24 @@ class CommentsDao:
             db_manager (DbManager): The database manager object.
         """
         self.db_manager = db_manager
+        # Comments by game ID. None is cached for games that are known not to have a comment.
+        self.cache = RecordCache()
+        self.db_manager.register_cache(self.cache)
+
+    def warm_cache(self):
+        """
+        Load the most recent comments into the cache, so that the first cycle doesn't have to read them one by one.
+
+        Returns:
+            None
+        """
+        query = "SELECT * FROM comments ORDER BY comment_id DESC LIMIT ?"
+        params = (self.cache.max_entries,)
+        LOGGER.i(TAG, f"warm_cache(): executing {query} with params {params}")
+        vals = self.db_manager.cursor.execute(query, params).fetchall()
+        # Oldest first, so that the most recent comments are the last to be evicted
+        for val in reversed(vals):
+            self.cache.put(val[1], CommentsRecord(val[0], val[1]))
 
     def get_comment(self, game_id: int) -> Optional[CommentsRecord]:
         """
@@ -32,13 +51,46 @@ class CommentsDao:
         Returns:
             Optional[CommentsRecord]: The comment record if it exists, None otherwise.
         """
+        cached = self.cache.get(game_id)
+        if cached is not MISSING:
+            return cached
         query = "SELECT * FROM comments WHERE game_id=?"
         params = (game_id,)
         LOGGER.i(TAG, f"get_comment_id(): executing {query} with params {params}")
         val = self.db_manager.cursor.execute(query, params).fetchone()
-        if val is not None:
-            return CommentsRecord(val[0], val[1])
-        return None
+        comment = CommentsRecord(val[0], val[1]) if val is not None else None
+        self.cache.put(game_id, comment)
+        return comment
+
+    def get_comments(self, game_ids: list[int]) -> dict[int, CommentsRecord]:
+        """
+        Retrieve the comment records for several games with a single query.
+
+        Args:
+            game_ids (list[int]): The IDs of the games.
+
+        Returns:
+            dict[int, CommentsRecord]: The comment records keyed by game ID. Games without a comment are left out.
+        """
+        out = {}
+        uncached_game_ids = []
+        for game_id in game_ids:
+            cached = self.cache.get(game_id)
+            if cached is MISSING:
+                uncached_game_ids.append(game_id)
+            elif cached is not None:
+                out[game_id] = cached
+        if not uncached_game_ids:
+            return out
+        query = f"SELECT * FROM comments WHERE game_id IN ({', '.join('?' * len(uncached_game_ids))})"
+        params = tuple(uncached_game_ids)
+        LOGGER.d(TAG, f"get_comments(): executing {query} with params {params}")
+        vals = self.db_manager.cursor.execute(query, params).fetchall()
+        for val in vals:
+            out[val[1]] = CommentsRecord(val[0], val[1])
+        for game_id in uncached_game_ids:
+            self.cache.put(game_id, out.get(game_id))
+        return out
 
     def insert_comment(self, comment_id: int, game_id: int) -> Optional[CommentsRecord]:
         """
@@ -54,10 +106,12 @@ class CommentsDao:
         query = "INSERT INTO comments VALUES(?, ?) RETURNING *"
         params = (comment_id, game_id)
         LOGGER.i(TAG, f"insert_comment(): executing {query} with params {params}")
-        val = self.db_manager.cursor.execute(query, params).fetchone()
-        self.db_manager.connection.commit()
+        with self.db_manager.transaction():
+            val = self.db_manager.cursor.execute(query, params).fetchone()
         if val is not None:
-            return CommentsRecord(val[0], val[1])
+            comment = CommentsRecord(val[0], val[1])
+            self.cache.put(game_id, comment)
+            return comment
         else:
             return None
 
@@ -74,9 +128,11 @@ class CommentsDao:
         query = "DELETE FROM comments WHERE comment_id=? RETURNING *"
         params = (comment_id,)
         LOGGER.i(TAG, f"delete_comment(): executing {query} with params {params}")
-        val = self.db_manager.cursor.execute(query, params).fetchone()
-        self.db_manager.connection.commit()
+        with self.db_manager.transaction():
+            val = self.db_manager.cursor.execute(query, params).fetchone()
         if val is not None:
+            # The game may have another comment, so read it from the db next time rather than caching None.
+            self.cache.invalidate(val[1])
             return CommentsRecord(val[0], val[1])
         else:
             return None
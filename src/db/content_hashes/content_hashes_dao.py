@@ -0,0 +1,98 @@
+from typing import Optional
+
+from src.db.content_hashes.content_hashes_record import ContentHashesRecord
+from src.db.db_manager import DbManager, db_manager
+from src.db.record_cache import RecordCache, MISSING
+from src.utils.log_util import LOGGER
+
+# Keeping these here for reference, but don't use them because formatted strings in queries are bad.
+# TABLE_CONTENT_HASHES = 'content_hashes'
+# COLUMN_TARGET_TYPE = 'target_type'
+# COLUMN_TARGET_ID = 'target_id'
+# COLUMN_TITLE_HASH = 'title_hash'
+# COLUMN_BODY_HASH = 'body_hash'
+
+TAG = "ContentHashesDao"
+
+# Game day threads and daily threads are both posts, and share the same ID space on Lemmy.
+TARGET_TYPE_POST = "post"
+TARGET_TYPE_COMMENT = "comment"
+
+
+class ContentHashesDao:
+    def __init__(self, db_manager: DbManager):
+        """
+        Initializes an instance of the class.
+
+        Args:
+            db_manager (DbManager): The database manager object.
+        """
+        self.db_manager = db_manager
+        # Content hashes by (target_type, target_id). None is cached for targets that are known not to have hashes.
+        self.cache = RecordCache()
+        self.db_manager.register_cache(self.cache)
+
+    def warm_cache(self):
+        """
+        Load the most recently stored content hashes into the cache.
+
+        Returns:
+            None
+        """
+        # INSERT OR REPLACE gives the replaced row a new rowid, so the highest rowids are the most recently sent.
+        query = "SELECT * FROM content_hashes ORDER BY rowid DESC LIMIT ?"
+        params = (self.cache.max_entries,)
+        LOGGER.i(TAG, f"warm_cache(): executing {query} with params {params}")
+        vals = self.db_manager.cursor.execute(query, params).fetchall()
+        # Oldest first, so that the most recent hashes are the last to be evicted
+        for val in reversed(vals):
+            self.cache.put((val[0], val[1]), ContentHashesRecord(val[0], val[1], val[2], val[3]))
+
+    def get_content_hashes(self, target_type: str, target_id: int) -> Optional[ContentHashesRecord]:
+        """
+        Retrieve the hashes of the content that was last sent to Lemmy for a post or comment.
+
+        Args:
+            target_type (str): TARGET_TYPE_POST or TARGET_TYPE_COMMENT.
+            target_id (int): The ID of the post or comment.
+
+        Returns:
+            Optional[ContentHashesRecord]: The content hashes record if it exists, None otherwise.
+        """
+        cached = self.cache.get((target_type, target_id))
+        if cached is not MISSING:
+            return cached
+        query = "SELECT * FROM content_hashes WHERE target_type=? AND target_id=?"
+        params = (target_type, target_id)
+        LOGGER.i(TAG, f"get_content_hashes(): executing {query} with params {params}")
+        val = self.db_manager.cursor.execute(query, params).fetchone()
+        content_hashes = ContentHashesRecord(val[0], val[1], val[2], val[3]) if val is not None else None
+        self.cache.put((target_type, target_id), content_hashes)
+        return content_hashes
+
+    def upsert_content_hashes(self, target_type: str, target_id: int, title_hash: Optional[str], body_hash: str) -> Optional[ContentHashesRecord]:
+        """
+        Insert or replace the hashes of the content that was sent to Lemmy for a post or comment.
+
+        Args:
+            target_type (str): TARGET_TYPE_POST or TARGET_TYPE_COMMENT.
+            target_id (int): The ID of the post or comment.
+            title_hash (Optional[str]): The hash of the title. None for comments.
+            body_hash (str): The hash of the body.
+
+        Returns:
+            Optional[ContentHashesRecord]: The stored content hashes record, if successful. Otherwise, None.
+        """
+        query = "INSERT OR REPLACE INTO content_hashes VALUES(?, ?, ?, ?) RETURNING *"
+        params = (target_type, target_id, title_hash, body_hash)
+        LOGGER.i(TAG, f"upsert_content_hashes(): executing {query} with params {params}")
+        with self.db_manager.transaction():
+            val = self.db_manager.cursor.execute(query, params).fetchone()
+        if val is not None:
+            content_hashes = ContentHashesRecord(val[0], val[1], val[2], val[3])
+            self.cache.put((target_type, target_id), content_hashes)
+            return content_hashes
+        return None
+
+
+content_hashes_dao = ContentHashesDao(db_manager)
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ContentHashesRecord:
+    target_type: str
+    target_id: int
+    title_hash: Optional[str]
+    body_hash: str
@@ -2,6 +2,7 @@ from typing import Optional
 
 from src.db.daily_threads.daily_threads_record import DailyThreadsRecord
 from src.db.db_manager import DbManager, db_manager
+from src.db.record_cache import RecordCache, MISSING
 from src.utils.log_util import LOGGER
 
 # Keeping these here for reference, but don't use them because formatted strings in queries are bad.
@@ -15,6 +16,24 @@ TAG = "DailyThreadsDao"
 class DailyThreadsDao:
     def __init__(self, db_manager: DbManager):
         self.db_manager = db_manager
+        # Daily threads by date. None is cached for dates that are known not to have a daily thread.
+        self.cache = RecordCache()
+        self.db_manager.register_cache(self.cache)
+
+    def warm_cache(self):
+        """
+        Load the most recent daily threads into the cache.
+
+        Returns:
+            None
+        """
+        query = "SELECT * FROM daily_threads ORDER BY date DESC LIMIT ?"
+        params = (self.cache.max_entries,)
+        LOGGER.i(TAG, f"warm_cache(): executing {query} with params {params}")
+        vals = self.db_manager.cursor.execute(query, params).fetchall()
+        # Oldest first, so that the most recent daily threads are the last to be evicted
+        for val in reversed(vals):
+            self.cache.put(val[1], DailyThreadsRecord(val[0], val[1], val[2]))
 
     def get_daily_thread(self, date: str) -> Optional[DailyThreadsRecord]:
         """
@@ -26,13 +45,16 @@ class DailyThreadsDao:
         Returns:
             Optional[DailyThreadsRecord]: The daily thread record if found, None otherwise.
         """
+        cached = self.cache.get(date)
+        if cached is not MISSING:
+            return cached
         query = "SELECT * FROM daily_threads WHERE date=?"
         params = (date,)
         LOGGER.i(TAG, f"get_daily_thread_id(): executing {query} with params {params}")
         val = self.db_manager.cursor.execute(query, params).fetchone()
-        if val is not None:
-            return DailyThreadsRecord(val[0], val[1], val[2])
-        return None
+        daily_thread = DailyThreadsRecord(val[0], val[1], val[2]) if val is not None else None
+        self.cache.put(date, daily_thread)
+        return daily_thread
 
     def get_most_recent_daily_thread(self) -> Optional[DailyThreadsRecord]:
         """
@@ -63,10 +85,12 @@ class DailyThreadsDao:
         query = "INSERT INTO daily_threads VALUES(?, ?, ?) RETURNING *"
         params = (post_id, date, is_featured)
         LOGGER.i(TAG, f"insert_daily_thread(): executing {query} with params {params}")
-        val = self.db_manager.cursor.execute(query, params).fetchone()
-        self.db_manager.connection.commit()
+        with self.db_manager.transaction():
+            val = self.db_manager.cursor.execute(query, params).fetchone()
         if val is not None:
-            return DailyThreadsRecord(val[0], val[1], val[2])
+            daily_thread = DailyThreadsRecord(val[0], val[1], val[2])
+            self.cache.put(daily_thread.date, daily_thread)
+            return daily_thread
         return None
 
     def feature_daily_thread(self, post_id):
@@ -83,10 +107,12 @@ class DailyThreadsDao:
         query = "UPDATE daily_threads SET is_featured = true WHERE post_id=? RETURNING *"
         params = (post_id,)
         LOGGER.i(TAG, f"feature_daily_thread(): executing {query} with params {params}")
-        val = self.db_manager.cursor.execute(query, params).fetchone()
-        self.db_manager.connection.commit()
+        with self.db_manager.transaction():
+            val = self.db_manager.cursor.execute(query, params).fetchone()
         if val is not None:
-            return DailyThreadsRecord(val[0], val[1], val[2])
+            daily_thread = DailyThreadsRecord(val[0], val[1], val[2])
+            self.cache.put(daily_thread.date, daily_thread)
+            return daily_thread
         return None
 
     def unfeature_daily_thread(self, post_id):
@@ -103,10 +129,12 @@ class DailyThreadsDao:
         query = "UPDATE daily_threads SET is_featured = false WHERE post_id=? RETURNING *"
         params = (post_id,)
         LOGGER.i(TAG, f"feature_daily_thread(): executing {query} with params {params}")
-        val = self.db_manager.cursor.execute(query, params).fetchone()
-        self.db_manager.connection.commit()
+        with self.db_manager.transaction():
+            val = self.db_manager.cursor.execute(query, params).fetchone()
         if val is not None:
-            return DailyThreadsRecord(val[0], val[1], val[2])
+            daily_thread = DailyThreadsRecord(val[0], val[1], val[2])
+            self.cache.put(daily_thread.date, daily_thread)
+            return daily_thread
         return None
 
     def get_featured_daily_threads(self):
@@ -121,7 +149,9 @@ class DailyThreadsDao:
         vals = self.db_manager.cursor.execute(query).fetchall()
         out = []
         for val in vals:
-            out.append(DailyThreadsRecord(val[0], val[1], val[2]))
+            daily_thread = DailyThreadsRecord(val[0], val[1], val[2])
+            self.cache.put(daily_thread.date, daily_thread)
+            out.append(daily_thread)
         return out
 
 
@@ -1,7 +1,11 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from sqlite3 import Error
+from typing import Optional
 
 from src.utils import constants
+from src.utils.environment_util import environment_util
 from src.utils.log_util import LOGGER
 
 global connection
@@ -14,30 +18,198 @@ global cursor
 
 TAG = 'DbManager'
 
+PRAGMA_PROFILE_DEFAULT = 'default'
+PRAGMA_PROFILE_WAL = 'wal'
+PRAGMA_PROFILE_WAL_FULL = 'wal_full'
+
+# The pragmas to set when connecting, by profile name.
+# 'default' keeps SQLite's defaults: a rollback journal and synchronous=FULL, so every commit is an fsync of the db and the journal.
+# 'wal_full' switches to a write-ahead log, but still syncs the log on every commit.
+# 'wal' only syncs the log at checkpoints. A commit can be lost on power loss, but the db can't be corrupted.
+PRAGMA_PROFILES = {
+    PRAGMA_PROFILE_DEFAULT: {},
+    PRAGMA_PROFILE_WAL_FULL: {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+    },
+    PRAGMA_PROFILE_WAL: {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        # Negative values are in KiB
+        'cache_size': -8000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
 
 class DbManager:
 
-    def __init__(self, path_to_db):
+    def __init__(self, path_to_db, pragma_profile: Optional[str] = PRAGMA_PROFILE_DEFAULT):
         """
-        Initialize the Database object.
+        Initialize the Database object. The connection is only opened, and the schema upgraded, the first time the
+        connection or the cursor is used, so that creating the object has no side effects.
 
         Args:
             path_to_db (str): The path to the SQLite database file.
+            pragma_profile (Optional[str], optional): The name of the pragma profile in PRAGMA_PROFILES to apply. If None, DB_PRAGMA_PROFILE from the environment is used. Defaults to PRAGMA_PROFILE_DEFAULT.
         """
-        self.DB_SCHEMA_VERSION = 3
+        self.DB_SCHEMA_VERSION = 6
         self.path_to_db = path_to_db
-        self.connection = None
-        self.cursor = None
+        self.pragma_profile = pragma_profile
+        self.is_connected = False
+        self._connection = None
+        # The connection is shared by the main thread and the Lemmy writer thread, but each thread uses its own cursor and
+        #  keeps its own transaction depth.
+        self._thread_local = threading.local()
+        # SQLite has one transaction per connection, so only one thread at a time writes. A thread holds the lock for the
+        #  whole of its transaction, so that another thread's writes don't join it, and aren't committed or rolled back with it.
+        self._lock = threading.RLock()
+        self.caches = []
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if not self.is_connected:
+            self.connect()
+        return self._connection
+
+    @connection.setter
+    def connection(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    @property
+    def transaction_depth(self) -> int:
+        return getattr(self._thread_local, 'transaction_depth', 0)
+
+    @transaction_depth.setter
+    def transaction_depth(self, transaction_depth: int):
+        self._thread_local.transaction_depth = transaction_depth
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        if not self.is_connected:
+            self.connect()
+        cursor = getattr(self._thread_local, 'cursor', None)
+        if cursor is None:
+            cursor = self._connection.cursor()
+            self._thread_local.cursor = cursor
+        return cursor
+
+    @cursor.setter
+    def cursor(self, cursor: sqlite3.Cursor):
+        self._thread_local.cursor = cursor
+
+    def connect(self):
+        """
+        Open the connection to the database, apply the pragma profile and upgrade the schema to the latest version.
 
+        Returns:
+            None
+        """
+        self.is_connected = True
+        LOGGER.i(TAG, f"connect(): Connecting to {self.path_to_db}")
         try:
-            self.connection = sqlite3.connect(path_to_db)
-            self.cursor = self.connection.cursor()
-            LOGGER.i(TAG, "__init__(): Connection to SQLite DB successful")
+            # SQLite serializes the use of the connection by several threads itself
+            self._connection = sqlite3.connect(self.path_to_db, check_same_thread=False)
+            self._thread_local.cursor = self._connection.cursor()
+            LOGGER.i(TAG, "connect(): Connection to SQLite DB successful")
         except Error as e:
-            LOGGER.e(TAG, "__init__(): Error occurred", e)
+            LOGGER.e(TAG, "connect(): Error occurred", e)
 
+        pragma_profile = self.pragma_profile if self.pragma_profile is not None else environment_util.db_pragma_profile
+        self.apply_pragma_profile(pragma_profile)
         self.upgrade_db_schema()
 
+    def apply_pragma_profile(self, pragma_profile: str):
+        """
+        Set the pragmas of a profile on the connection. Unknown profiles fall back to PRAGMA_PROFILE_DEFAULT.
+
+        Args:
+            pragma_profile (str): The name of the pragma profile in PRAGMA_PROFILES.
+
+        Returns:
+            None
+        """
+        pragmas = PRAGMA_PROFILES.get(pragma_profile)
+        if pragmas is None:
+            LOGGER.w(TAG, f"apply_pragma_profile(): Unknown pragma profile '{pragma_profile}'. Using '{PRAGMA_PROFILE_DEFAULT}'.")
+            pragmas = PRAGMA_PROFILES[PRAGMA_PROFILE_DEFAULT]
+        for name, value in pragmas.items():
+            # Pragmas can't be parameterized. The names and values only come from PRAGMA_PROFILES.
+            query = f"PRAGMA {name}={value}"
+            LOGGER.i(TAG, f"apply_pragma_profile(): executing {query}")
+            self.cursor.execute(query).fetchall()
+
+    def commit(self):
+        """
+        Commit the pending changes, unless this thread has a transaction open, in which case they are committed when it
+        ends. Waits for a transaction open on another thread to end first.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self.transaction_depth == 0:
+                self.connection.commit()
+
+    def commit_now(self):
+        """
+        Commit whatever has been written on the connection, even in a transaction that another thread has open. Only for
+        shutting down, when that thread may not get to end its transaction.
+
+        Returns:
+            None
+        """
+        try:
+            self.connection.commit()
+        except Error as e:
+            LOGGER.e(TAG, "commit_now(): Error occurred", e)
+
+    def register_cache(self, cache):
+        """
+        Register a cache of records read from this database, so that it is cleared when a transaction is rolled back.
+
+        Args:
+            cache (RecordCache): The cache.
+
+        Returns:
+            None
+        """
+        self.caches.append(cache)
+
+    @contextmanager
+    def transaction(self, rollback_on_error: bool = True):
+        """
+        Group the writes made inside the block into a single commit. Transactions can be nested; only the outermost one commits.
+        Only one thread has a transaction open at a time. Other threads wait for it to end.
+
+        Args:
+            rollback_on_error (bool, optional): Whether to roll back the writes if the block raises. If False, the writes
+                made before the exception are committed. Defaults to True.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.transaction_depth += 1
+            try:
+                yield
+            except BaseException:
+                self.transaction_depth -= 1
+                if self.transaction_depth == 0:
+                    if rollback_on_error:
+                        LOGGER.w(TAG, "transaction(): Rolling back")
+                        self.connection.rollback()
+                        # The caches may hold records that were written in the transaction
+                        for cache in self.caches:
+                            cache.invalidate()
+                    else:
+                        self.connection.commit()
+                raise
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.connection.commit()
+
     def create_tables(self):
         """
         Creates tables in the database if they don't already exist.
@@ -116,6 +288,66 @@ class DbManager:
         self.cursor.execute("ALTER TABLE daily_threads ADD COLUMN is_featured BOOLEAN NOT NULL DEFAULT false")
         LOGGER.d(TAG, "upgrade_db_to_version_3: ")
 
+    def upgrade_db_to_version_4(self):
+        """
+        Upgrade the database to version 4 by creating the 'content_hashes' table.
+
+        The table stores hashes of the title and body that were last sent to Lemmy for each post and comment,
+        so that edits can be skipped when the content hasn't changed.
+
+        Note: This function assumes that a database connection has already been established.
+        """
+        LOGGER.w(TAG, "upgrade_db_to_version_4(): upgrading db to version 4")
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS content_hashes(
+                target_type TEXT NOT NULL,
+                target_id INTEGER NOT NULL,
+                title_hash TEXT,
+                body_hash TEXT NOT NULL,
+                PRIMARY KEY (target_type, target_id)
+            )
+            """
+        )
+        LOGGER.d(TAG, "upgrade_db_to_version_4(): completed")
+
+    def upgrade_db_to_version_5(self):
+        """
+        Upgrade the database to version 5 by adding indexes on the 'game_id' columns of the 'comments' and
+        'game_day_threads' tables, which are used to look up records by game.
+
+        Note: This function assumes that a database connection has already been established.
+        """
+        LOGGER.w(TAG, "upgrade_db_to_version_5(): upgrading db to version 5")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS comments_game_id_index ON comments(game_id)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS game_day_threads_game_id_index ON game_day_threads(game_id)")
+        LOGGER.d(TAG, "upgrade_db_to_version_5(): completed")
+
+    def upgrade_db_to_version_6(self):
+        """
+        Upgrade the database to version 6 by creating the 'lemmy_sessions' table.
+
+        The table stores the login token and the community ID of the bot, so that they can be reused after a restart
+        instead of logging in again.
+
+        Note: This function assumes that a database connection has already been established.
+        """
+        LOGGER.w(TAG, "upgrade_db_to_version_6(): upgrading db to version 6")
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lemmy_sessions(
+                lemmy_instance TEXT NOT NULL,
+                bot_name TEXT NOT NULL,
+                community_name TEXT NOT NULL,
+                jwt TEXT NOT NULL,
+                community_id INTEGER NOT NULL,
+                expires_at TEXT NOT NULL,
+                PRIMARY KEY (lemmy_instance, bot_name, community_name)
+            )
+            """
+        )
+        LOGGER.d(TAG, "upgrade_db_to_version_6(): completed")
+
     def set_db_schema_version(self, version: int) -> bool:
         """
         Sets the database schema version.
@@ -173,6 +405,9 @@ class DbManager:
                 1: self.create_tables,
                 2: self.upgrade_db_to_version_2,
                 3: self.upgrade_db_to_version_3,
+                4: self.upgrade_db_to_version_4,
+                5: self.upgrade_db_to_version_5,
+                6: self.upgrade_db_to_version_6,
             }
 
             upgrade.get(from_version + 1, lambda: None)()
@@ -181,4 +416,4 @@ class DbManager:
         self.set_db_schema_version(self.DB_SCHEMA_VERSION)
 
 
-db_manager = DbManager(constants.DB_PATH)
+db_manager = DbManager(constants.DB_PATH, None)
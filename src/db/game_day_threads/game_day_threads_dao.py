@@ -2,6 +2,7 @@ from typing import Optional
 
 from src.db.db_manager import DbManager, db_manager
 from src.db.game_day_threads.game_day_threads_record import GameDayThreadRecord
+from src.db.record_cache import RecordCache, MISSING
 from src.utils.log_util import LOGGER
 
 # Keeping these here for reference, but don't use them because formatted strings in queries are bad.
@@ -21,6 +22,24 @@ class GameDayThreadsDao:
             db_manager (DbManager): The instance of the DbManager class to be used for database operations.
         """
         self.db_manager = db_manager
+        # Game day threads by game ID. None is cached for games that are known not to have a game day thread.
+        self.cache = RecordCache()
+        self.db_manager.register_cache(self.cache)
+
+    def warm_cache(self):
+        """
+        Load the most recent game day threads into the cache, so that the first cycle doesn't have to read them one by one.
+
+        Returns:
+            None
+        """
+        query = "SELECT * FROM game_day_threads ORDER BY post_id DESC LIMIT ?"
+        params = (self.cache.max_entries,)
+        LOGGER.i(TAG, f"warm_cache(): executing {query} with params {params}")
+        vals = self.db_manager.cursor.execute(query, params).fetchall()
+        # Oldest first, so that the most recent game day threads are the last to be evicted
+        for val in reversed(vals):
+            self.cache.put(val[1], GameDayThreadRecord(val[0], val[1]))
 
     def get_game_day_thread(self, game_id: int) -> Optional[GameDayThreadRecord]:
         """
@@ -32,13 +51,46 @@ class GameDayThreadsDao:
         Returns:
             Optional[GameDayThreadRecord]: The retrieved GameDayThreadRecord if it exists, else None.
         """
+        cached = self.cache.get(game_id)
+        if cached is not MISSING:
+            return cached
         query = "SELECT * FROM game_day_threads WHERE game_id=?"
         params = (game_id,)
         LOGGER.i(TAG, f"get_post_id(): executing {query} with params {params}")
         val = self.db_manager.cursor.execute(query, params).fetchone()
-        if val is not None:
-            return GameDayThreadRecord(val[0], val[1])
-        return None
+        game_day_thread = GameDayThreadRecord(val[0], val[1]) if val is not None else None
+        self.cache.put(game_id, game_day_thread)
+        return game_day_thread
+
+    def get_game_day_threads(self, game_ids: list[int]) -> dict[int, GameDayThreadRecord]:
+        """
+        Retrieves the GameDayThreadRecords for several games with a single query.
+
+        Args:
+            game_ids (list[int]): The IDs of the games.
+
+        Returns:
+            dict[int, GameDayThreadRecord]: The GameDayThreadRecords keyed by game ID. Games without a game day thread are left out.
+        """
+        out = {}
+        uncached_game_ids = []
+        for game_id in game_ids:
+            cached = self.cache.get(game_id)
+            if cached is MISSING:
+                uncached_game_ids.append(game_id)
+            elif cached is not None:
+                out[game_id] = cached
+        if not uncached_game_ids:
+            return out
+        query = f"SELECT * FROM game_day_threads WHERE game_id IN ({', '.join('?' * len(uncached_game_ids))})"
+        params = tuple(uncached_game_ids)
+        LOGGER.d(TAG, f"get_game_day_threads(): executing {query} with params {params}")
+        vals = self.db_manager.cursor.execute(query, params).fetchall()
+        for val in vals:
+            out[val[1]] = GameDayThreadRecord(val[0], val[1])
+        for game_id in uncached_game_ids:
+            self.cache.put(game_id, out.get(game_id))
+        return out
 
     def insert_game_day_thread(self, post_id: int, game_id: int):
         """
@@ -54,8 +106,9 @@ class GameDayThreadsDao:
         query = "INSERT INTO game_day_threads VALUES(?, ?)"
         params = (post_id, game_id)
         LOGGER.i(TAG, f"insert_post(): executing {query} with params {params}")
-        self.db_manager.cursor.execute(query, params)
-        self.db_manager.connection.commit()
+        with self.db_manager.transaction():
+            self.db_manager.cursor.execute(query, params)
+        self.cache.put(game_id, GameDayThreadRecord(post_id, game_id))
         return post_id
 
 
@@ -0,0 +1,93 @@
+from typing import Optional
+
+from src.db.db_manager import DbManager, db_manager
+from src.db.lemmy_sessions.lemmy_sessions_record import LemmySessionsRecord
+from src.utils.log_util import LOGGER
+
+# Keeping these here for reference, but don't use them because formatted strings in queries are bad.
+# TABLE_LEMMY_SESSIONS = 'lemmy_sessions'
+# COLUMN_LEMMY_INSTANCE = 'lemmy_instance'
+# COLUMN_BOT_NAME = 'bot_name'
+# COLUMN_COMMUNITY_NAME = 'community_name'
+# COLUMN_JWT = 'jwt'
+# COLUMN_COMMUNITY_ID = 'community_id'
+# COLUMN_EXPIRES_AT = 'expires_at'
+
+TAG = "LemmySessionsDao"
+
+
+class LemmySessionsDao:
+    def __init__(self, db_manager: DbManager):
+        """
+        Initializes an instance of the class.
+
+        Args:
+            db_manager (DbManager): The database manager object.
+        """
+        self.db_manager = db_manager
+
+    def get_lemmy_session(self, lemmy_instance: str, bot_name: str, community_name: str) -> Optional[LemmySessionsRecord]:
+        """
+        Retrieve the stored login and community ID of the bot on a Lemmy instance.
+
+        Args:
+            lemmy_instance (str): The URL of the Lemmy instance.
+            bot_name (str): The name of the bot.
+            community_name (str): The name of the community.
+
+        Returns:
+            Optional[LemmySessionsRecord]: The session record if it exists, None otherwise. The record may have expired.
+        """
+        query = "SELECT * FROM lemmy_sessions WHERE lemmy_instance=? AND bot_name=? AND community_name=?"
+        params = (lemmy_instance, bot_name, community_name)
+        LOGGER.i(TAG, f"get_lemmy_session(): executing {query} with params {params}")
+        val = self.db_manager.cursor.execute(query, params).fetchone()
+        if val is not None:
+            return LemmySessionsRecord(val[0], val[1], val[2], val[3], val[4], val[5])
+        return None
+
+    def upsert_lemmy_session(self, lemmy_instance: str, bot_name: str, community_name: str, jwt: str, community_id: int, expires_at: str) -> Optional[LemmySessionsRecord]:
+        """
+        Insert or replace the login and community ID of the bot on a Lemmy instance.
+
+        Args:
+            lemmy_instance (str): The URL of the Lemmy instance.
+            bot_name (str): The name of the bot.
+            community_name (str): The name of the community.
+            jwt (str): The token returned by the login.
+            community_id (int): The ID of the community.
+            expires_at (str): When the session should no longer be reused, in ISO 8601 in UTC.
+
+        Returns:
+            Optional[LemmySessionsRecord]: The stored session record, if successful. Otherwise, None.
+        """
+        query = "INSERT OR REPLACE INTO lemmy_sessions VALUES(?, ?, ?, ?, ?, ?) RETURNING *"
+        params = (lemmy_instance, bot_name, community_name, jwt, community_id, expires_at)
+        # The JWT is a credential, so it isn't logged
+        LOGGER.i(TAG, f"upsert_lemmy_session(): executing {query} with params {(lemmy_instance, bot_name, community_name, community_id, expires_at)}")
+        with self.db_manager.transaction():
+            val = self.db_manager.cursor.execute(query, params).fetchone()
+        if val is not None:
+            return LemmySessionsRecord(val[0], val[1], val[2], val[3], val[4], val[5])
+        return None
+
+    def delete_lemmy_session(self, lemmy_instance: str, bot_name: str, community_name: str):
+        """
+        Delete the stored login of the bot on a Lemmy instance, so that the next start logs in again.
+
+        Args:
+            lemmy_instance (str): The URL of the Lemmy instance.
+            bot_name (str): The name of the bot.
+            community_name (str): The name of the community.
+
+        Returns:
+            None
+        """
+        query = "DELETE FROM lemmy_sessions WHERE lemmy_instance=? AND bot_name=? AND community_name=?"
+        params = (lemmy_instance, bot_name, community_name)
+        LOGGER.i(TAG, f"delete_lemmy_session(): executing {query} with params {params}")
+        with self.db_manager.transaction():
+            self.db_manager.cursor.execute(query, params)
+
+
+lemmy_sessions_dao = LemmySessionsDao(db_manager)
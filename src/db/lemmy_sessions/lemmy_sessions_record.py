@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class LemmySessionsRecord:
+    lemmy_instance: str
+    bot_name: str
+    community_name: str
+    jwt: str
+    community_id: int
+    # ISO 8601 in UTC
+    expires_at: str
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+DEFAULT_MAX_ENTRIES = 512
+
+# Returned by RecordCache.get() when the key isn't cached. None can't be used for that, because None is cached for
+# records that are known not to exist.
+MISSING = object()
+
+
+class RecordCache:
+    """
+    A write-through cache of DB records, used by the DAOs so that records that rarely change after they are created
+    don't have to be read from the DB every cycle.
+
+    The DAOs put every record they read or write in the cache, and put None for records they know don't exist, so that
+    lookups of posts that haven't been made yet don't go to the DB either. The cache is bounded: the least recently used
+    entries are evicted, and are read from the DB again if they are needed.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int, optional): The maximum number of records to keep. Defaults to DEFAULT_MAX_ENTRIES.
+        """
+        self.max_entries = max_entries
+        self._records: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a record.
+
+        Args:
+            key (Hashable): The key of the record.
+
+        Returns:
+            Any: The record, None if the record is known not to exist, or MISSING if the key isn't cached.
+        """
+        with self._lock:
+            record = self._records.get(key, MISSING)
+            if record is not MISSING:
+                self._records.move_to_end(key)
+            return record
+
+    def put(self, key: Hashable, record: Any):
+        """
+        Store a record, or None if the record is known not to exist.
+
+        Args:
+            key (Hashable): The key of the record.
+            record (Any): The record.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._records[key] = record
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def invalidate(self, key: Hashable = None):
+        """
+        Remove a record from the cache, or every record if no key is given.
+
+        Args:
+            key (Hashable, optional): The key of the record to remove. Defaults to None.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if key is None:
+                self._records.clear()
+            else:
+                self._records.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -1,14 +1,19 @@
 from typing import Optional
 
-from src.datatypes.game import Game
+from src.datatypes.game import Game, GameType
+from src.datatypes.game_events import GameEvent
 from src.db.comments.comments_dao import comments_dao
+from src.db.content_hashes.content_hashes_dao import content_hashes_dao, TARGET_TYPE_POST, TARGET_TYPE_COMMENT
 from src.db.daily_threads.daily_threads_dao import daily_threads_dao
 from src.db.daily_threads.daily_threads_record import DailyThreadsRecord
 from src.db.game_day_threads.game_day_threads_dao import game_day_threads_dao
 from src.utils import nhl_api_client, post_util, datetime_util
 from src.utils.environment_util import environment_util
+from src.utils.game_diff import game_differ
 from src.utils.lemmy_client import lemmy_client
+from src.utils.lemmy_writer import lemmy_writer, PRIORITY_CREATE, PRIORITY_EDIT
 from src.utils.log_util import LOGGER
+from src.utils.poll_scheduler import poll_scheduler, IDLE_POLL_SECONDS
 from src.utils.signal_util import signal_util
 
 TAG = "main"
@@ -18,13 +23,13 @@ DELAY_BETWEEN_UPDATING_POSTS = 30
 
 def handle_daily_thread(games: list[Game]) -> Optional[DailyThreadsRecord]:
     """
-    Handles the creation and updating of daily threads based on the list of games.
+    Handles the creation and updating of daily threads based on the list of games. The writes are queued on the Lemmy writer.
 
     Args:
         games (List[Game]): The list of games.
 
     Returns:
-        Optional[DailyThreadsRecord]: The created or updated daily thread, or None if there are no games.
+        Optional[DailyThreadsRecord]: The existing daily thread, or None if there are no games or the daily thread hasn't been created yet.
     """
     # Check if the list of games is empty
     if not games:
@@ -38,7 +43,7 @@ def handle_daily_thread(games: list[Game]) -> Optional[DailyThreadsRecord]:
 
     # Filter the games to only include those that are scheduled for the current day
     current_day_idlw = datetime_util.get_current_day_as_idlw()
-    filtered_games = list(filter(lambda game: datetime_util.is_same_day(game.start_time, current_day_idlw) if game else None, games))
+    filtered_games = list(filter(lambda game: datetime_util.get_day_key(game.start_time) == current_day_idlw if game else None, games))
 
     # Check if there are no games scheduled for the current day
     if not filtered_games:
@@ -48,9 +53,48 @@ def handle_daily_thread(games: list[Game]) -> Optional[DailyThreadsRecord]:
     # Get the existing daily thread for the current day, if it exists
     daily_thread = daily_threads_dao.get_daily_thread(current_day_idlw)
 
+    title = post_util.get_daily_thread_title(current_day_idlw)
+    body = post_util.get_daily_thread_body(filtered_games)
     if daily_thread:
         # Update the daily thread with the filtered games
-        lemmy_client.update_daily_thread(daily_thread.post_id, post_util.get_daily_thread_title(current_day_idlw), post_util.get_daily_thread_body(filtered_games))
+        lemmy_writer.submit(("post", daily_thread.post_id), PRIORITY_EDIT, lambda: lemmy_client.update_daily_thread(daily_thread.post_id, title, body))
+        return daily_thread
+
+    # Create a new daily thread. The comments queued after it in this cycle are made in it once it exists.
+    lemmy_writer.submit(get_daily_thread_write_key(current_day_idlw), PRIORITY_CREATE, lambda: write_new_daily_thread(current_day_idlw, title, body))
+    return None
+
+
+def get_daily_thread_write_key(date: str) -> tuple[str, str]:
+    """
+    Get the key that the create of the daily thread of a day is queued on the Lemmy writer with.
+
+    Args:
+        date (str): The date of the daily thread.
+
+    Returns:
+        tuple[str, str]: The key.
+    """
+    return "daily_thread", date
+
+
+def write_new_daily_thread(date: str, title: str, body: str) -> Optional[DailyThreadsRecord]:
+    """
+    Creates and features the daily thread of a day, and unfeatures the previous ones. Runs on the Lemmy writer.
+
+    The daily thread is looked up again first, because a create queued in an earlier cycle may have made it already.
+
+    Args:
+        date (str): The date of the daily thread.
+        title (str): The title of the daily thread.
+        body (str): The body of the daily thread.
+
+    Returns:
+        Optional[DailyThreadsRecord]: The daily thread.
+    """
+    daily_thread = daily_threads_dao.get_daily_thread(date)
+    if daily_thread:
+        lemmy_client.update_daily_thread(daily_thread.post_id, title, body)
         return daily_thread
 
     # Unfeature all featured daily threads
@@ -59,7 +103,7 @@ def handle_daily_thread(games: list[Game]) -> Optional[DailyThreadsRecord]:
         lemmy_client.unfeature_daily_thread(featured_daily_thread.post_id)
 
     # Create a new daily thread with the filtered games
-    created_daily_thread = lemmy_client.create_daily_thread(current_day_idlw, post_util.get_daily_thread_title(current_day_idlw), post_util.get_daily_thread_body(filtered_games))
+    created_daily_thread = lemmy_client.create_daily_thread(date, title, body)
 
     # Feature the newly created daily thread
     lemmy_client.feature_daily_thread(created_daily_thread.post_id)
@@ -67,16 +111,18 @@ def handle_daily_thread(games: list[Game]) -> Optional[DailyThreadsRecord]:
     return created_daily_thread
 
 
-def handle_game_day_thread(game: Game):
+def handle_game_day_thread(game: Game, events: Optional[list[GameEvent]] = None):
     """
-    Handles the creation or update of a game day thread based on the game's start and end time.
+    Handles the creation or update of a game day thread based on the game's start and end time. The writes are queued on the Lemmy writer.
 
     Args:
         game (Game): The game object containing information about the game.
+        events (Optional[list[GameEvent]], optional): What happened in the game since the last cycle. Defaults to None.
 
     Returns:
         None
     """
+    log_events(game, events)
     # Get the game day thread post
     post = game_day_threads_dao.get_game_day_thread(game.id)
     post_id = post.post_id if post else None
@@ -86,33 +132,82 @@ def handle_game_day_thread(game: Game):
 
     # Check if it's time to make the post
     if datetime_util.is_time_to_make_post(current_time, game.start_time, game.end_time):
+        title = post_util.get_title(game)
+        body = post_util.get_gdt_body(game)
         # If a post already exists, update it
         if post_id is not None:
-            lemmy_client.update_game_day_thread(post_util.get_title(game), post_util.get_gdt_body(game), post_id)
+            lemmy_writer.submit(("post", post_id), PRIORITY_EDIT, lambda: write_game_day_thread_edit(title, body, post_id, game.id))
         # Otherwise, create a new post
         else:
-            lemmy_client.create_game_day_thread(post_util.get_title(game), post_util.get_gdt_body(game), game.id)
+            lemmy_writer.submit(("game_day_thread", game.id), PRIORITY_CREATE, lambda: write_new_game_day_thread(title, body, game.id))
     else:
         # Log that the post was not created/updated due to the time
         LOGGER.i(TAG, f"main: The post was not created/updated for game '{game.id}' due to the time. current_time: {current_time}; start_time: {game.start_time}; end_time: {game.end_time}")
 
 
-def handle_comment(daily_thread: DailyThreadsRecord, game: Game):
+def write_game_day_thread_edit(title: str, body: str, post_id: int, game_id: int):
     """
-    Handles the creation or update of a comment for a game in a daily thread.
+    Edits the game day thread of a game. Runs on the Lemmy writer. If the body couldn't be sent, the snapshot of the
+    game is forgotten, so that the game isn't skipped as unchanged in the next cycle.
+
+    Args:
+        title (str): The title of the post.
+        body (str): The body of the post.
+        post_id (int): The ID of the post.
+        game_id (int): The ID of the game.
+
+    Returns:
+        None
+    """
+    is_sent = False
+    try:
+        is_sent = lemmy_client.update_game_day_thread(title, body, post_id) or lemmy_client.is_content_sent(TARGET_TYPE_POST, post_id, body)
+    finally:
+        if not is_sent:
+            game_differ.forget(game_id)
+
+
+def write_new_game_day_thread(title: str, body: str, game_id: int):
+    """
+    Creates the game day thread of a game, or updates it if a create queued in an earlier cycle already made it. Runs on the Lemmy writer.
+
+    Args:
+        title (str): The title of the post.
+        body (str): The body of the post.
+        game_id (int): The ID of the game.
+
+    Returns:
+        None
+    """
+    post = game_day_threads_dao.get_game_day_thread(game_id)
+    if post:
+        lemmy_client.update_game_day_thread(title, body, post.post_id)
+    else:
+        lemmy_client.create_game_day_thread(title, body, game_id)
+
+
+def handle_comment(daily_thread: DailyThreadsRecord, game: Game, events: Optional[list[GameEvent]] = None):
+    """
+    Handles the creation or update of a comment for a game in a daily thread. The writes are queued on the Lemmy writer.
 
     Args:
         daily_thread (DailyThreadsRecord): The daily thread record.
         game (Game): The game record.
+        events (Optional[list[GameEvent]], optional): What happened in the game since the last cycle. Defaults to None.
 
     Returns:
         None
     """
+    # The daily thread may be queued to be created in this cycle. The comment is then created right after it.
+    daily_thread_date = datetime_util.get_current_day_as_idlw() if not daily_thread else daily_thread.date
+
     # Check if game or daily_thread is None
-    if not game or not daily_thread:
+    if not game or (not daily_thread and not lemmy_writer.is_pending(get_daily_thread_write_key(daily_thread_date))):
         LOGGER.d(TAG, f"Game or daily thread is None. Don't make a post. daily_thread is None: {daily_thread is None}, game is None: {game is None}")
         return
 
+    log_events(game, events)
+
     # Get the existing comment for the game
     comment = comments_dao.get_comment(game.id)
     comment_id = comment.comment_id if comment else None
@@ -122,19 +217,117 @@ def handle_comment(daily_thread: DailyThreadsRecord, game: Game):
 
     # Check if it is time to make a post for the game
     if datetime_util.is_time_to_make_post(current_time, game.start_time, game.end_time):
+        content = post_util.get_game_details(game)
         if comment_id is not None:
             # Update the existing comment
-            lemmy_client.update_comment(comment_id, post_util.get_game_details(game))
+            lemmy_writer.submit(("comment", comment_id), PRIORITY_EDIT, lambda: write_comment_edit(comment_id, content, game.id))
         else:
             # Create a new comment
-            lemmy_client.create_comment(daily_thread.post_id, game.id, post_util.get_game_details(game))
+            if daily_thread:
+                lemmy_writer.submit(("game_comment", game.id), PRIORITY_CREATE, lambda: write_new_comment(daily_thread.post_id, game.id, content))
+            else:
+                # Creates are sent in the order they are queued, so the daily thread queued in this cycle exists by then
+                lemmy_writer.submit(("game_comment", game.id), PRIORITY_CREATE, lambda: write_new_comment_in_daily_thread(daily_thread_date, game.id, content))
     else:
         LOGGER.i(TAG, f"main: The comment was not created/updated for game '{game.id}' due to the time. current_time: {current_time}; start_time: {game.start_time}; end_time: {game.end_time}")
 
 
+def write_comment_edit(comment_id: int, content: str, game_id: int):
+    """
+    Edits the comment of a game. Runs on the Lemmy writer. If the content couldn't be sent, the snapshot of the game is
+    forgotten, so that the game isn't skipped as unchanged in the next cycle.
+
+    Args:
+        comment_id (int): The ID of the comment.
+        content (str): The content of the comment.
+        game_id (int): The ID of the game.
+
+    Returns:
+        None
+    """
+    is_sent = False
+    try:
+        is_sent = lemmy_client.update_comment(comment_id, content) or lemmy_client.is_content_sent(TARGET_TYPE_COMMENT, comment_id, content)
+    finally:
+        if not is_sent:
+            game_differ.forget(game_id)
+
+
+def write_new_comment_in_daily_thread(date: str, game_id: int, content: str):
+    """
+    Creates the comment of a game in the daily thread of a day. Runs on the Lemmy writer, after the create of the daily
+    thread if it was queued in the same cycle.
+
+    Args:
+        date (str): The date of the daily thread.
+        game_id (int): The ID of the game.
+        content (str): The content of the comment.
+
+    Returns:
+        None
+    """
+    daily_thread = daily_threads_dao.get_daily_thread(date)
+    if daily_thread is None:
+        LOGGER.w(TAG, f"write_new_comment_in_daily_thread(): There is no daily thread for {date}. The comment of game '{game_id}' will be made next cycle.")
+        return
+    write_new_comment(daily_thread.post_id, game_id, content)
+
+
+def write_new_comment(post_id: int, game_id: int, content: str):
+    """
+    Creates the comment of a game, or updates it if a create queued in an earlier cycle already made it. Runs on the Lemmy writer.
+
+    Args:
+        post_id (int): The ID of the daily thread to comment on.
+        game_id (int): The ID of the game.
+        content (str): The content of the comment.
+
+    Returns:
+        None
+    """
+    comment = comments_dao.get_comment(game_id)
+    if comment:
+        lemmy_client.update_comment(comment.comment_id, content)
+    else:
+        lemmy_client.create_comment(post_id, game_id, content)
+
+
+def log_events(game: Game, events: Optional[list[GameEvent]]):
+    """
+    Log what happened in a game since the last cycle.
+
+    Args:
+        game (Game): The game.
+        events (Optional[list[GameEvent]]): The events of the game.
+
+    Returns:
+        None
+    """
+    if events:
+        LOGGER.i(TAG, f"main: Game '{game.id}': {', '.join(type(event).__name__ for event in events)}")
+
+
+def is_game_posted(game: Game, game_type: GameType) -> bool:
+    """
+    Check whether the game day thread or the comment of a game has been made.
+
+    Args:
+        game (Game): The game.
+        game_type (GameType): The type of the game.
+
+    Returns:
+        bool: True if the post the game is handled with exists.
+    """
+    if game_type in environment_util.gdt_post_types:
+        return game_day_threads_dao.get_game_day_thread(game.id) is not None
+    if game_type in environment_util.comment_post_types:
+        return comments_dao.get_comment(game.id) is not None
+    return False
+
+
 def filter_games_by_selected_teams(games: list[Game]) -> list[Game]:
     """
-    Filter games by selected teams.
+    Filter games by selected teams. Games that are None are dropped.
 
     Args:
         games: The games to filter
@@ -142,7 +335,8 @@ def filter_games_by_selected_teams(games: list[Game]) -> list[Game]:
     Returns:
         list[Game]: The filtered games
     """
-    return list(filter(lambda game: game.home_team in environment_util.teams or game.away_team in environment_util.teams if game else None, games))
+    return [game for game in games
+            if game is not None and (environment_util.is_team_selected(game.home_team) or environment_util.is_team_selected(game.away_team))]
 
 
 def filter_games_by_start_time(games: list[Game]) -> list[Game]:
@@ -159,7 +353,7 @@ def filter_games_by_start_time(games: list[Game]) -> list[Game]:
     return list(filter(lambda game: datetime_util.is_time_to_make_post(current_time, game.start_time) if game else None, games))
 
 
-def merge_games_with_schedule(schedule: list[Game], games: list[Game]) -> list[Game]:
+def merge_games_with_schedule(schedule: list[Game], games: list[Optional[Game]]) -> tuple[list[Game], list[Game]]:
     """
     Merge started games with scheduled games.
 
@@ -168,20 +362,53 @@ def merge_games_with_schedule(schedule: list[Game], games: list[Game]) -> list[G
         games: List of started games.
 
     Returns:
-        list[Game]: The merged games list.
+        tuple[list[Game], list[Game]]: The merged games list, and the started games that aren't in the schedule.
+    """
+    merged_schedules, unmatched_games = merge_games_with_schedules({"": schedule}, games)
+    return merged_schedules[""], unmatched_games
+
+
+def merge_games_with_schedules(schedules: dict[str, list[Game]], games: list[Optional[Game]]) -> tuple[dict[str, list[Game]], list[Game]]:
+    """
+    Merge started games with the scheduled games of several days, e.g. to backfill the posts of past days. Each started
+    game replaces the scheduled game with the same ID, wherever it is, in one pass over each list.
+
+    Args:
+        schedules: The scheduled games by day.
+        games: List of started games.
+
+    Returns:
+        tuple[dict[str, list[Game]], list[Game]]: The merged games by day, and the started games that aren't in any schedule.
     """
-    out = schedule.copy()
+    out = {day: schedule.copy() for day, schedule in schedules.items()}
+    index = {game.id: (day, i) for day, schedule in out.items() for i, game in enumerate(schedule) if game}
+    unmatched_games = []
     for game in games:
         if not game:
             # Sometimes a game is empty, probably due to an error in the data returned by the API.
             # If that is the case, just skip it and leave it as a scheduled game.
             continue
-        try:
-            index = next((i for i, item in enumerate(out) if item.id == game.id), None)
-            out[index] = game
-        except ValueError:
-            LOGGER.e(TAG, f"Index of game with id '{game.id}' not found in schedule")
-    return out
+        position = index.get(game.id)
+        if position is None:
+            unmatched_games.append(game)
+            continue
+        day, i = position
+        out[day][i] = game
+    if unmatched_games:
+        LOGGER.w(TAG, f"merge_games_with_schedules(): Games not found in the schedule: {[game.id for game in unmatched_games]}")
+    return out, unmatched_games
+
+
+def warm_db_caches():
+    """
+    Load the most recent records of every DAO into its cache, so that the update cycles only read records from the db
+    that haven't been seen yet.
+
+    Returns:
+        None
+    """
+    for dao in (daily_threads_dao, game_day_threads_dao, comments_dao, content_hashes_dao):
+        dao.warm_cache()
 
 
 def main():
@@ -191,20 +418,31 @@ def main():
     Returns:
         None
     """
+    warm_db_caches()
+    lemmy_writer.start()
+    delay = DELAY_BETWEEN_UPDATING_POSTS
     while not signal_util.is_interrupted:
         try:
-            signal_util.wait(DELAY_BETWEEN_UPDATING_POSTS)
+            signal_util.wait(delay)
             if signal_util.is_interrupted:
                 LOGGER.d(TAG, "main: Interrupted. Exiting.")
                 continue
+            # Fall back to the fixed delay if something below fails before the next delay is known
+            delay = DELAY_BETWEEN_UPDATING_POSTS
             schedule = nhl_api_client.get_schedule()
             schedule_filtered_by_selected_teams = filter_games_by_selected_teams(schedule)
             if not schedule_filtered_by_selected_teams:
                 LOGGER.d(TAG, "schedule_filtered_by_selected_teams is empty. Skip making a post for this day.")
+                delay = IDLE_POLL_SECONDS
                 continue
             schedule_filtered_by_start_times = filter_games_by_start_time(schedule_filtered_by_selected_teams)
-            games = nhl_api_client.get_games(schedule_filtered_by_start_times)
-            merged_schedule_and_games = merge_games_with_schedule(schedule_filtered_by_selected_teams, games)
+            due_games = poll_scheduler.get_due_games(schedule_filtered_by_start_times)
+            games = nhl_api_client.get_games(due_games)
+            poll_scheduler.update(due_games, games)
+            delay = poll_scheduler.get_seconds_until_next_poll(schedule_filtered_by_selected_teams)
+            LOGGER.d(TAG, f"main: Polled {len(due_games)} of {len(schedule_filtered_by_start_times)} games. Next poll in {delay} seconds.")
+            merged_schedule_and_games, _ = merge_games_with_schedule(schedule_filtered_by_selected_teams, poll_scheduler.get_latest_games())
+            # Only queues the writes. The Lemmy writer sends them, and commits their records, in the background.
             daily_thread = handle_daily_thread(merged_schedule_and_games)
             for game in games:
                 try:
@@ -212,10 +450,14 @@ def main():
                         LOGGER.d(TAG, "Game is None. Skip making a post for this game.")
                         continue
                     game_type = game.get_game_type()
+                    events = game_differ.diff(game)
+                    if events is None and is_game_posted(game, game_type):
+                        LOGGER.d(TAG, f"main: Game '{game.id}' hasn't changed since the last cycle. Skip it.")
+                        continue
                     if game_type in environment_util.gdt_post_types:
-                        handle_game_day_thread(game)
+                        handle_game_day_thread(game, events)
                     elif game_type in environment_util.comment_post_types:
-                        handle_comment(daily_thread, game)
+                        handle_comment(daily_thread, game, events)
                 except InterruptedError as e:
                     # If an InterruptedError is raised while processing games,
                     #  we need to break out before the catch-all below catches it and does nothing.
@@ -223,9 +465,19 @@ def main():
                     break
                 except Exception as e:
                     LOGGER.e(TAG, "main: Some exception occurred while processing a game.", e)
+            edit_stats = lemmy_client.pop_edit_stats()
+            writer_stats = lemmy_writer.pop_stats()
+            request_stats = lemmy_client.pop_request_stats()
+            LOGGER.i(TAG, f"main: Lemmy edits since the last cycle: sent: {edit_stats.sent}; skipped: {edit_stats.skipped}. "
+                          f"Requests throttled: {request_stats.throttled} ({request_stats.throttled_seconds:.1f} s); retried: {request_stats.retried}; "
+                          f"gave up: {request_stats.gave_up}; retry budget exhausted: {request_stats.retry_budget_exhausted}. "
+                          f"Writes queued: {writer_stats.submitted}; coalesced: {writer_stats.coalesced}; sent: {writer_stats.sent}; failed: {writer_stats.failed}; "
+                          f"pending: {lemmy_writer.get_pending_count()}")
         except InterruptedError as e:
             LOGGER.e(TAG, "main: An InterruptedError was raised while sleeping.", e)
-    LOGGER.i(TAG, f"main: Reached the end. Shutting down. is_interrupted: {signal_util.is_interrupted}")
+    LOGGER.i(TAG, f"main: Reached the end. Sending the pending writes. is_interrupted: {signal_util.is_interrupted}")
+    lemmy_writer.drain()
+    LOGGER.i(TAG, "main: Shutting down.")
 
 
 if __name__ == "__main__":
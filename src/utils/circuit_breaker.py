@@ -0,0 +1,107 @@
+import threading
+import time
+from enum import Enum
+from typing import Callable
+
+from src.utils.log_util import LOGGER
+
+TAG = "CircuitBreaker"
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a service that keeps failing, so that it isn't hammered while it is down.
+
+    The circuit opens after `failure_threshold` failures in a row, and then every call is rejected. After
+    `reset_timeout_seconds` the circuit is half open: a single call is let through as a probe. If the probe succeeds the
+    circuit closes, otherwise it opens again for another `reset_timeout_seconds`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the circuit breaker, closed.
+
+        Args:
+            name (str): The name of the service, for logging.
+            failure_threshold (int): The number of failures in a row that open the circuit.
+            reset_timeout_seconds (float): How long the circuit stays open before a probe is let through.
+            clock (Callable[[], float], optional): Returns the current time in seconds. Defaults to time.monotonic.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.is_probing = False
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call can be made. A call that is allowed must be followed by record_success() or record_failure().
+
+        Returns:
+            bool: False if the circuit is open and the call should be skipped.
+        """
+        with self._lock:
+            if self.state == CircuitState.OPEN and self.clock() - self.opened_at >= self.reset_timeout_seconds:
+                LOGGER.i(TAG, f"allow_request(): {self.name}: Half open. Letting a probe through.")
+                self.state = CircuitState.HALF_OPEN
+                self.is_probing = False
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.HALF_OPEN and not self.is_probing:
+                self.is_probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """
+        Record a call that succeeded. Closes the circuit.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self.state != CircuitState.CLOSED:
+                LOGGER.i(TAG, f"record_success(): {self.name}: The probe succeeded. Closing the circuit.")
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self.is_probing = False
+
+    def record_failure(self):
+        """
+        Record a call that failed. Opens the circuit if the probe failed or there were too many failures in a row.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or (self.state == CircuitState.CLOSED and self.failures >= self.failure_threshold):
+                LOGGER.w(TAG, f"record_failure(): {self.name}: Opening the circuit for {self.reset_timeout_seconds} s after {self.failures} failures in a row.")
+                self.state = CircuitState.OPEN
+                self.opened_at = self.clock()
+                self.is_probing = False
+
+    def reset(self):
+        """
+        Close the circuit and forget the failures.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self.is_probing = False
+            self.rejected = 0
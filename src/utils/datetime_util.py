@@ -1,9 +1,11 @@
+import functools
 from datetime import datetime, timedelta, date
 from typing import Optional
 
 import pytz
 from dateutil import parser
 
+from src.datatypes.start_times import StartTimes
 from src.utils.log_util import LOGGER
 from src.utils.environment_util import environment_util
 
@@ -20,6 +22,11 @@ START_TIME_FORMAT_NO_TZ = "%I:%M%p"
 DATE_FORMAT = '%Y-%m-%d'
 DATE_TITLE_FORMAT = '%d %b %Y'
 
+# The number of parsed datetime strings to remember. A whole season has about 1,400 games on far fewer distinct start times.
+PARSE_DATETIME_CACHE_SIZE = 4096
+# The number of start times whose day key and formatted strings are remembered
+START_TIMES_CACHE_SIZE = 4096
+
 
 def is_time_to_make_post(current_time: datetime, game_start_time: datetime, game_end_time: Optional[datetime] = None) -> bool:
     """
@@ -76,9 +83,13 @@ def get_current_time_as_utc() -> datetime:
     return datetime.now(tz=pytz.utc)
 
 
+@functools.lru_cache(maxsize=PARSE_DATETIME_CACHE_SIZE)
 def parse_datetime(datetime_string: str) -> datetime:
     """
     Parse a datetime string into a datetime object.
+    The NHL API sends ISO 8601 timestamps like '2023-11-11T00:00:00Z', which datetime.fromisoformat parses far faster
+    than dateutil, so dateutil is only used for strings that aren't ISO 8601. The same start times are parsed every
+    cycle, so the results are memoized by string. datetimes are immutable, so sharing them is safe.
 
     Args:
         datetime_string (str): The datetime string to parse.
@@ -86,7 +97,10 @@ def parse_datetime(datetime_string: str) -> datetime:
     Returns:
         datetime: The parsed datetime object.
     """
-    return parser.parse(datetime_string)
+    try:
+        return datetime.fromisoformat(datetime_string)
+    except ValueError:
+        return parser.parse(datetime_string)
 
 
 def get_day_as_title_formatted(day: str) -> str:
@@ -170,4 +184,39 @@ def is_same_day(start_time: datetime, day: str):
     Returns:
         bool: True if the start time is in the same day as the given day.
     """
-    return start_time.astimezone(ET).strftime(DATE_FORMAT) == day
+    return get_day_key(start_time) == day
+
+
+def get_day_key(start_time: datetime) -> str:
+    """
+    Get the day a start time falls on in the ET timezone, formatted as a date string. This is the day a game is listed under.
+
+    Args:
+        start_time (datetime): The start time.
+
+    Returns:
+        str: The day in the ET timezone, e.g. '2023-11-10'.
+    """
+    return get_start_times(start_time).day_key
+
+
+@functools.lru_cache(maxsize=START_TIMES_CACHE_SIZE)
+def get_start_times(start_time: datetime) -> StartTimes:
+    """
+    Get the day key and the formatted strings of a start time. They never change for a start time, so they are worked
+    out once per start time, and every filter and render after that does no time zone conversions.
+
+    Args:
+        start_time (datetime): The start time.
+
+    Returns:
+        StartTimes: The day key and formatted strings.
+    """
+    start_time_et = start_time.astimezone(ET)
+    return StartTimes(day_key=start_time_et.strftime(DATE_FORMAT),
+                      formatted=start_time_et.strftime(START_TIME_FORMAT),
+                      pt=start_time.astimezone(PT).strftime(START_TIME_FORMAT_NO_TZ),
+                      mt=start_time.astimezone(MT).strftime(START_TIME_FORMAT_NO_TZ),
+                      ct=start_time.astimezone(CT).strftime(START_TIME_FORMAT_NO_TZ),
+                      et=start_time_et.strftime(START_TIME_FORMAT_NO_TZ),
+                      at=start_time.astimezone(AT).strftime(START_TIME_FORMAT_NO_TZ))
@@ -24,23 +24,54 @@ class EnvironmentUtil:
     _LOG_FILE_MAX_MB = 'LOG_FILE_MAX_MB'
     _LOG_FILE_BACKUP_COUNT = 'LOG_FILE_BACKUP_COUNT'
     _ERROR_BACKUP_COUNT = 'ERROR_BACKUP_COUNT'
+    _MAX_CONCURRENT_NHL_API_REQUESTS = 'MAX_CONCURRENT_NHL_API_REQUESTS'
+    _SCHEDULE_CACHE_TTL_MINUTES = 'SCHEDULE_CACHE_TTL_MINUTES'
+    _DB_PRAGMA_PROFILE = 'DB_PRAGMA_PROFILE'
 
-    _ENVIRONMENT_VARIABLE_NAMES = [_BOT_NAME, _PASSWORD, _LEMMY_INSTANCE, _COMMUNITY_NAME, _COMMENT_POST_TYPES, _GDT_POST_TYPES, _TEAMS, _MINUTES_BEFORE_GAME_START_TO_CREATE_POST, _MINUTES_AFTER_GAME_END_TO_UPDATE_POST, _LOG_LEVEL, _LOG_FILE_MAX_MB, _LOG_FILE_BACKUP_COUNT, _ERROR_BACKUP_COUNT]
+    _ENVIRONMENT_VARIABLE_NAMES = [_BOT_NAME, _PASSWORD, _LEMMY_INSTANCE, _COMMUNITY_NAME, _COMMENT_POST_TYPES, _GDT_POST_TYPES, _TEAMS, _MINUTES_BEFORE_GAME_START_TO_CREATE_POST, _MINUTES_AFTER_GAME_END_TO_UPDATE_POST, _LOG_LEVEL, _LOG_FILE_MAX_MB, _LOG_FILE_BACKUP_COUNT, _ERROR_BACKUP_COUNT, _MAX_CONCURRENT_NHL_API_REQUESTS, _SCHEDULE_CACHE_TTL_MINUTES, _DB_PRAGMA_PROFILE]
 
     def __init__(self, dotenv_path: Optional[str] = None):
         """
-        Load the environment variables from the .env file.
+        Set up the environment to be loaded from the .env file. The file is only read the first time one of the
+        environment variables is accessed, so that importing this module has no side effects.
 
         Args:
             dotenv_path: The path to the .env file.
 
+        Returns:
+            None
+        """
+        self.dotenv_path = dotenv_path
+        self.is_loaded = False
+
+    def __getattr__(self, name: str):
+        """
+        Load the environment the first time one of the environment variables is accessed.
+
+        This is only called for attributes that aren't set, which are the environment variables until load() has run.
+
+        Args:
+            name: The name of the attribute.
+
+        Returns:
+            The value of the attribute.
+        """
+        if name.startswith('__') or self.__dict__.get('is_loaded', True):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.load()
+        return getattr(self, name)
+
+    def load(self):
+        """
+        Load the environment variables from the .env file.
+
         Returns:
             None
         """
         for environment_variable_name in self._ENVIRONMENT_VARIABLE_NAMES:
             if os.environ.get(environment_variable_name):
                 del os.environ[environment_variable_name]
-        load_dotenv(dotenv_path=dotenv_path)
+        load_dotenv(dotenv_path=self.dotenv_path)
         self.bot_name = os.getenv(self._BOT_NAME)
         self.password = os.getenv(self._PASSWORD)
         self.lemmy_instance = os.getenv(self._LEMMY_INSTANCE)
@@ -48,6 +79,8 @@ class EnvironmentUtil:
         self.comment_post_types = self.parse_game_types(os.getenv(self._COMMENT_POST_TYPES))
         self.gdt_post_types = self.parse_game_types(os.getenv(self._GDT_POST_TYPES))
         self.teams = self.parse_teams(os.getenv(self._TEAMS))
+        # The IDs of the selected teams, so that checking whether a team is selected is a set lookup
+        self.team_ids = frozenset(team.id for team in self.teams)
         self.minutes_before_game_start_to_create_post = self.cast_int_with_default(os.getenv(self._MINUTES_BEFORE_GAME_START_TO_CREATE_POST), 60)
         self.minutes_after_game_end_to_update_post = self.cast_int_with_default(os.getenv(self._MINUTES_AFTER_GAME_END_TO_UPDATE_POST), 60)
         log_level = os.getenv(self._LOG_LEVEL)
@@ -55,10 +88,26 @@ class EnvironmentUtil:
         self.log_file_max_mb = self.cast_int_with_default(os.getenv(self._LOG_FILE_MAX_MB), 1)
         self.log_file_backup_count = self.cast_int_with_default(os.getenv(self._LOG_FILE_BACKUP_COUNT), 10)
         self.error_backup_count = self.cast_int_with_default(os.getenv(self._ERROR_BACKUP_COUNT), 2)
+        self.max_concurrent_nhl_api_requests = self.cast_int_with_default(os.getenv(self._MAX_CONCURRENT_NHL_API_REQUESTS), 8)
+        self.schedule_cache_ttl_minutes = self.cast_int_with_default(os.getenv(self._SCHEDULE_CACHE_TTL_MINUTES), 60)
+        self.db_pragma_profile = os.getenv(self._DB_PRAGMA_PROFILE, 'wal')
         if not self.lemmy_instance.startswith('https://'):
             self.lemmy_instance = f"https://{self.lemmy_instance}"
+        self.is_loaded = True
         # constants.LOGGER.i(TAG, "Environment loaded")
 
+    def is_team_selected(self, team: Optional[Team]) -> bool:
+        """
+        Check whether a team is one of the selected teams.
+
+        Args:
+            team: The team to check.
+
+        Returns:
+            True if the team is selected, False otherwise.
+        """
+        return team is not None and team.id in self.team_ids
+
     @staticmethod
     def parse_game_types(game_types: str):
         """
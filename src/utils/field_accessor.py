@@ -0,0 +1,50 @@
+from typing import Any, Callable
+
+# A getter takes the object to read from and a default, and returns the value at its path or the default.
+FieldAccessor = Callable[[Any, Any], Any]
+
+_MISSING_ERRORS = (KeyError, IndexError, TypeError)
+
+
+def compile_path(*keys: str) -> FieldAccessor:
+    """
+    Compile a path of keys into a getter, so that the path only has to be parsed once instead of on every lookup.
+
+    The getter behaves like pydash.get(obj, "key1.key2", default) for nested dictionaries: it returns the default if any
+    key along the path is missing or if a value along the path can't be indexed. A value of None that is present is
+    returned as is.
+
+    Args:
+        *keys (str): The keys to walk, in order.
+
+    Returns:
+        FieldAccessor: The getter. The dotted path is available as its `path` attribute.
+    """
+    if not keys:
+        raise ValueError("compile_path() needs at least one key")
+    if len(keys) == 1:
+        key = keys[0]
+
+        def get(obj: Any, default: Any = None) -> Any:
+            try:
+                return obj[key]
+            except _MISSING_ERRORS:
+                return default
+    elif len(keys) == 2:
+        key1, key2 = keys
+
+        def get(obj: Any, default: Any = None) -> Any:
+            try:
+                return obj[key1][key2]
+            except _MISSING_ERRORS:
+                return default
+    else:
+        def get(obj: Any, default: Any = None) -> Any:
+            try:
+                for key in keys:
+                    obj = obj[key]
+                return obj
+            except _MISSING_ERRORS:
+                return default
+    get.path = ".".join(keys)
+    return get
@@ -0,0 +1,152 @@
+import threading
+from collections import Counter, OrderedDict
+from typing import Hashable, Optional
+
+from src.datatypes.game import Game
+from src.datatypes.game_events import GameEvent, GameFinalized, GoalAdded, PenaltyAdded, PeriodChanged, ScoreChanged
+from src.datatypes.goal import Goal
+from src.datatypes.penalty import Penalty
+from src.utils.nhl_api_client import GameState
+
+TAG = "GameDiffer"
+
+# The number of games whose last snapshot is kept. Well above the number of games in a day.
+MAX_SNAPSHOTS = 64
+
+
+def get_goal_key(goal: Goal) -> Hashable:
+    """
+    Get what identifies a goal between two landings. The description and video can change after the goal is scored,
+    e.g. when the assists are corrected, so they aren't part of it.
+
+    Args:
+        goal (Goal): The goal.
+
+    Returns:
+        Hashable: The key of the goal.
+    """
+    return goal.period, goal.time, goal.team.id if goal.team else None
+
+
+def get_penalty_key(penalty: Penalty) -> Hashable:
+    """
+    Get what identifies a penalty between two landings. Several penalties can be called on a team at the same time,
+    so the type and description are part of it.
+
+    Args:
+        penalty (Penalty): The penalty.
+
+    Returns:
+        Hashable: The key of the penalty.
+    """
+    return penalty.period, penalty.time, penalty.team.id if penalty.team else None, penalty.type, penalty.description
+
+
+def _get_score(game: Game) -> Optional[tuple[int, int]]:
+    if game.away_team_stats is None or game.home_team_stats is None:
+        return None
+    return game.away_team_stats.goals, game.home_team_stats.goals
+
+
+def _is_final(game: Game) -> bool:
+    return game.game_info is not None and game.game_info.game_clock == GameState.FINAL.value
+
+
+def diff_games(old: Game, new: Game) -> list[GameEvent]:
+    """
+    Get what happened in a game between two of its snapshots.
+
+    Args:
+        old (Game): The earlier snapshot of the game.
+        new (Game): The later snapshot of the game.
+
+    Returns:
+        list[GameEvent]: The events, in the order: period, goals, penalties, score, final.
+    """
+    events = []
+    old_period = old.game_info.current_period if old.game_info else None
+    new_period = new.game_info.current_period if new.game_info else None
+    if new_period is not None and new_period != old_period:
+        events.append(PeriodChanged(new.id, old_period, new_period))
+
+    old_goals = Counter(get_goal_key(goal) for goal in old.goals or ())
+    for goal in new.goals or ():
+        key = get_goal_key(goal)
+        if old_goals[key]:
+            old_goals[key] -= 1
+        else:
+            events.append(GoalAdded(new.id, goal))
+
+    old_penalties = Counter(get_penalty_key(penalty) for penalty in old.penalties or ())
+    for penalty in new.penalties or ():
+        key = get_penalty_key(penalty)
+        if old_penalties[key]:
+            old_penalties[key] -= 1
+        else:
+            events.append(PenaltyAdded(new.id, penalty))
+
+    new_score = _get_score(new)
+    if new_score is not None and new_score != _get_score(old):
+        events.append(ScoreChanged(new.id, *new_score))
+
+    if _is_final(new) and not _is_final(old):
+        events.append(GameFinalized(new.id))
+    return events
+
+
+class GameDiffer:
+    """
+    Keeps the last snapshot of every game, and compares each new parse of a game with it, so that games that didn't
+    change since the last cycle can be skipped, and what changed in the others is known.
+    """
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        """
+        Initialize the differ.
+
+        Args:
+            max_snapshots (int, optional): The number of games whose last snapshot is kept. Defaults to MAX_SNAPSHOTS.
+        """
+        self.max_snapshots = max_snapshots
+        self.snapshots: OrderedDict[int, Game] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def diff(self, game: Game) -> Optional[list[GameEvent]]:
+        """
+        Compare a game with its last snapshot, and keep it as the new snapshot.
+
+        Args:
+            game (Game): The game, as just parsed.
+
+        Returns:
+            Optional[list[GameEvent]]: None if the game is the same as its last snapshot. Otherwise the events since the
+                last snapshot, which is empty for a game seen for the first time, or if only e.g. the clock or the shots
+                changed.
+        """
+        with self._lock:
+            old = self.snapshots.get(game.id)
+            self.snapshots[game.id] = game
+            self.snapshots.move_to_end(game.id)
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        if old is None:
+            return []
+        if old == game:
+            return None
+        return diff_games(old, game)
+
+    def forget(self, game_id: int):
+        """
+        Forget the snapshot of a game, so that it is treated as changed the next time it is diffed.
+
+        Args:
+            game_id (int): The ID of the game.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.snapshots.pop(game_id, None)
+
+
+game_differ = GameDiffer()
@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.utils.log_util import LOGGER
+
+TAG = "HttpCache"
+
+HEADER_ETAG = "ETag"
+HEADER_LAST_MODIFIED = "Last-Modified"
+HEADER_IF_NONE_MATCH = "If-None-Match"
+HEADER_IF_MODIFIED_SINCE = "If-Modified-Since"
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+@dataclass
+class HttpCacheEntry:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: Any
+    # The object parsed from body, so that an unchanged body doesn't need to be parsed again
+    parsed: Any = None
+
+
+class HttpCache:
+    """
+    Stores the validators (ETag and Last-Modified) and the decoded body of responses by URL, so that requests can be
+    made conditionally and a 304 Not Modified response can be answered from the cache.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of URLs to keep. The least recently used URL is evicted first.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, HttpCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[HttpCacheEntry]:
+        """
+        Get the cache entry for a URL.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            Optional[HttpCacheEntry]: The cache entry, or None if the URL is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], body: Any) -> Optional[HttpCacheEntry]:
+        """
+        Store a response for a URL. Responses without validators can't be requested conditionally, so they are not stored.
+
+        Args:
+            url (str): The URL.
+            etag (Optional[str]): The ETag header of the response.
+            last_modified (Optional[str]): The Last-Modified header of the response.
+            body (Any): The decoded body of the response.
+
+        Returns:
+            Optional[HttpCacheEntry]: The stored entry, or None if the response was not stored.
+        """
+        with self._lock:
+            if not etag and not last_modified:
+                self._entries.pop(url, None)
+                return None
+            entry = HttpCacheEntry(etag=etag, last_modified=last_modified, body=body)
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                evicted_url, _ = self._entries.popitem(last=False)
+                LOGGER.d(TAG, f"put(): evicted {evicted_url}")
+            return entry
+
+    def invalidate(self, url: Optional[str] = None):
+        """
+        Remove a URL from the cache, or every URL if no URL is given.
+
+        Args:
+            url (Optional[str]): The URL to remove. Defaults to None.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+
+    def record_hit(self):
+        """
+        Count a request that was answered from the cache.
+        """
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """
+        Count a request that needed a full response.
+        """
+        with self._lock:
+            self.misses += 1
+
+    def get_stats(self) -> dict:
+        """
+        Get the hit and miss counters.
+
+        Returns:
+            dict: The number of hits, misses and cached URLs.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    @staticmethod
+    def get_conditional_headers(entry: Optional[HttpCacheEntry]) -> dict:
+        """
+        Get the headers for a conditional request based on a cache entry.
+
+        Args:
+            entry (Optional[HttpCacheEntry]): The cache entry.
+
+        Returns:
+            dict: The If-None-Match and If-Modified-Since headers. Empty if there is no entry.
+        """
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers[HEADER_IF_NONE_MATCH] = entry.etag
+        if entry.last_modified:
+            headers[HEADER_IF_MODIFIED_SINCE] = entry.last_modified
+        return headers
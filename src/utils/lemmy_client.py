@@ -1,16 +1,30 @@
-from typing import Optional
+import base64
+import binascii
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
 
 import pydash
+import requests
 from pythorhead import Lemmy
+from pythorhead.auth import Authentication
 from pythorhead.types import FeatureType
 
 from src.db.comments.comments_dao import CommentsDao, comments_dao
 from src.db.comments.comments_record import CommentsRecord
+from src.db.content_hashes.content_hashes_dao import ContentHashesDao, content_hashes_dao, TARGET_TYPE_POST, TARGET_TYPE_COMMENT
 from src.db.daily_threads.daily_threads_dao import DailyThreadsDao, daily_threads_dao
 from src.db.daily_threads.daily_threads_record import DailyThreadsRecord
 from src.db.game_day_threads.game_day_threads_dao import GameDayThreadsDao, game_day_threads_dao
+from src.db.lemmy_sessions.lemmy_sessions_dao import LemmySessionsDao, lemmy_sessions_dao
+from src.utils import datetime_util
 from src.utils.environment_util import environment_util
 from src.utils.log_util import LOGGER
+from src.utils.rate_limiter import BUCKET_COMMENT, BUCKET_FEATURE, BUCKET_POST, RateLimiter, RequestStats, RetryPolicy
 
 TAG = 'LemmyClient'
 
@@ -20,23 +34,153 @@ DICT_KEY_ID = 'id'
 
 REQUEST_TIMEOUT = 10
 
+# Lemmy's tokens don't expire by themselves since 0.19, so a stored login is reused for at most this long, and before
+#  that only until Lemmy rejects it.
+LEMMY_SESSION_TTL = timedelta(days=30)
+
+# The errors Lemmy answers with when the token is missing, expired or revoked
+AUTH_ERRORS = ("not_logged_in", "incorrect_login")
+
+# The error Lemmy answers with when a call is rate limited
+RATE_LIMIT_ERROR = "rate_limit_error"
+
+# pythorhead raises a plain Exception with only the body of the response, so a server error is recognised by the status
+#  line in the error page of the proxy in front of Lemmy, e.g. "502 Bad Gateway"
+SERVER_ERROR_PATTERN = re.compile(r"\b5\d\d [A-Z][a-z]")
+
+
+@dataclass
+class EditStats:
+    sent: int = 0
+    skipped: int = 0
+
+
+def get_content_hash(content: Optional[str]) -> Optional[str]:
+    """
+    Get the hash of the content of a post or comment.
+
+    Args:
+        content (Optional[str]): The content to hash.
+
+    Returns:
+        Optional[str]: The SHA-256 hex digest of the content, or None if there is no content.
+    """
+    if content is None:
+        return None
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_jwt_expiry(jwt: str, now: datetime) -> datetime:
+    """
+    Get when a stored login token should no longer be used: LEMMY_SESSION_TTL from now, or the token's own expiry if it
+    has one and it is sooner.
+
+    Args:
+        jwt (str): The token.
+        now (datetime): The current time.
+
+    Returns:
+        datetime: The expiry.
+    """
+    expiry = now + LEMMY_SESSION_TTL
+    try:
+        payload = jwt.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        if "exp" in claims:
+            expiry = min(expiry, datetime.fromtimestamp(claims["exp"], timezone.utc))
+    except (IndexError, ValueError, TypeError, binascii.Error):
+        LOGGER.w(TAG, "get_jwt_expiry(): The token couldn't be decoded. Using the default expiry.")
+    return expiry
+
+
+def is_auth_error(error: Exception) -> bool:
+    """
+    Check whether a failed request failed because Lemmy rejected the login token.
+
+    Args:
+        error (Exception): The exception raised by pythorhead.
+
+    Returns:
+        bool: True if the token was rejected.
+    """
+    message = str(error)
+    return any(auth_error in message for auth_error in AUTH_ERRORS)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Check whether a failed request was rate limited by Lemmy. A rate limited request wasn't carried out.
+
+    Args:
+        error (Exception): The exception raised by pythorhead.
+
+    Returns:
+        bool: True if the request was rate limited.
+    """
+    return RATE_LIMIT_ERROR in str(error)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check whether a failed request may succeed if sent again: it was rate limited, the server answered with a 5xx
+    error, or the connection failed or timed out.
+
+    pythorhead raises a plain Exception with only the body of the response, not its status code. A 5xx error is
+    therefore only recognised by the error page of a proxy in front of Lemmy, e.g. "502 Bad Gateway". A 5xx error that
+    Lemmy answers itself has a JSON body like any other error, and isn't retried.
+
+    Args:
+        error (Exception): The exception raised by pythorhead.
+
+    Returns:
+        bool: True if the request should be retried.
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return is_rate_limit_error(error) or SERVER_ERROR_PATTERN.search(str(error)) is not None
+
+
+def get_lemmy_auth(lemmy: Lemmy) -> Authentication:
+    """
+    Get the login state of a pythorhead client.
+
+    pythorhead keeps it private, and has no public way to use a token that didn't come from its own log_in(), or to
+    read the token its log_in() got. Stored logins need both, so this is the one place that reaches into it.
+
+    Args:
+        lemmy (Lemmy): The pythorhead client.
+
+    Returns:
+        Authentication: The login state, which holds the token.
+    """
+    return lemmy._requestor._auth
+
 
 class LemmyClient:
-    def __init__(self, lemmy_instance: str, bot_name: str, password: str, community_name: str,
+    def __init__(self, lemmy_instance: Optional[str] = None, bot_name: Optional[str] = None, password: Optional[str] = None, community_name: Optional[str] = None,
                  client_game_day_threads_dao: Optional[GameDayThreadsDao] = None,
                  client_daily_threads_dao: Optional[DailyThreadsDao] = None,
-                 client_comments_dao: Optional[CommentsDao] = None):
+                 client_comments_dao: Optional[CommentsDao] = None,
+                 client_content_hashes_dao: Optional[ContentHashesDao] = None,
+                 client_lemmy_sessions_dao: Optional[LemmySessionsDao] = None,
+                 client_rate_limiter: Optional[RateLimiter] = None,
+                 client_retry_policy: Optional[RetryPolicy] = None):
         """
-        Initialize the Lemmy client.
+        Initialize the Lemmy client. The client logs in the first time it is used, not here, so that creating it doesn't
+        block on the network.
 
         Args:
-            lemmy_instance (str): The URL of the Lemmy instance.
-            bot_name (str): The name of the bot.
-            password (str): The password of the bot.
-            community_name (str): The name of the community.
+            lemmy_instance (Optional[str], optional): The URL of the Lemmy instance. Defaults to None. If None, LEMMY_INSTANCE from the environment will be used.
+            bot_name (Optional[str], optional): The name of the bot. Defaults to None. If None, BOT_NAME from the environment will be used.
+            password (Optional[str], optional): The password of the bot. Defaults to None. If None, PASSWORD from the environment will be used.
+            community_name (Optional[str], optional): The name of the community. Defaults to None. If None, COMMUNITY_NAME from the environment will be used.
             client_game_day_threads_dao (Optional[GameDayThreadsDao], optional): The DAO for game day threads. Defaults to None. If None, the default DAO set in game_day_threads_dao.py will be used.
             client_daily_threads_dao (Optional[DailyThreadsDao], optional): The DAO for daily threads. Defaults to None. If None, the default DAO set in daily_threads_dao.py will be used.
             client_comments_dao (Optional[CommentsDao], optional): The DAO for comments. Defaults to None. If None, the default DAO set in comments_dao.py will be used.
+            client_content_hashes_dao (Optional[ContentHashesDao], optional): The DAO for content hashes. Defaults to None. If None, the default DAO set in content_hashes_dao.py will be used.
+            client_lemmy_sessions_dao (Optional[LemmySessionsDao], optional): The DAO for stored logins. Defaults to None. If None, the default DAO set in lemmy_sessions_dao.py will be used.
+            client_rate_limiter (Optional[RateLimiter], optional): Limits how fast posts, comments and features are sent, and how many failed requests are retried. Defaults to None. If None, a rate limiter with the default limits will be used.
+            client_retry_policy (Optional[RetryPolicy], optional): How many times and how long after a failed request is retried. Defaults to None. If None, the default policy will be used.
 
         Returns:
             None
@@ -48,13 +192,149 @@ class LemmyClient:
         self.client_game_day_threads_dao = client_game_day_threads_dao if client_game_day_threads_dao else game_day_threads_dao
         self.client_daily_threads_dao = client_daily_threads_dao if client_daily_threads_dao else daily_threads_dao
         self.client_comments_dao = client_comments_dao if client_comments_dao else comments_dao
+        self.client_content_hashes_dao = client_content_hashes_dao if client_content_hashes_dao else content_hashes_dao
+        self.client_lemmy_sessions_dao = client_lemmy_sessions_dao if client_lemmy_sessions_dao else lemmy_sessions_dao
+        self.rate_limiter = client_rate_limiter if client_rate_limiter else RateLimiter()
+        self.retry_policy = client_retry_policy if client_retry_policy else RetryPolicy()
+        # The stats are counted on the writer thread and popped on the main thread
+        self._stats_lock = threading.Lock()
+        self.edit_stats = EditStats()
+        self.request_stats = RequestStats()
+        self._lemmy: Optional[Lemmy] = None
+        self._community_id: Optional[int] = None
+
+    @property
+    def lemmy(self) -> Lemmy:
+        if self._lemmy is None:
+            self.log_in()
+        return self._lemmy
+
+    @lemmy.setter
+    def lemmy(self, lemmy: Lemmy):
+        self._lemmy = lemmy
+
+    @property
+    def community_id(self) -> int:
+        if self._community_id is None:
+            self.log_in()
+        return self._community_id
+
+    @community_id.setter
+    def community_id(self, community_id: int):
+        self._community_id = community_id
+
+    def log_in(self, use_stored_session: bool = True):
+        """
+        Log in to the Lemmy instance and look up the ID of the community.
+
+        The token and the community ID are stored in the db, and reused by later runs until they expire or Lemmy
+        rejects the token, so that restarts don't log in again.
+
+        Args:
+            use_stored_session (bool, optional): Whether to reuse the stored token and community ID. Defaults to True.
 
-        self.lemmy = Lemmy(self.lemmy_instance, request_timeout=REQUEST_TIMEOUT)
-        self.lemmy.log_in(self.bot_name, self.password)
-        self.community_id = self.lemmy.discover_community(self.community_name)
-        if self.community_id is None:
-            LOGGER.e(TAG, f"__init__(): Community {community_name} not found")
-            raise ValueError(f"Community {community_name} not found")
+        Returns:
+            None
+        """
+        if self.lemmy_instance is None:
+            self.lemmy_instance = environment_util.lemmy_instance
+        if self.bot_name is None:
+            self.bot_name = environment_util.bot_name
+        if self.password is None:
+            self.password = environment_util.password
+        if self.community_name is None:
+            self.community_name = environment_util.community_name
+        now = datetime_util.get_current_time_as_utc()
+        try:
+            # Raise on failed requests, so that request() can tell a rejected token apart from other failures. Creating
+            #  the client already sends a request, for the nodeinfo of the instance.
+            lemmy = Lemmy(self.lemmy_instance, raise_exceptions=True, request_timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            LOGGER.e(TAG, f"log_in(): Failed to connect to {self.lemmy_instance}", e)
+            raise ValueError(f"Failed to connect to {self.lemmy_instance}") from e
+        lemmy_session = self.client_lemmy_sessions_dao.get_lemmy_session(self.lemmy_instance, self.bot_name, self.community_name) if use_stored_session else None
+        if lemmy_session is not None and datetime.fromisoformat(lemmy_session.expires_at) > now:
+            LOGGER.i(TAG, f"log_in(): Reusing the stored login to {self.lemmy_instance} as {self.bot_name}, which expires at {lemmy_session.expires_at}")
+            get_lemmy_auth(lemmy).set_token(lemmy_session.jwt)
+            community_id = lemmy_session.community_id
+        else:
+            LOGGER.i(TAG, f"log_in(): Logging in to {self.lemmy_instance} as {self.bot_name}")
+            try:
+                is_logged_in = lemmy.log_in(self.bot_name, self.password)
+            except Exception as e:
+                LOGGER.e(TAG, "log_in(): The login request failed", e)
+                is_logged_in = False
+            if not is_logged_in:
+                LOGGER.e(TAG, f"log_in(): Failed to log in to {self.lemmy_instance} as {self.bot_name}")
+                raise ValueError(f"Failed to log in to {self.lemmy_instance} as {self.bot_name}")
+            try:
+                community_id = lemmy.discover_community(self.community_name)
+            except Exception as e:
+                LOGGER.e(TAG, "log_in(): The community lookup failed", e)
+                community_id = None
+            if community_id is None:
+                LOGGER.e(TAG, f"log_in(): Community {self.community_name} not found")
+                raise ValueError(f"Community {self.community_name} not found")
+            jwt = get_lemmy_auth(lemmy).token
+            self.client_lemmy_sessions_dao.upsert_lemmy_session(self.lemmy_instance, self.bot_name, self.community_name, jwt, community_id,
+                                                                get_jwt_expiry(jwt, now).isoformat())
+        self._lemmy = lemmy
+        self._community_id = community_id
+
+    def request(self, bucket: str, send: Callable[[], Optional[dict]], is_idempotent: bool = True) -> Optional[dict]:
+        """
+        Send a request to Lemmy, waiting first if the bucket of the request is out of tokens.
+
+        If Lemmy rejects the token, log in again and send it once more. If the request fails with a transient error,
+        retry it with exponential backoff, as long as the retry budget isn't spent. Requests that aren't idempotent,
+        such as creates, are only retried when they were rate limited, since otherwise they may have been carried out.
+
+        Args:
+            bucket (str): The bucket of the request: BUCKET_POST, BUCKET_COMMENT or BUCKET_FEATURE.
+            send (Callable[[], Optional[dict]]): Sends the request through self.lemmy and returns the response.
+            is_idempotent (bool, optional): Whether sending the request twice has the same effect as sending it once. Defaults to True.
+
+        Returns:
+            Optional[dict]: The response, or None if the request failed.
+        """
+        has_logged_in_again = False
+        retries = 0
+        while True:
+            waited = self.rate_limiter.acquire(bucket)
+            if waited > 0:
+                LOGGER.d(TAG, f"request(): Throttled a {bucket} request for {waited:.1f} s")
+                with self._stats_lock:
+                    self.request_stats.throttled += 1
+                    self.request_stats.throttled_seconds += waited
+            try:
+                return send()
+            except Exception as e:
+                if is_auth_error(e) and not has_logged_in_again:
+                    LOGGER.w(TAG, f"request(): The login to {self.lemmy_instance} was rejected. Logging in again.")
+                    has_logged_in_again = True
+                    self.client_lemmy_sessions_dao.delete_lemmy_session(self.lemmy_instance, self.bot_name, self.community_name)
+                    # Log in again on the next send, so that a failed login is handled like any other failed request
+                    self._lemmy = None
+                    continue
+                if not is_transient_error(e) or (not is_idempotent and not is_rate_limit_error(e)):
+                    LOGGER.e(TAG, "request(): The request failed", e)
+                    return None
+                if retries + 1 >= self.retry_policy.max_attempts:
+                    LOGGER.e(TAG, f"request(): The request failed after {retries + 1} attempts", e)
+                    with self._stats_lock:
+                        self.request_stats.gave_up += 1
+                    return None
+                if not self.rate_limiter.try_spend_retry():
+                    LOGGER.e(TAG, "request(): The request failed and the retry budget is spent", e)
+                    with self._stats_lock:
+                        self.request_stats.retry_budget_exhausted += 1
+                    return None
+                delay = self.retry_policy.get_delay(retries)
+                LOGGER.w(TAG, f"request(): The request failed with a transient error. Retrying in {delay:.1f} s. Error: {e}")
+                with self._stats_lock:
+                    self.request_stats.retried += 1
+                retries += 1
+                self.rate_limiter.sleep(delay)
 
     def create_game_day_thread(self, title: str, body: str, game_id: int) -> int:
         """
@@ -69,16 +349,17 @@ class LemmyClient:
             int: The ID of the created thread.
         """
         # TODO: update to return GDT record instead of post id
-        post_id = pydash.get(self.lemmy.post.create(self.community_id, name=title, body=body),
+        post_id = pydash.get(self.request(BUCKET_POST, lambda: self.lemmy.post.create(self.community_id, name=title, body=body), is_idempotent=False),
                              f"{DICT_KEY_POST_VIEW}.{DICT_KEY_POST}.{DICT_KEY_ID}", -1)
         if post_id == -1:
             LOGGER.e(TAG, f"create_game_day_thread(): Failed to create post for game {game_id}")
             return -1
+        self.client_content_hashes_dao.upsert_content_hashes(TARGET_TYPE_POST, post_id, get_content_hash(title), get_content_hash(body))
         return self.client_game_day_threads_dao.insert_game_day_thread(post_id, game_id)
 
-    def update_game_day_thread(self, title: str, body: str, post_id: int):
+    def update_game_day_thread(self, title: str, body: str, post_id: int) -> bool:
         """
-        Updates a game day thread.
+        Updates a game day thread. The edit is skipped if the title and body are the same as the last ones sent.
 
         Args:
             title (str): The title of the thread.
@@ -86,9 +367,9 @@ class LemmyClient:
             post_id (int): The ID of the thread to update.
 
         Returns:
-            None
+            bool: True if the edit was sent, False if it was skipped or failed.
         """
-        self.lemmy.post.edit(post_id=post_id, name=title, body=body)
+        return self.edit_post(post_id, title, body)
 
     def create_daily_thread(self, date: str, title: str, body: str) -> Optional[DailyThreadsRecord]:
         """
@@ -102,16 +383,17 @@ class LemmyClient:
         Returns:
             Optional[DailyThreadsRecord]: The created thread if successful, else None.
         """
-        post_id = pydash.get(self.lemmy.post.create(self.community_id, name=title, body=body),
+        post_id = pydash.get(self.request(BUCKET_POST, lambda: self.lemmy.post.create(self.community_id, name=title, body=body), is_idempotent=False),
                              f"{DICT_KEY_POST_VIEW}.{DICT_KEY_POST}.{DICT_KEY_ID}", -1)
         if post_id == -1:
             LOGGER.e(TAG, f"create_daily_thread(): Failed to create daily thread for date: {date}")
             return None
+        self.client_content_hashes_dao.upsert_content_hashes(TARGET_TYPE_POST, post_id, get_content_hash(title), get_content_hash(body))
         return self.client_daily_threads_dao.insert_daily_thread(post_id, date, False)
 
-    def update_daily_thread(self, post_id: int, title: str, body: str):
+    def update_daily_thread(self, post_id: int, title: str, body: str) -> bool:
         """
-        Updates a daily thread.
+        Updates a daily thread. The edit is skipped if the title and body are the same as the last ones sent.
 
         Args:
             post_id (int): The ID of the thread to update.
@@ -119,9 +401,37 @@ class LemmyClient:
             body (str): The body of the thread.
 
         Returns:
-            None
+            bool: True if the edit was sent, False if it was skipped or failed.
+        """
+        return self.edit_post(post_id, title, body)
+
+    def edit_post(self, post_id: int, title: str, body: str) -> bool:
+        """
+        Edits a post, unless the title and body hash the same as the last ones sent for it.
+
+        Args:
+            post_id (int): The ID of the post to edit.
+            title (str): The title of the post.
+            body (str): The body of the post.
+
+        Returns:
+            bool: True if the edit was sent, False if it was skipped or failed.
         """
-        self.lemmy.post.edit(post_id=post_id, name=title, body=body)
+        title_hash = get_content_hash(title)
+        body_hash = get_content_hash(body)
+        content_hashes = self.client_content_hashes_dao.get_content_hashes(TARGET_TYPE_POST, post_id)
+        if content_hashes is not None and content_hashes.title_hash == title_hash and content_hashes.body_hash == body_hash:
+            LOGGER.d(TAG, f"edit_post(): Content of post {post_id} hasn't changed. Skipping the edit.")
+            with self._stats_lock:
+                self.edit_stats.skipped += 1
+            return False
+        if self.request(BUCKET_POST, lambda: self.lemmy.post.edit(post_id=post_id, name=title, body=body)) is None:
+            # Don't store the hashes, so that the edit is sent again next time
+            return False
+        self.client_content_hashes_dao.upsert_content_hashes(TARGET_TYPE_POST, post_id, title_hash, body_hash)
+        with self._stats_lock:
+            self.edit_stats.sent += 1
+        return True
 
     def delete_post(self, post_id: int) -> Optional[dict]:
         """
@@ -131,7 +441,7 @@ class LemmyClient:
             post_id (int): The ID of the post to delete.
 
         """
-        return self.lemmy.post.delete(post_id=post_id, deleted=True)
+        return self.request(BUCKET_POST, lambda: self.lemmy.post.delete(post_id=post_id, deleted=True))
 
     def create_comment(self, post_id: int, game_id: int, content: str) -> Optional[CommentsRecord]:
         """
@@ -145,24 +455,54 @@ class LemmyClient:
         Returns:
             CommentsRecord: The created comment.
         """
-        comment_id = pydash.get(self.lemmy.comment.create(post_id=post_id, content=content), f"comment_view.comment.id", -1)
-        if not comment_id:
+        comment_id = pydash.get(self.request(BUCKET_COMMENT, lambda: self.lemmy.comment.create(post_id=post_id, content=content), is_idempotent=False), f"comment_view.comment.id", -1)
+        if comment_id == -1:
             LOGGER.e(TAG, f"create_comment(): Failed to create comment. post_id: {post_id}; game_id: {game_id}")
             return None
+        self.client_content_hashes_dao.upsert_content_hashes(TARGET_TYPE_COMMENT, comment_id, None, get_content_hash(content))
         return self.client_comments_dao.insert_comment(comment_id, game_id)
 
-    def update_comment(self, comment_id: int, content: str):
+    def update_comment(self, comment_id: int, content: str) -> bool:
         """
-        Updates a comment.
+        Updates a comment. The edit is skipped if the content is the same as the last one sent.
 
         Args:
             comment_id (int): The ID of the comment to update.
             content (str): The content of the comment.
 
         Returns:
-            None
+            bool: True if the edit was sent, False if it was skipped or failed.
+        """
+        body_hash = get_content_hash(content)
+        content_hashes = self.client_content_hashes_dao.get_content_hashes(TARGET_TYPE_COMMENT, comment_id)
+        if content_hashes is not None and content_hashes.body_hash == body_hash:
+            LOGGER.d(TAG, f"update_comment(): Content of comment {comment_id} hasn't changed. Skipping the edit.")
+            with self._stats_lock:
+                self.edit_stats.skipped += 1
+            return False
+        if self.request(BUCKET_COMMENT, lambda: self.lemmy.comment.edit(comment_id=comment_id, content=content)) is None:
+            # Don't store the hash, so that the edit is sent again next time
+            return False
+        self.client_content_hashes_dao.upsert_content_hashes(TARGET_TYPE_COMMENT, comment_id, None, body_hash)
+        with self._stats_lock:
+            self.edit_stats.sent += 1
+        return True
+
+    def is_content_sent(self, target_type: str, target_id: int, body: str) -> bool:
         """
-        self.lemmy.comment.edit(comment_id=comment_id, content=content)
+        Checks whether a body is the last one sent for a post or comment, e.g. to tell an edit that was skipped from
+        one that failed.
+
+        Args:
+            target_type (str): TARGET_TYPE_POST or TARGET_TYPE_COMMENT.
+            target_id (int): The ID of the post or comment.
+            body (str): The body of the post, or the content of the comment.
+
+        Returns:
+            bool: True if the body hashes the same as the last one sent.
+        """
+        content_hashes = self.client_content_hashes_dao.get_content_hashes(target_type, target_id)
+        return content_hashes is not None and content_hashes.body_hash == get_content_hash(body)
 
     def delete_comment(self, comment_id: int) -> Optional[dict]:
         """
@@ -174,7 +514,7 @@ class LemmyClient:
         Returns:
             None
         """
-        return self.lemmy.comment.delete(comment_id=comment_id, deleted=True)
+        return self.request(BUCKET_COMMENT, lambda: self.lemmy.comment.delete(comment_id=comment_id, deleted=True))
 
     def feature_daily_thread(self, post_id: int):
         """
@@ -186,7 +526,7 @@ class LemmyClient:
         Returns:
             None
         """
-        self.lemmy.post.feature(post_id, True, FeatureType.Community)
+        self.request(BUCKET_FEATURE, lambda: self.lemmy.post.feature(post_id, True, FeatureType.Community))
         self.client_daily_threads_dao.feature_daily_thread(post_id)
 
     def unfeature_daily_thread(self, post_id: int):
@@ -199,10 +539,33 @@ class LemmyClient:
         Returns:
             None
         """
-        self.lemmy.post.feature(post_id, False, FeatureType.Community)
+        self.request(BUCKET_FEATURE, lambda: self.lemmy.post.feature(post_id, False, FeatureType.Community))
         self.client_daily_threads_dao.unfeature_daily_thread(post_id)
 
+    def pop_edit_stats(self) -> EditStats:
+        """
+        Get the number of edits that were sent and skipped since the last call, and reset the counts.
+
+        Returns:
+            EditStats: The edit stats.
+        """
+        with self._stats_lock:
+            edit_stats = self.edit_stats
+            self.edit_stats = EditStats()
+        return edit_stats
+
+    def pop_request_stats(self) -> RequestStats:
+        """
+        Get the number of requests that were throttled and retried since the last call, and reset the counts.
+
+        Returns:
+            RequestStats: The request stats.
+        """
+        with self._stats_lock:
+            request_stats = self.request_stats
+            self.request_stats = RequestStats()
+        return request_stats
+
 
-# Set the lemmy_client instance to be used globally
-lemmy_client = LemmyClient(environment_util.lemmy_instance, environment_util.bot_name, environment_util.password,
-                           environment_util.community_name)
+# Set the lemmy_client instance to be used globally. It logs in with the credentials from the environment on first use.
+lemmy_client = LemmyClient()
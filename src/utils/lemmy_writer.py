@@ -0,0 +1,219 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from src.db.db_manager import db_manager, DbManager
+from src.utils.log_util import LOGGER
+from src.utils.signal_util import signal_util
+
+TAG = "LemmyWriter"
+
+# Creates are sent before edits, so that a new game's post or comment isn't stuck behind edits of the others.
+PRIORITY_CREATE = 0
+PRIORITY_EDIT = 1
+PRIORITIES = (PRIORITY_CREATE, PRIORITY_EDIT)
+
+# How long to wait for the pending writes to be sent when shutting down
+DRAIN_TIMEOUT_SECONDS = 30
+
+
+@dataclass
+class WriterStats:
+    submitted: int = 0
+    coalesced: int = 0
+    sent: int = 0
+    failed: int = 0
+
+
+class LemmyWriter:
+    """
+    Sends writes to Lemmy from a background thread, so that the main loop doesn't wait on Lemmy.
+
+    Writes are keyed by their target, e.g. ("post", post_id). A write submitted for a target that already has a write
+    pending replaces it, so only the latest content of each target is sent. Creates are sent before edits, and writes of
+    the same priority are sent in the order their targets were first submitted.
+    """
+
+    def __init__(self, writer_db_manager: Optional[DbManager] = None):
+        """
+        Initialize the writer. The thread is started by start().
+
+        Args:
+            writer_db_manager (Optional[DbManager], optional): The db manager of the DAOs that the writes update. Each create is committed on its own, and each run of edits at once. Defaults to None. If None, the default db manager set in db_manager.py will be used.
+        """
+        self.db_manager = writer_db_manager if writer_db_manager else db_manager
+        self.condition = threading.Condition()
+        self.pending: dict[int, OrderedDict[Hashable, Callable[[], Any]]] = {priority: OrderedDict() for priority in PRIORITIES}
+        self.is_stopping = False
+        self.thread: Optional[threading.Thread] = None
+        self.stats = WriterStats()
+
+    def start(self):
+        """
+        Start the thread that sends the writes, and stop it when the program is interrupted.
+
+        Returns:
+            None
+        """
+        if self.thread is not None:
+            return
+        signal_util.add_interrupt_listener(self.stop)
+        self.thread = threading.Thread(target=self._run, name=TAG, daemon=True)
+        self.thread.start()
+
+    def submit(self, key: Hashable, priority: int, write: Callable[[], Any]) -> bool:
+        """
+        Queue a write.
+
+        Args:
+            key (Hashable): The target of the write. A pending write with the same key and priority is replaced.
+            priority (int): PRIORITY_CREATE or PRIORITY_EDIT.
+            write (Callable[[], Any]): Sends the write.
+
+        Returns:
+            bool: False if the writer is stopping and the write was dropped, True otherwise.
+        """
+        with self.condition:
+            if self.is_stopping:
+                LOGGER.w(TAG, f"submit(): Stopping. Dropping the write for {key}.")
+                return False
+            pending = self.pending[priority]
+            if key in pending:
+                self.stats.coalesced += 1
+            self.stats.submitted += 1
+            # Replacing the value keeps the key's place in the queue
+            pending[key] = write
+            self.condition.notify()
+        return True
+
+    def is_pending(self, key: Hashable) -> bool:
+        """
+        Check whether a write for a target is waiting to be sent.
+
+        Args:
+            key (Hashable): The target of the write.
+
+        Returns:
+            bool: True if a write with the key is pending, whatever its priority.
+        """
+        with self.condition:
+            return any(key in pending for pending in self.pending.values())
+
+    def get_pending_count(self) -> int:
+        """
+        Get the number of writes waiting to be sent.
+
+        Returns:
+            int: The number of pending writes.
+        """
+        with self.condition:
+            return sum(len(pending) for pending in self.pending.values())
+
+    def _pop_next(self, priorities: tuple[int, ...] = PRIORITIES) -> Optional[tuple[int, Hashable, Callable[[], Any]]]:
+        with self.condition:
+            for priority in priorities:
+                if self.pending[priority]:
+                    return (priority, *self.pending[priority].popitem(last=False))
+        return None
+
+    def _has_pending(self, priority: int) -> bool:
+        with self.condition:
+            return bool(self.pending[priority])
+
+    def _send(self, key: Hashable, write: Callable[[], Any]):
+        try:
+            write()
+            with self.condition:
+                self.stats.sent += 1
+        except Exception as e:
+            with self.condition:
+                self.stats.failed += 1
+            LOGGER.e(TAG, f"run_pending(): The write for {key} failed", e)
+
+    def run_pending(self) -> int:
+        """
+        Send the pending writes on the calling thread, until there are none left. Writes submitted meanwhile are sent too.
+
+        A create is committed as soon as it is sent, so that a post or comment that exists on Lemmy is never missing from
+        the db, which would make the next run create it again. Edits in a row are committed at once: they only record the
+        hashes of what was sent, and losing those only means an edit is sent again.
+
+        Returns:
+            int: The number of writes that were sent or failed.
+        """
+        count = 0
+        while (job := self._pop_next()) is not None:
+            priority, key, write = job
+            count += 1
+            if priority == PRIORITY_CREATE:
+                self._send(key, write)
+                continue
+            with self.db_manager.transaction(rollback_on_error=False):
+                self._send(key, write)
+                # Stop batching as soon as a create is submitted, so that it is sent and committed first
+                while not self._has_pending(PRIORITY_CREATE) and (job := self._pop_next((PRIORITY_EDIT,))) is not None:
+                    _, key, write = job
+                    count += 1
+                    self._send(key, write)
+        return count
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.is_stopping and not any(self.pending.values()):
+                    self.condition.wait()
+                if self.is_stopping and not any(self.pending.values()):
+                    LOGGER.i(TAG, "_run(): Drained. Stopping.")
+                    return
+            self.run_pending()
+
+    def stop(self):
+        """
+        Stop accepting writes. The thread sends the pending writes, then exits.
+
+        Returns:
+            None
+        """
+        with self.condition:
+            self.is_stopping = True
+            self.condition.notify_all()
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS) -> bool:
+        """
+        Stop accepting writes, and wait for the pending writes to be sent.
+
+        Args:
+            timeout (float, optional): How long to wait, in seconds. Defaults to DRAIN_TIMEOUT_SECONDS.
+
+        Returns:
+            bool: True if every pending write was sent, False if the timeout was reached first.
+        """
+        self.stop()
+        if self.thread is None:
+            self.run_pending()
+        else:
+            self.thread.join(timeout)
+        pending_count = self.get_pending_count()
+        if pending_count or (self.thread is not None and self.thread.is_alive()):
+            LOGGER.w(TAG, f"drain(): Timed out with {pending_count} writes pending")
+            # The thread may be in the middle of a batch of edits. Commit what it has written so far before exiting.
+            self.db_manager.commit_now()
+            return False
+        return True
+
+    def pop_stats(self) -> WriterStats:
+        """
+        Get the counts of writes since the last call, and reset them.
+
+        Returns:
+            WriterStats: The stats.
+        """
+        with self.condition:
+            stats = self.stats
+            self.stats = WriterStats()
+        return stats
+
+
+# Set the lemmy_writer instance to be used globally. main() starts it.
+lemmy_writer = LemmyWriter()
@@ -1,8 +1,34 @@
-from typing import Final
+import threading
+from typing import Final, Optional, cast
 import logger
 from logger import Logger
 import src.utils.constants as constants
 
 from src.utils.environment_util import environment_util
 
-LOGGER: Final[Logger] = Logger(constants.OUT_PATH, environment_util.log_level, environment_util.log_file_max_mb * logger.MEGABYTE, environment_util.log_file_backup_count, environment_util.error_backup_count)
+_logger: Optional[Logger] = None
+_logger_lock = threading.Lock()
+
+
+def get_logger() -> Logger:
+    """
+    Get the logger, creating it the first time. Creating the logger reads the environment and opens the log files in
+    the out directory, so it is put off until something is logged rather than done when this module is imported.
+
+    Returns:
+        Logger: The logger.
+    """
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = Logger(constants.OUT_PATH, environment_util.log_level, environment_util.log_file_max_mb * logger.MEGABYTE, environment_util.log_file_backup_count, environment_util.error_backup_count)
+    return _logger
+
+
+class _LazyLogger:
+    def __getattr__(self, name: str):
+        return getattr(get_logger(), name)
+
+
+LOGGER: Final[Logger] = cast(Logger, _LazyLogger())
@@ -1,10 +1,13 @@
 import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Optional
 
-import inflect
-import pydash
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.datatypes.Exceptions.IllegalArgumentException import IllegalArgumentException
 from src.datatypes.game import Game
@@ -16,7 +19,13 @@ from src.datatypes.shootout import Shootout
 from src.datatypes.team_stats import TeamStats
 from src.datatypes.teams import Teams, get_team_from_id
 from src.utils import datetime_util
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.environment_util import environment_util
+from src.utils.field_accessor import compile_path
+from src.utils.http_cache import HttpCache, HEADER_ETAG, HEADER_LAST_MODIFIED
 from src.utils.log_util import LOGGER
+from src.utils.rate_limiter import RetryPolicy
+from src.utils.schedule_cache import ScheduleCache
 
 TAG = "nhl_api_client.py"
 
@@ -55,6 +64,7 @@ DICT_KEY_CLOCK = 'clock'
 DICT_KEY_TIME_REMAINING = 'timeRemaining'
 DICT_KEY_PENALTIES = 'penalties'
 DICT_KEY_GAME_WEEK = 'gameWeek'
+DICT_KEY_DATE = 'date'
 DICT_KEY_SUMMARY = 'summary'
 DICT_KEY_SHOTS_BY_PERIOD = 'shotsByPeriod'
 DICT_KEY_BY_PERIOD = 'byPeriod'
@@ -94,6 +104,59 @@ DICT_KEY_HOME_VALUE = 'homeValue'
 DICT_KEY_AWAY_VALUE = 'awayValue'
 DICT_KEY_TOTALS = 'totals'
 
+# Compiled getters for the paths read by the parsers
+GET_ASSISTS = compile_path(DICT_KEY_ASSISTS)
+GET_ASSISTS_TO_DATE = compile_path(DICT_KEY_ASSISTS_TO_DATE)
+GET_AWAY = compile_path(DICT_KEY_AWAY)
+GET_AWAY_ATTEMPTS = compile_path(DICT_KEY_AWAY_ATTEMPTS)
+GET_AWAY_CONVERSIONS = compile_path(DICT_KEY_AWAY_CONVERSIONS)
+GET_AWAY_TEAM_ABBREV = compile_path(DICT_KEY_AWAY_TEAM, DICT_KEY_ABBREV)
+GET_AWAY_TEAM_ID = compile_path(DICT_KEY_AWAY_TEAM, DICT_KEY_ID)
+GET_AWAY_VALUE = compile_path(DICT_KEY_AWAY_VALUE)
+GET_CATEGORY = compile_path(DICT_KEY_CATEGORY)
+GET_CLOCK_IN_INTERMISSION = compile_path(DICT_KEY_CLOCK, DICT_KEY_IN_INTERMISSION)
+GET_CLOCK_TIME_REMAINING = compile_path(DICT_KEY_CLOCK, DICT_KEY_TIME_REMAINING)
+GET_COMMITTED_BY_PLAYER = compile_path(DICT_KEY_COMMITTED_BY_PLAYER)
+GET_DATE = compile_path(DICT_KEY_DATE)
+GET_DEFAULT = compile_path(DICT_KEY_DEFAULT)
+GET_DESC_KEY = compile_path(DICT_KEY_DESC_KEY)
+GET_DRAWN_BY = compile_path(DICT_KEY_DRAWN_BY)
+GET_DURATION = compile_path(DICT_KEY_DURATION)
+GET_FIRST_NAME = compile_path(DICT_KEY_FIRST_NAME)
+GET_GAMES = compile_path(DICT_KEY_GAMES)
+GET_GAME_STATE = compile_path(DICT_KEY_GAME_STATE)
+GET_GAME_WEEK = compile_path(DICT_KEY_GAME_WEEK)
+GET_GOALS = compile_path(DICT_KEY_GOALS)
+GET_GOALS_TO_DATE = compile_path(DICT_KEY_GOALS_TO_DATE)
+GET_HIGHLIGHT_CLIP = compile_path(DICT_KEY_HIGHLIGHT_CLIP)
+GET_HOME = compile_path(DICT_KEY_HOME)
+GET_HOME_ATTEMPTS = compile_path(DICT_KEY_HOME_ATTEMPTS)
+GET_HOME_CONVERSIONS = compile_path(DICT_KEY_HOME_CONVERSIONS)
+GET_HOME_TEAM_ABBREV = compile_path(DICT_KEY_HOME_TEAM, DICT_KEY_ABBREV)
+GET_HOME_TEAM_ID = compile_path(DICT_KEY_HOME_TEAM, DICT_KEY_ID)
+GET_HOME_VALUE = compile_path(DICT_KEY_HOME_VALUE)
+GET_ID = compile_path(DICT_KEY_ID)
+GET_LAST_NAME = compile_path(DICT_KEY_LAST_NAME)
+GET_PENALTIES = compile_path(DICT_KEY_PENALTIES)
+GET_PERIOD_DESCRIPTOR_NUMBER = compile_path(DICT_KEY_PERIOD_DESCRIPTOR, DICT_KEY_NUMBER)
+GET_PERIOD_DESCRIPTOR_OT_PERIODS = compile_path(DICT_KEY_PERIOD_DESCRIPTOR, DICT_KEY_OT_PERIODS)
+GET_PERIOD_DESCRIPTOR_PERIOD_TYPE = compile_path(DICT_KEY_PERIOD_DESCRIPTOR, DICT_KEY_PERIOD_TYPE)
+GET_SHOT_TYPE = compile_path(DICT_KEY_SHOT_TYPE)
+GET_START_TIME_UTC = compile_path(DICT_KEY_START_TIME_UTC)
+GET_STRENGTH = compile_path(DICT_KEY_STRENGTH)
+GET_SUMMARY_LINESCORE_BY_PERIOD = compile_path(DICT_KEY_SUMMARY, DICT_KEY_LINESCORE, DICT_KEY_BY_PERIOD)
+GET_SUMMARY_LINESCORE_SHOOTOUT = compile_path(DICT_KEY_SUMMARY, DICT_KEY_LINESCORE, DICT_KEY_SHOOTOUT)
+GET_SUMMARY_LINESCORE_TOTALS_AWAY = compile_path(DICT_KEY_SUMMARY, DICT_KEY_LINESCORE, DICT_KEY_TOTALS, DICT_KEY_AWAY)
+GET_SUMMARY_LINESCORE_TOTALS_HOME = compile_path(DICT_KEY_SUMMARY, DICT_KEY_LINESCORE, DICT_KEY_TOTALS, DICT_KEY_HOME)
+GET_SUMMARY_PENALTIES = compile_path(DICT_KEY_SUMMARY, DICT_KEY_PENALTIES)
+GET_SUMMARY_SCORING = compile_path(DICT_KEY_SUMMARY, DICT_KEY_SCORING)
+GET_SUMMARY_SEASON_SERIES = compile_path(DICT_KEY_SUMMARY, DICT_KEY_SEASON_SERIES)
+GET_SUMMARY_SHOTS_BY_PERIOD = compile_path(DICT_KEY_SUMMARY, DICT_KEY_SHOTS_BY_PERIOD)
+GET_SUMMARY_TEAM_GAME_STATS = compile_path(DICT_KEY_SUMMARY, DICT_KEY_TEAM_GAME_STATS)
+GET_TEAM_ABBREV = compile_path(DICT_KEY_TEAM_ABBREV)
+GET_TIME_IN_PERIOD = compile_path(DICT_KEY_TIME_IN_PERIOD)
+GET_TYPE = compile_path(DICT_KEY_TYPE)
+
 
 class TeamStatCategories(Enum):
     SOG = 'sog'
@@ -120,7 +183,117 @@ PERIOD_DEFAULT = "0"
 REQUEST_TIMEOUT = 10
 INTERMISSION_TIME_CLOCK = "INT"
 
-p = inflect.engine()
+HEADER_ACCEPT_ENCODING = "Accept-Encoding"
+HEADER_CONNECTION = "Connection"
+ACCEPT_ENCODING = "gzip, deflate"
+CONNECTION_KEEP_ALIVE = "keep-alive"
+
+# The NHL API is given up on after this many failed requests in a row, each already retried, and probed again after
+#  NHL_API_RESET_TIMEOUT_SECONDS. Meanwhile the last good schedule and games are used.
+NHL_API_FAILURE_THRESHOLD = 5
+NHL_API_RESET_TIMEOUT_SECONDS = 60
+
+# The number of games whose last good parse is kept, to fall back on when their landing can't be fetched
+MAX_LAST_GOOD_GAMES = 64
+
+# The ordinals of the regulation periods, looked up for every period, goal and penalty. Other period numbers fall
+#  back on get_ordinal().
+PERIOD_ORDINALS = {1: "1st", 2: "2nd", 3: "3rd"}
+ORDINAL_SUFFIXES = {1: "st", 2: "nd", 3: "rd"}
+
+
+class NhlApiUnavailableError(Exception):
+    """
+    Raised instead of sending a request while the circuit breaker of the NHL API is open.
+    """
+
+
+def create_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Creates a requests session with a keep-alive connection pool for the NHL API.
+    Reusing the session lets every request after the first one skip the TCP and TLS handshakes.
+
+    Args:
+        pool_size: The maximum number of connections kept open to the NHL API. Defaults to MAX_CONCURRENT_NHL_API_REQUESTS
+                   from the environment, so every concurrent landing fetch can hold its own connection.
+
+    Returns:
+        requests.Session: The session
+    """
+    if pool_size is None:
+        pool_size = environment_util.max_concurrent_nhl_api_requests
+    pool_size = max(pool_size, 1)
+    new_session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=False)
+    new_session.mount("https://", adapter)
+    new_session.mount("http://", adapter)
+    new_session.headers.update({
+        HEADER_ACCEPT_ENCODING: ACCEPT_ENCODING,
+        HEADER_CONNECTION: CONNECTION_KEEP_ALIVE,
+    })
+    return new_session
+
+
+def set_session(new_session: requests.Session) -> requests.Session:
+    """
+    Replaces the session used for all NHL API requests. Useful for injecting a fake session in tests.
+
+    Args:
+        new_session: The session to use
+
+    Returns:
+        requests.Session: The session that was replaced, so that it can be restored
+    """
+    global session
+    old_session = session
+    session = new_session
+    return old_session
+
+
+def get_session() -> requests.Session:
+    """
+    Gets the session used for all NHL API requests, creating it the first time.
+
+    Returns:
+        requests.Session: The session
+    """
+    global session
+    if session is None:
+        session = create_session()
+    return session
+
+
+def get_schedule_cache() -> ScheduleCache:
+    """
+    Gets the cache of scheduled games, creating it the first time with the TTL from the environment.
+
+    Returns:
+        ScheduleCache: The schedule cache
+    """
+    global schedule_cache
+    if schedule_cache is None:
+        schedule_cache = ScheduleCache(environment_util.schedule_cache_ttl_minutes * 60)
+    return schedule_cache
+
+
+# The session shared by every request in this module. Created on first use, because its pool size comes from the environment.
+session: Optional[requests.Session] = None
+
+# Validators and bodies of landing responses, used to make conditional requests
+landing_cache = HttpCache()
+
+# Scheduled games by day, filled a week at a time. Created on first use, because its TTL comes from the environment.
+schedule_cache: Optional[ScheduleCache] = None
+
+# How failed requests are retried. Each request is retried a couple of times within a cycle; the circuit breaker
+#  handles longer outages.
+retry_policy = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4)
+
+circuit_breaker = CircuitBreaker("NHL API", NHL_API_FAILURE_THRESHOLD, NHL_API_RESET_TIMEOUT_SECONDS)
+
+# The last game parsed from a landing, by game ID
+last_good_games: OrderedDict[int, Game] = OrderedDict()
+last_good_games_lock = threading.Lock()
 
 
 def get_schedule_url(date: str) -> str:
@@ -180,12 +353,13 @@ def filter_games_by_date(games: list[Game], date: str) -> list[Game]:
     Returns:
         list[Game]: The filtered games
     """
-    return list(filter(lambda game: datetime_util.is_same_day(game.start_time, date) if game else None, games))
+    return list(filter(lambda game: datetime_util.get_day_key(game.start_time) == date if game else None, games))
 
 
 def get_schedule(schedule_date: str = None) -> list[Game]:
     """
-    Gets the schedule
+    Gets the schedule. The NHL API returns a whole week at a time, so every day of the week is stored in the schedule
+    cache, and only days that aren't cached (or have expired) cause a request.
 
     Args:
         schedule_date: the date of the schedule
@@ -195,50 +369,132 @@ def get_schedule(schedule_date: str = None) -> list[Game]:
     """
     if schedule_date is None:
         schedule_date = datetime_util.get_current_day_as_idlw()
+    schedule = get_schedule_cache().get(schedule_date)
+    if schedule is not None:
+        LOGGER.d(TAG, f"get_schedule(): using cached schedule for {schedule_date}")
+        return schedule
     url = get_schedule_url(schedule_date)
     LOGGER.i(TAG, f"get_schedule(): url: {url}")
     try:
-        game_week = pydash.get(json.loads(requests.get(url, timeout=REQUEST_TIMEOUT).text), DICT_KEY_GAME_WEEK, [])
-        games = []
-        for date in game_week:
-            game_list = pydash.get(date, DICT_KEY_GAMES, [])
-            for game in game_list:
-                games.append(game)
-        schedule = []
-        for game in games:
-            schedule.append(parse_scheduled_game(game))
-        schedule = filter_games_by_date(schedule, schedule_date)
-    except requests.exceptions.Timeout as e:
-        LOGGER.e(TAG, "get_schedule(): a timeout occurred", e)
-        schedule = []
-    except requests.exceptions.ConnectionError as e:
-        LOGGER.e(TAG, "get_schedule(): A connection error occurred", e)
-        schedule = []
-    return schedule
-
-
-def get_games(schedule: list[Game]) -> list[Game]:
-    """
-    Gets the games
+        _, schedule_json = send_request(url, {})
+        game_week = GET_GAME_WEEK(schedule_json, [])
+    except (requests.exceptions.RequestException, ValueError, NhlApiUnavailableError) as e:
+        schedule = get_schedule_cache().get(schedule_date, allow_expired=True)
+        if schedule is not None:
+            LOGGER.w(TAG, f"get_schedule(): The request failed. Using the expired schedule for {schedule_date}. Error: {e}")
+            return schedule
+        LOGGER.e(TAG, "get_schedule(): The request failed", e)
+        return []
+
+    schedule_by_day = {schedule_date: []}
+    for date in game_week:
+        schedule_by_day.setdefault(GET_DATE(date, ""), [])
+    for date in game_week:
+        for game in GET_GAMES(date, []):
+            scheduled_game = parse_scheduled_game(game)
+            if not scheduled_game:
+                continue
+            day = datetime_util.get_day_key(scheduled_game.start_time)
+            if day in schedule_by_day:
+                schedule_by_day[day].append(scheduled_game)
+    schedule_by_day.pop("", None)
+    for day, games in schedule_by_day.items():
+        get_schedule_cache().put(day, games)
+    return list(schedule_by_day[schedule_date])
+
+
+def get_games(schedule: list[Game], max_workers: Optional[int] = None) -> list[Game]:
+    """
+    Gets the games. The landings are fetched concurrently, and the games are returned in the same order as the schedule.
 
     Args:
         schedule: The schedule
+        max_workers: The maximum number of landings to fetch at the same time. Defaults to MAX_CONCURRENT_NHL_API_REQUESTS from the environment.
+                     If this is 1 or less, the landings are fetched one at a time.
 
     Returns:
         list[Game]: The games
     """
     if not schedule:
         return []
-    games = []
-    for game in schedule:
-        landing = get_landing(game.id)
-        games.append(parse_game(landing))
+    if max_workers is None:
+        max_workers = environment_util.max_concurrent_nhl_api_requests
+    game_ids = [game.id for game in schedule]
+    if max_workers <= 1 or len(game_ids) == 1:
+        games = [get_game(game_id) for game_id in game_ids]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(game_ids)), thread_name_prefix="get_game") as executor:
+            # executor.map yields results in the order of the input, not the order they complete in
+            games = list(executor.map(get_game, game_ids))
+    LOGGER.d(TAG, f"get_games(): landing cache stats: {landing_cache.get_stats()}; circuit: {circuit_breaker.state.value}")
     return games
 
 
+def get_game(game_id: int) -> Optional[Game]:
+    """
+    Gets a game. If the landing hasn't changed since the last request, the game parsed last time is returned without parsing it again.
+    If the landing can't be fetched, the last game that was parsed for the ID is returned, so that its post keeps the
+    latest data.
+
+    Args:
+        game_id: the ID of the game
+
+    Returns:
+        Optional[Game]: the parsed game or None if it cannot be parsed
+    """
+    landing = get_landing(game_id)
+    if not landing:
+        game = get_last_good_game(game_id)
+        if game is not None:
+            LOGGER.w(TAG, f"get_game(): No landing for game {game_id}. Using the last good game.")
+        return game
+    entry = landing_cache.get(get_landing_url(game_id))
+    if entry is None or entry.body is not landing:
+        # The landing was not stored in the cache, e.g. the response had no validators
+        game = parse_game(landing)
+    else:
+        if entry.parsed is None:
+            entry.parsed = parse_game(landing)
+        game = entry.parsed
+    if game is not None:
+        put_last_good_game(game)
+    return game
+
+
+def get_last_good_game(game_id: int) -> Optional[Game]:
+    """
+    Gets the last game that was parsed for an ID.
+
+    Args:
+        game_id: the ID of the game
+
+    Returns:
+        Optional[Game]: the game, or None if none was parsed
+    """
+    with last_good_games_lock:
+        return last_good_games.get(game_id)
+
+
+def put_last_good_game(game: Game):
+    """
+    Stores the last game that was parsed for its ID. The games parsed least recently are dropped first.
+
+    Args:
+        game: the game
+
+    Returns:
+        None
+    """
+    with last_good_games_lock:
+        last_good_games[game.id] = game
+        last_good_games.move_to_end(game.id)
+        while len(last_good_games) > MAX_LAST_GOOD_GAMES:
+            last_good_games.popitem(last=False)
+
+
 def get_landing(game_id: int) -> dict:
     """
-    Gets the landing
+    Gets the landing. The request is made conditionally, so if the landing hasn't changed the cached landing is returned.
 
     Args:
         game_id: the ID of the game
@@ -251,16 +507,88 @@ def get_landing(game_id: int) -> dict:
     url = get_landing_url(game_id)
     LOGGER.i(TAG, f"get_landing(): url: {url}")
     try:
-        landing = json.loads(requests.get(url, timeout=REQUEST_TIMEOUT).text)
-    except requests.exceptions.Timeout as e:
-        LOGGER.e(TAG, "get_landing(): a timeout occurred", e)
+        landing = get_json_conditionally(url, landing_cache)
+    except NhlApiUnavailableError as e:
+        LOGGER.w(TAG, f"get_landing(): {e}")
         landing = {}
-    except requests.exceptions.ConnectionError as e:
-        LOGGER.e(TAG, "get_landing(): A connection error occurred", e)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        LOGGER.e(TAG, "get_landing(): The request failed", e)
         landing = {}
     return landing
 
 
+def send_request(url: str, headers: dict) -> tuple[requests.Response, Optional[dict]]:
+    """
+    Gets a URL from the NHL API and decodes the JSON response.
+    Timeouts, connection errors, 429 and 5xx responses and responses that aren't JSON, like the error pages of a proxy,
+    are retried with exponential backoff. A request that still fails counts towards opening the circuit breaker.
+
+    Args:
+        url: the URL to get
+        headers: the headers to send
+
+    Returns:
+        tuple[requests.Response, Optional[dict]]: the response, and its decoded body, or None if the response was 304 Not Modified
+
+    Raises:
+        NhlApiUnavailableError: if the circuit breaker is open, and the request wasn't sent
+        requests.exceptions.RequestException: if the request failed
+        ValueError: if the response wasn't JSON
+    """
+    if not circuit_breaker.allow_request():
+        raise NhlApiUnavailableError(f"The NHL API failed {circuit_breaker.failures} times in a row. Not requesting {url}.")
+    retries = 0
+    while True:
+        try:
+            response = get_session().get(url, timeout=REQUEST_TIMEOUT, headers=headers)
+        except requests.exceptions.RequestException as e:
+            error = e
+        else:
+            if response.status_code == requests.codes.too_many_requests or response.status_code >= 500:
+                error = requests.exceptions.HTTPError(f"{response.status_code} for url: {url}", response=response)
+            elif response.status_code >= 400:
+                # The NHL API is up and the request was wrong, so sending it again won't help
+                circuit_breaker.record_success()
+                raise requests.exceptions.HTTPError(f"{response.status_code} for url: {url}", response=response)
+            else:
+                try:
+                    body = None if response.status_code == requests.codes.not_modified else json.loads(response.text)
+                except ValueError as e:
+                    error = e
+                else:
+                    circuit_breaker.record_success()
+                    return response, body
+        if retries + 1 >= retry_policy.max_attempts:
+            circuit_breaker.record_failure()
+            raise error
+        delay = retry_policy.get_delay(retries)
+        LOGGER.w(TAG, f"send_request(): The request failed. Retrying in {delay:.1f} s. url: {url}; error: {error}")
+        retries += 1
+        time.sleep(delay)
+
+
+def get_json_conditionally(url: str, cache: HttpCache) -> dict:
+    """
+    Gets a JSON response, sending If-None-Match/If-Modified-Since when the URL is cached.
+    On a 304 Not Modified response the cached body is returned. Otherwise the response is decoded and stored in the cache.
+
+    Args:
+        url: the URL to get
+        cache: the cache holding the validators and bodies
+
+    Returns:
+        dict: the decoded JSON response
+    """
+    entry = cache.get(url)
+    response, body = send_request(url, HttpCache.get_conditional_headers(entry))
+    if response.status_code == requests.codes.not_modified and entry is not None:
+        cache.record_hit()
+        return entry.body
+    cache.record_miss()
+    cache.put(url, response.headers.get(HEADER_ETAG), response.headers.get(HEADER_LAST_MODIFIED), body)
+    return body
+
+
 def parse_periods(landing: dict) -> dict:
     """
     Parses the periods
@@ -275,19 +603,19 @@ def parse_periods(landing: dict) -> dict:
         DICT_KEY_HOME: [],
         DICT_KEY_AWAY: []
     }
-    shots_by_period = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_SHOTS_BY_PERIOD}", [])
-    linescore_by_period = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_LINESCORE}.{DICT_KEY_BY_PERIOD}", [])
+    shots_by_period = GET_SUMMARY_SHOTS_BY_PERIOD(landing, [])
+    linescore_by_period = GET_SUMMARY_LINESCORE_BY_PERIOD(landing, [])
     if not len(shots_by_period) == len(linescore_by_period):
         LOGGER.e(TAG, "parse_periods(): shots_by_period and linescore_by_period must have the same length")
         return out
     for i in range(0, len(shots_by_period)):
-        home_goals = pydash.get(linescore_by_period[i], f"{DICT_KEY_HOME}", 0)
-        home_shots = pydash.get(shots_by_period[i], f"{DICT_KEY_HOME}", 0)
-        away_goals = pydash.get(linescore_by_period[i], f"{DICT_KEY_AWAY}", 0)
-        away_shots = pydash.get(shots_by_period[i], f"{DICT_KEY_AWAY}", 0)
-        period_number = pydash.get(shots_by_period[i], f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_NUMBER}", 0)
-        period_type = pydash.get(linescore_by_period[i], f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_PERIOD_TYPE}", "REG")
-        ot_periods = pydash.get(linescore_by_period[i], f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_OT_PERIODS}", None)
+        home_goals = GET_HOME(linescore_by_period[i], 0)
+        home_shots = GET_HOME(shots_by_period[i], 0)
+        away_goals = GET_AWAY(linescore_by_period[i], 0)
+        away_shots = GET_AWAY(shots_by_period[i], 0)
+        period_number = GET_PERIOD_DESCRIPTOR_NUMBER(shots_by_period[i], 0)
+        period_type = GET_PERIOD_DESCRIPTOR_PERIOD_TYPE(linescore_by_period[i], "REG")
+        ot_periods = GET_PERIOD_DESCRIPTOR_OT_PERIODS(linescore_by_period[i], None)
         if period_type == DICT_VALUE_SO:
             LOGGER.d(TAG, "Skipping SO period, as that is handled separately.")
             break
@@ -299,9 +627,25 @@ def parse_periods(landing: dict) -> dict:
     return out
 
 
+def get_ordinal(number: int) -> str:
+    """
+    Get the English ordinal of a number, e.g. 1st, 12th or 22nd
+
+    Args:
+        number (int): the number
+
+    Returns:
+        str: the ordinal
+    """
+    if 11 <= number % 100 <= 13:
+        return f"{number}th"
+    return f"{number}{ORDINAL_SUFFIXES.get(number % 10, 'th')}"
+
+
 def get_period_ordinal(period_number: int, period_type: str, ot_periods: Optional[int] = None) -> str:
     if period_type == DICT_VALUE_REG:
-        return p.ordinal(period_number)
+        ordinal = PERIOD_ORDINALS.get(period_number)
+        return ordinal if ordinal is not None else get_ordinal(period_number)
     elif period_type == DICT_VALUE_OT and not ot_periods:
         return DICT_VALUE_OT
     elif period_type == DICT_VALUE_OT and ot_periods:
@@ -323,13 +667,13 @@ def parse_shootout(landing: dict) -> dict:
     Returns:
         dict: the parsed shootout
     """
-    shootout_info = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_LINESCORE}.{DICT_KEY_SHOOTOUT}", {})
+    shootout_info = GET_SUMMARY_LINESCORE_SHOOTOUT(landing, {})
     return {
-        DICT_KEY_HOME: Shootout(scores=pydash.get(shootout_info, f"{DICT_KEY_HOME_CONVERSIONS}", 0),
-                                attempts=pydash.get(shootout_info, f"{DICT_KEY_HOME_ATTEMPTS}", 0),
+        DICT_KEY_HOME: Shootout(scores=GET_HOME_CONVERSIONS(shootout_info, 0),
+                                attempts=GET_HOME_ATTEMPTS(shootout_info, 0),
                                 has_been_played=not shootout_info == {}),
-        DICT_KEY_AWAY: Shootout(scores=pydash.get(shootout_info, f"{DICT_KEY_AWAY_CONVERSIONS}", 0),
-                                attempts=pydash.get(shootout_info, f"{DICT_KEY_AWAY_ATTEMPTS}", 0),
+        DICT_KEY_AWAY: Shootout(scores=GET_AWAY_CONVERSIONS(shootout_info, 0),
+                                attempts=GET_AWAY_ATTEMPTS(shootout_info, 0),
                                 has_been_played=not shootout_info == {}),
     }
 
@@ -345,22 +689,22 @@ def parse_game_info(landing: dict) -> GameInfo:
         GameInfo: the parsed game info
     """
     current_period = ""
-    season_series = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_SEASON_SERIES}", [])
+    season_series = GET_SUMMARY_SEASON_SERIES(landing, [])
     for game in season_series:
-        if pydash.get(game, DICT_KEY_ID, 0) == pydash.get(landing, DICT_KEY_ID, -1):
-            period_number = pydash.get(game, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_NUMBER}", 0)
-            period_type = pydash.get(game, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_PERIOD_TYPE}", DICT_VALUE_REG)
-            ot_periods = pydash.get(game, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_OT_PERIODS}", None)
+        if GET_ID(game, 0) == GET_ID(landing, -1):
+            period_number = GET_PERIOD_DESCRIPTOR_NUMBER(game, 0)
+            period_type = GET_PERIOD_DESCRIPTOR_PERIOD_TYPE(game, DICT_VALUE_REG)
+            ot_periods = GET_PERIOD_DESCRIPTOR_OT_PERIODS(game, None)
             current_period = get_period_ordinal(period_number, period_type, ot_periods)
-    in_intermission = pydash.get(landing, f"{DICT_KEY_CLOCK}.{DICT_KEY_IN_INTERMISSION}", False)
-    is_final = pydash.get(landing, f"{DICT_KEY_GAME_STATE}", "")
+    in_intermission = GET_CLOCK_IN_INTERMISSION(landing, False)
+    is_final = GET_GAME_STATE(landing, "")
 
     if is_final == GameState.FINAL.value or is_final == GameState.OFF.value:
         game_clock = GameState.FINAL.value
     elif in_intermission:
         game_clock = INTERMISSION_TIME_CLOCK
     else:
-        game_clock = pydash.get(landing, f"{DICT_KEY_CLOCK}.{DICT_KEY_TIME_REMAINING}", TIME_CLOCK_DEFAULT)
+        game_clock = GET_CLOCK_TIME_REMAINING(landing, TIME_CLOCK_DEFAULT)
 
     return GameInfo(
         current_period=current_period if current_period else "",
@@ -378,24 +722,24 @@ def parse_goals(landing: dict) -> list[Goal]:
     Returns:
         list[Goal]: the parsed goals
     """
-    periods = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_SCORING}", [])
+    periods = GET_SUMMARY_SCORING(landing, [])
     goals = []
     for period in periods:
-        scoring_plays = pydash.get(period, f"{DICT_KEY_GOALS}", [])
-        period_number = pydash.get(period, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_NUMBER}", 0)
-        period_type = pydash.get(period, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_PERIOD_TYPE}", DICT_VALUE_REG)
-        ot_periods = pydash.get(period, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_OT_PERIODS}", None)
+        scoring_plays = GET_GOALS(period, [])
+        period_number = GET_PERIOD_DESCRIPTOR_NUMBER(period, 0)
+        period_type = GET_PERIOD_DESCRIPTOR_PERIOD_TYPE(period, DICT_VALUE_REG)
+        ot_periods = GET_PERIOD_DESCRIPTOR_OT_PERIODS(period, None)
         for play in scoring_plays:
-            team = pydash.get(play, f"{DICT_KEY_TEAM_ABBREV}", "ERR")
+            team = GET_TEAM_ABBREV(play, "ERR")
             if type(team) is dict:
-                team = pydash.get(team, DICT_KEY_DEFAULT, "ERR")
-            strength = pydash.get(play, f"{DICT_KEY_STRENGTH}", "")
+                team = GET_DEFAULT(team, "ERR")
+            strength = GET_STRENGTH(play, "")
             goals.append(Goal(period=get_period_ordinal(period_number, period_type, ot_periods),
-                              time=pydash.get(play, f"{DICT_KEY_TIME_IN_PERIOD}", ""),
+                              time=GET_TIME_IN_PERIOD(play, ""),
                               team=Teams[team].value,
                               strength=strength_map.get(strength, strength),
                               description=get_goal_description(play),
-                              video_url=get_video_url(pydash.get(play, f"{DICT_KEY_HIGHLIGHT_CLIP}", 0)),
+                              video_url=get_video_url(GET_HIGHLIGHT_CLIP(play, 0)),
                               ))
     return goals
 
@@ -418,24 +762,24 @@ def get_goal_description(goal_dictionary: dict) -> str:
     Returns:
         str: The description of the goal
     """
-    scorer_first_name = pydash.get(goal_dictionary, f"{DICT_KEY_FIRST_NAME}", "")
+    scorer_first_name = GET_FIRST_NAME(goal_dictionary, "")
     if type(scorer_first_name) is dict:
-        scorer_first_name = pydash.get(scorer_first_name, f"{DICT_KEY_DEFAULT}", "")
-    scorer_last_name = pydash.get(goal_dictionary, f"{DICT_KEY_LAST_NAME}", "")
+        scorer_first_name = GET_DEFAULT(scorer_first_name, "")
+    scorer_last_name = GET_LAST_NAME(goal_dictionary, "")
     if type(scorer_last_name) is dict:
-        scorer_last_name = pydash.get(scorer_last_name, f"{DICT_KEY_DEFAULT}", "")
-    goals_to_date = pydash.get(goal_dictionary, f"{DICT_KEY_GOALS_TO_DATE}", "")
-    shot_type = pydash.get(goal_dictionary, f"{DICT_KEY_SHOT_TYPE}", "")
+        scorer_last_name = GET_DEFAULT(scorer_last_name, "")
+    goals_to_date = GET_GOALS_TO_DATE(goal_dictionary, "")
+    shot_type = GET_SHOT_TYPE(goal_dictionary, "")
 
     assisted_by = []
-    for player in pydash.get(goal_dictionary, f"{DICT_KEY_ASSISTS}", []):
-        assistant_first_name = pydash.get(player, f"{DICT_KEY_FIRST_NAME}", "")
+    for player in GET_ASSISTS(goal_dictionary, []):
+        assistant_first_name = GET_FIRST_NAME(player, "")
         if type(assistant_first_name) is dict:
-            assistant_first_name = pydash.get(assistant_first_name, f"{DICT_KEY_DEFAULT}", "")
-        assistant_last_name = pydash.get(player, f"{DICT_KEY_LAST_NAME}", "")
+            assistant_first_name = GET_DEFAULT(assistant_first_name, "")
+        assistant_last_name = GET_LAST_NAME(player, "")
         if type(assistant_last_name) is dict:
-            assistant_last_name = pydash.get(assistant_last_name, f"{DICT_KEY_DEFAULT}", "")
-        assists_to_date = pydash.get(player, f"{DICT_KEY_ASSISTS_TO_DATE}", "")
+            assistant_last_name = GET_DEFAULT(assistant_last_name, "")
+        assists_to_date = GET_ASSISTS_TO_DATE(player, "")
         assisted_by.append(f"{assistant_first_name} {assistant_last_name} ({assists_to_date})")
     if len(assisted_by) == 0:
         assisted_by = ["None"]
@@ -459,20 +803,20 @@ def parse_penalties(landing: dict) -> list[Penalty]:
     Returns:
         list[Penalty]: the parsed penalties
     """
-    periods = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_PENALTIES}", [])
+    periods = GET_SUMMARY_PENALTIES(landing, [])
     penalties = []
     for period in periods:
-        period_number = pydash.get(period, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_NUMBER}", 0)
-        period_type = pydash.get(period, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_PERIOD_TYPE}", DICT_VALUE_REG)
-        ot_periods = pydash.get(period, f"{DICT_KEY_PERIOD_DESCRIPTOR}.{DICT_KEY_OT_PERIODS}", None)
-        penalty_plays = pydash.get(period, f"{DICT_KEY_PENALTIES}", [])
+        period_number = GET_PERIOD_DESCRIPTOR_NUMBER(period, 0)
+        period_type = GET_PERIOD_DESCRIPTOR_PERIOD_TYPE(period, DICT_VALUE_REG)
+        ot_periods = GET_PERIOD_DESCRIPTOR_OT_PERIODS(period, None)
+        penalty_plays = GET_PENALTIES(period, [])
         for penalty in penalty_plays:
-            penalty_type = pydash.get(penalty, f"{DICT_KEY_TYPE}", "")
+            penalty_type = GET_TYPE(penalty, "")
             penalties.append(Penalty(period=get_period_ordinal(period_number, period_type, ot_periods),
-                                     time=pydash.get(penalty, f"{DICT_KEY_TIME_IN_PERIOD}", ""),
-                                     team=Teams[pydash.get(penalty, f"{DICT_KEY_TEAM_ABBREV}", "ERR")].value,
+                                     time=GET_TIME_IN_PERIOD(penalty, ""),
+                                     team=Teams[GET_TEAM_ABBREV(penalty, "ERR")].value,
                                      type=penalty_type_map.get(penalty_type, penalty_type),  # If penalty type is not in the map, use the value itself as a default
-                                     min=pydash.get(penalty, f"{DICT_KEY_DURATION}", 0),
+                                     min=GET_DURATION(penalty, 0),
                                      description=get_penalty_description(penalty)
                                      ))
     return penalties
@@ -510,9 +854,9 @@ def get_penalty_description(penalty_dictionary: dict) -> str:
         str: The description of the penalty
     """
     # TODO: add "served by" for applicable penalties
-    committed_by = pydash.get(penalty_dictionary, f"{DICT_KEY_COMMITTED_BY_PLAYER}", "")
-    description_key = pydash.get(penalty_dictionary, f"{DICT_KEY_DESC_KEY}", "")
-    drawn_by = pydash.get(penalty_dictionary, f"{DICT_KEY_DRAWN_BY}", "")
+    committed_by = GET_COMMITTED_BY_PLAYER(penalty_dictionary, "")
+    description_key = GET_DESC_KEY(penalty_dictionary, "")
+    drawn_by = GET_DRAWN_BY(penalty_dictionary, "")
 
     out = f'{committed_by} {description_key}'
     if drawn_by:
@@ -548,37 +892,37 @@ def parse_team_stats(landing: dict) -> dict:
     home_giveaways = 0
     away_giveaways = 0
 
-    home_goals = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_LINESCORE}.{DICT_KEY_TOTALS}.{DICT_KEY_HOME}", 0)
-    away_goals = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_LINESCORE}.{DICT_KEY_TOTALS}.{DICT_KEY_AWAY}", 0)
+    home_goals = GET_SUMMARY_LINESCORE_TOTALS_HOME(landing, 0)
+    away_goals = GET_SUMMARY_LINESCORE_TOTALS_AWAY(landing, 0)
 
-    team_game_stats = pydash.get(landing, f"{DICT_KEY_SUMMARY}.{DICT_KEY_TEAM_GAME_STATS}", {})
+    team_game_stats = GET_SUMMARY_TEAM_GAME_STATS(landing, {})
     for stat in team_game_stats:
-        category = pydash.get(stat, DICT_KEY_CATEGORY, "")
+        category = GET_CATEGORY(stat, "")
         match category:
             case TeamStatCategories.SOG.value:
-                home_shots = int(pydash.get(stat, f"{DICT_KEY_HOME_VALUE}", 0))
-                away_shots = int(pydash.get(stat, f"{DICT_KEY_AWAY_VALUE}", 0))
+                home_shots = int(GET_HOME_VALUE(stat, 0))
+                away_shots = int(GET_AWAY_VALUE(stat, 0))
             case TeamStatCategories.FACEOFF_PCTG.value:
-                home_fo_wins = pydash.get(stat, f"{DICT_KEY_HOME_VALUE}", "0")
-                away_fo_wins = pydash.get(stat, f"{DICT_KEY_AWAY_VALUE}", "0")
+                home_fo_wins = GET_HOME_VALUE(stat, "0")
+                away_fo_wins = GET_AWAY_VALUE(stat, "0")
             case TeamStatCategories.POWER_PLAY.value:
-                home_pp = pydash.get(stat, f"{DICT_KEY_HOME_VALUE}", "0/0")
-                away_pp = pydash.get(stat, f"{DICT_KEY_AWAY_VALUE}", "0/0")
+                home_pp = GET_HOME_VALUE(stat, "0/0")
+                away_pp = GET_AWAY_VALUE(stat, "0/0")
             case TeamStatCategories.PIM.value:
                 # Currently not storing this data
                 pass
             case TeamStatCategories.HITS.value:
-                home_hits = int(pydash.get(stat, f"{DICT_KEY_HOME_VALUE}", 0))
-                away_hits = int(pydash.get(stat, f"{DICT_KEY_AWAY_VALUE}", 0))
+                home_hits = int(GET_HOME_VALUE(stat, 0))
+                away_hits = int(GET_AWAY_VALUE(stat, 0))
             case TeamStatCategories.BLOCKED_SHOTS.value:
-                home_blocked = int(pydash.get(stat, f"{DICT_KEY_HOME_VALUE}", 0))
-                away_blocked = int(pydash.get(stat, f"{DICT_KEY_AWAY_VALUE}", 0))
+                home_blocked = int(GET_HOME_VALUE(stat, 0))
+                away_blocked = int(GET_AWAY_VALUE(stat, 0))
             case TeamStatCategories.GIVEAWAYS.value:
-                home_giveaways = int(pydash.get(stat, f"{DICT_KEY_HOME_VALUE}", 0))
-                away_giveaways = int(pydash.get(stat, f"{DICT_KEY_AWAY_VALUE}", 0))
+                home_giveaways = int(GET_HOME_VALUE(stat, 0))
+                away_giveaways = int(GET_AWAY_VALUE(stat, 0))
             case TeamStatCategories.TAKEAWAYS.value:
-                home_takeaways = int(pydash.get(stat, f"{DICT_KEY_HOME_VALUE}", 0))
-                away_takeaways = int(pydash.get(stat, f"{DICT_KEY_AWAY_VALUE}", 0))
+                home_takeaways = int(GET_HOME_VALUE(stat, 0))
+                away_takeaways = int(GET_AWAY_VALUE(stat, 0))
             case _:
                 LOGGER.e(TAG, f"parse_team_stats: Unknown stat category: {category}")
 
@@ -591,8 +935,8 @@ def parse_team_stats(landing: dict) -> dict:
         giveaways=home_giveaways,
         takeaways=home_takeaways,
         pp_fraction=home_pp,
-        periods=pydash.get(periods, DICT_KEY_HOME, []),
-        shootout=pydash.get(shootouts, DICT_KEY_HOME, None)
+        periods=GET_HOME(periods, []),
+        shootout=GET_HOME(shootouts, None)
     )
 
     out[DICT_KEY_AWAY] = TeamStats(
@@ -604,8 +948,8 @@ def parse_team_stats(landing: dict) -> dict:
         giveaways=away_giveaways,
         takeaways=away_takeaways,
         pp_fraction=away_pp,
-        periods=pydash.get(periods, DICT_KEY_AWAY, []),
-        shootout=pydash.get(shootouts, DICT_KEY_AWAY, None)
+        periods=GET_AWAY(periods, []),
+        shootout=GET_AWAY(shootouts, None)
     )
     return out
 
@@ -620,10 +964,10 @@ def parse_scheduled_game(game: dict) -> Optional[Game]:
     Returns:
         Optional[Game]: the parsed game or None if it cannot be parsed
     """
-    game_id = pydash.get(game, f"{DICT_KEY_ID}", None)
-    away_team_id = pydash.get(game, f"{DICT_KEY_AWAY_TEAM}.{DICT_KEY_ID}", None)
-    home_team_id = pydash.get(game, f"{DICT_KEY_HOME_TEAM}.{DICT_KEY_ID}", None)
-    start_time = pydash.get(game, f"{DICT_KEY_START_TIME_UTC}", None)
+    game_id = GET_ID(game, None)
+    away_team_id = GET_AWAY_TEAM_ID(game, None)
+    home_team_id = GET_HOME_TEAM_ID(game, None)
+    start_time = GET_START_TIME_UTC(game, None)
 
     if not game_id or not away_team_id or not home_team_id or not start_time:
         return None
@@ -658,13 +1002,13 @@ def parse_game(landing: dict) -> Optional[Game]:
     """
     team_stats = parse_team_stats(landing)
 
-    game_id = pydash.get(landing, f"{DICT_KEY_ID}", None)
-    away_team_abbr = pydash.get(landing, f"{DICT_KEY_AWAY_TEAM}.{DICT_KEY_ABBREV}", None)
-    home_team_abbr = pydash.get(landing, f"{DICT_KEY_HOME_TEAM}.{DICT_KEY_ABBREV}", None)
-    start_time = pydash.get(landing, f"{DICT_KEY_START_TIME_UTC}", None)
+    game_id = GET_ID(landing, None)
+    away_team_abbr = GET_AWAY_TEAM_ABBREV(landing, None)
+    home_team_abbr = GET_HOME_TEAM_ABBREV(landing, None)
+    start_time = GET_START_TIME_UTC(landing, None)
     end_time = None
-    home_team_stats = pydash.get(team_stats, f"{DICT_KEY_HOME}", None)
-    away_team_stats = pydash.get(team_stats, f"{DICT_KEY_AWAY}", None)
+    home_team_stats = GET_HOME(team_stats, None)
+    away_team_stats = GET_AWAY(team_stats, None)
 
     if game_id is None or away_team_abbr is None or home_team_abbr is None or start_time is None or home_team_stats is None or away_team_stats is None:
         return None
@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from src.datatypes.game import Game
+from src.utils import datetime_util
+from src.utils.environment_util import environment_util
+from src.utils.log_util import LOGGER
+from src.utils.nhl_api_client import GameState, INTERMISSION_TIME_CLOCK, TIME_CLOCK_DEFAULT
+
+TAG = "PollScheduler"
+
+# How long to wait before polling a game again, depending on what the game is doing
+LIVE_POLL_SECONDS = 15
+INTERMISSION_POLL_SECONDS = 60
+PRE_GAME_POLL_SECONDS = 60
+FINAL_POLL_SECONDS = 120
+# Used when the landing could not be fetched or parsed
+ERROR_POLL_SECONDS = 30
+# Used when there are no games for the selected teams
+IDLE_POLL_SECONDS = 600
+# Never sleep longer than this, so that schedule changes and new days are picked up
+MAX_SLEEP_SECONDS = 600
+MIN_SLEEP_SECONDS = 1
+
+
+@dataclass
+class GamePollState:
+    next_poll_time: Optional[datetime]
+    game_state: Optional[GameState] = None
+    in_intermission: bool = False
+    # The first time the game was seen as final. The NHL API doesn't give an end time, so this is used instead.
+    final_since: Optional[datetime] = None
+
+
+def get_game_state(game: Game) -> GameState:
+    """
+    Get the state of a game from its game info.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        GameState: FINAL if the game is over, LIVE if it has started, otherwise PRE.
+    """
+    game_clock = game.game_info.game_clock if game.game_info else TIME_CLOCK_DEFAULT
+    if game_clock == GameState.FINAL.value:
+        return GameState.FINAL
+    if game_clock == TIME_CLOCK_DEFAULT:
+        return GameState.PRE
+    return GameState.LIVE
+
+
+class PollScheduler:
+    """
+    Keeps a next poll time for every game, based on the state of the game, so that the main loop only fetches and posts
+    games that are due, and sleeps until the earliest game is due.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime_util.get_current_time_as_utc):
+        """
+        Initialize the scheduler.
+
+        Args:
+            clock (Callable[[], datetime], optional): Returns the current time. Defaults to datetime_util.get_current_time_as_utc.
+        """
+        self.clock = clock
+        self.poll_states: dict[int, GamePollState] = {}
+        self.latest_games: dict[int, Game] = {}
+
+    def get_due_games(self, schedule: list[Game]) -> list[Game]:
+        """
+        Get the games that should be polled now. Games that haven't been polled yet are always due.
+        Games that are no longer in the schedule are forgotten.
+
+        Args:
+            schedule (list[Game]): The scheduled games that are within the window to make a post.
+
+        Returns:
+            list[Game]: The games that are due, in schedule order.
+        """
+        now = self.clock()
+        scheduled_ids = {game.id for game in schedule}
+        for game_id in list(self.poll_states.keys()):
+            if game_id not in scheduled_ids:
+                del self.poll_states[game_id]
+                self.latest_games.pop(game_id, None)
+        due = []
+        for game in schedule:
+            poll_state = self.poll_states.get(game.id)
+            if poll_state is None or (poll_state.next_poll_time is not None and poll_state.next_poll_time <= now):
+                due.append(game)
+        return due
+
+    def update(self, polled: list[Game], games: list[Optional[Game]]):
+        """
+        Set the next poll time for the games that were just polled.
+
+        Args:
+            polled (list[Game]): The scheduled games that were polled.
+            games (list[Optional[Game]]): The fetched games, in the same order as polled. None if a game couldn't be fetched.
+
+        Returns:
+            None
+        """
+        now = self.clock()
+        for scheduled_game, game in zip(polled, games):
+            poll_state = self.poll_states.setdefault(scheduled_game.id, GamePollState(next_poll_time=now))
+            if game is None:
+                poll_state.next_poll_time = now + timedelta(seconds=ERROR_POLL_SECONDS)
+                continue
+            self.latest_games[game.id] = game
+            poll_state.game_state = get_game_state(game)
+            poll_state.in_intermission = game.game_info is not None and game.game_info.game_clock == INTERMISSION_TIME_CLOCK
+            poll_state.next_poll_time = self.get_next_poll_time(poll_state, now)
+            LOGGER.d(TAG, f"update(): game {game.id} is {poll_state.game_state.value}{' (intermission)' if poll_state.in_intermission else ''}; next poll: {poll_state.next_poll_time}")
+
+    @staticmethod
+    def get_next_poll_time(poll_state: GamePollState, now: datetime) -> Optional[datetime]:
+        """
+        Get the next time a game should be polled, based on its state.
+
+        Args:
+            poll_state (GamePollState): The poll state of the game. final_since is set when the game is first seen as final.
+            now (datetime): The current time.
+
+        Returns:
+            Optional[datetime]: The next poll time, or None if the game ended long enough ago that it doesn't need updating anymore.
+        """
+        if poll_state.game_state == GameState.FINAL:
+            if poll_state.final_since is None:
+                poll_state.final_since = now
+            stop_time = poll_state.final_since + timedelta(minutes=environment_util.minutes_after_game_end_to_update_post)
+            if now >= stop_time:
+                return None
+            return min(now + timedelta(seconds=FINAL_POLL_SECONDS), stop_time)
+        poll_state.final_since = None
+        if poll_state.game_state == GameState.LIVE:
+            return now + timedelta(seconds=INTERMISSION_POLL_SECONDS if poll_state.in_intermission else LIVE_POLL_SECONDS)
+        return now + timedelta(seconds=PRE_GAME_POLL_SECONDS)
+
+    def get_latest_games(self) -> list[Game]:
+        """
+        Get the most recently fetched version of every game that is being tracked.
+
+        Returns:
+            list[Game]: The games.
+        """
+        return list(self.latest_games.values())
+
+    def get_seconds_until_next_poll(self, schedule: list[Game]) -> float:
+        """
+        Get how long to sleep until the earliest game is due. Games that are not in the window to make a post yet are due
+        when they enter it.
+
+        Args:
+            schedule (list[Game]): All scheduled games for the selected teams.
+
+        Returns:
+            float: The number of seconds to sleep, between MIN_SLEEP_SECONDS and MAX_SLEEP_SECONDS.
+        """
+        now = self.clock()
+        next_poll_time = now + timedelta(seconds=MAX_SLEEP_SECONDS)
+        for game in schedule:
+            poll_state = self.poll_states.get(game.id)
+            if poll_state is None:
+                candidate = game.start_time - timedelta(minutes=environment_util.minutes_before_game_start_to_create_post)
+                if candidate <= now:
+                    # The window has already opened, but the game wasn't polled, so there is nothing to wait for
+                    continue
+            else:
+                candidate = poll_state.next_poll_time
+            if candidate is not None and candidate < next_poll_time:
+                next_poll_time = candidate
+        return max((next_poll_time - now).total_seconds(), MIN_SLEEP_SECONDS)
+
+
+poll_scheduler = PollScheduler()
@@ -8,6 +8,7 @@ from src.db.comments.comments_dao import comments_dao
 from src.db.game_day_threads.game_day_threads_dao import game_day_threads_dao
 from src.utils import datetime_util
 from src.utils.environment_util import environment_util
+from src.utils.render_cache import RenderCache
 
 FINAL = 'Final'
 TIME_CLOCK = 'Time Clock'
@@ -43,6 +44,14 @@ PENALTY_DETAILS_HEADER_ROW = [PERIOD, TIME, TEAM, TYPE, MIN, DESCRIPTION]
 START_TIME_HEADER_ROW = [PT, MT, CT, ET, AT]
 DAY_OVERVIEW_HEADER_ROW = [MATCH_UP, TIME, LINK]
 
+SECTION_TIME_CLOCK = "time_clock"
+SECTION_PERIODS = "periods"
+SECTION_TEAM_STATS = "team_stats"
+SECTION_GOAL_DETAILS = "goal_details"
+SECTION_PENALTY_DETAILS = "penalty_details"
+SECTION_START_TIMES = "start_times"
+SECTION_GAME_DETAILS = "game_details"
+
 FOOTER_TEXT = "I am open source! Report issues, contribute, and fund me [on my GitHub page](https://github.com/dandroid126/lemmy-nhl-gdt-bot)!"
 
 
@@ -79,7 +88,8 @@ def get_gdt_body(game: Game) -> str:
 
 def get_game_details(game: Game) -> str:
     """
-    Get the game details
+    Get the game details. Each section is rendered from its slice of the game, and reused from the render cache when
+    that slice hasn't changed since the last render. The GDT body and the comment of a game share the result.
 
     Args:
         game (Game): The game
@@ -89,37 +99,40 @@ def get_game_details(game: Game) -> str:
     """
     if game is None:
         return ""
-    time_clock = get_time_clock(game.game_info)
-    periods = get_periods(game)
-    team_stats = get_team_stats(game)
-    goal_details = get_goal_details(game)
-    penalty_details = get_penalty_details(game)
-    start_time_table = get_start_time_table(game)
+    time_clock = render_cache.get_or_render(SECTION_TIME_CLOCK, game.game_info, lambda: get_time_clock(game.game_info).render())
+    periods = render_cache.get_or_render(SECTION_PERIODS, (game.away_team, game.home_team, game.away_team_stats.periods, game.home_team_stats.periods,
+                                                           game.away_team_stats.shootout, game.home_team_stats.shootout, game.away_team_stats.goals,
+                                                           game.home_team_stats.goals), lambda: get_periods(game).render())
+    team_stats = render_cache.get_or_render(SECTION_TEAM_STATS, (game.away_team, game.home_team, game.away_team_stats, game.home_team_stats),
+                                            lambda: get_team_stats(game).render())
+    goal_details = render_cache.get_or_render(SECTION_GOAL_DETAILS, game.goals, lambda: get_goal_details(game).render())
+    penalty_details = render_cache.get_or_render(SECTION_PENALTY_DETAILS, game.penalties, lambda: get_penalty_details(game).render())
+    start_time_table = render_cache.get_or_render(SECTION_START_TIMES, game.start_time, lambda: get_start_time_table(game).render())
 
     # Render everything
-    return f"""{time_clock.render()}
+    return render_cache.get_or_render(SECTION_GAME_DETAILS, (time_clock, periods, team_stats, goal_details, penalty_details, start_time_table), lambda: f"""{time_clock}
 
 {LINE_BREAK}
 
-{periods.render()}
+{periods}
 
 {LINE_BREAK}
 
-{team_stats.render()}
+{team_stats}
 
-{LINE_BREAK if goal_details.render() else ""}
+{LINE_BREAK if goal_details else ""}
 
-{goal_details.render()}
+{goal_details}
 
-{LINE_BREAK if penalty_details.render() else ""}
+{LINE_BREAK if penalty_details else ""}
 
-{penalty_details.render()}
+{penalty_details}
 
 {LINE_BREAK}
 
 #### Start Times
 
-{start_time_table.render()}"""
+{start_time_table}""")
 
 
 def get_formatted_time_clock_time(game_info: GameInfo) -> str:
@@ -152,7 +165,7 @@ def get_formatted_game_start_time(start_time: datetime) -> str:
     Returns:
         str: The formatted game start time
     """
-    return start_time.astimezone(datetime_util.ET).strftime(datetime_util.START_TIME_FORMAT)
+    return datetime_util.get_start_times(start_time).formatted
 
 
 def get_time_clock(game_info: GameInfo) -> Table:
@@ -165,7 +178,7 @@ def get_time_clock(game_info: GameInfo) -> Table:
     Returns:
         Table: The time clock table
     """
-    time_clock = Table()
+    time_clock = Table(columns=1, rows=2)
     time_clock.set(0, 0, TIME_CLOCK)
     time_clock.set(0, 1, get_formatted_time_clock_time(game_info))
     return time_clock
@@ -181,7 +194,7 @@ def get_periods(game: Game) -> Table:
     Returns:
         Table: The periods table
     """
-    periods = Table()
+    periods = Table(columns=len(game.away_team_stats.periods) + 3, rows=3)
     periods.set(0, 0, TEAM)
     periods.set(0, 1, game.away_team.get_team_table_entry())
     periods.set(0, 2, game.home_team.get_team_table_entry())
@@ -213,7 +226,7 @@ def get_team_stats(game: Game) -> Table:
         Table: The team stats table containing stats for both the away and home teams.
     """
     # Create a new Table to store the team stats
-    team_stats = Table()
+    team_stats = Table(columns=len(TEAM_STATS_HEADER_ROW), rows=3)
 
     # Set the header row of the team stats table
     for i, value in enumerate(TEAM_STATS_HEADER_ROW):
@@ -246,12 +259,12 @@ def get_goal_details(game: Game) -> Table:
     Returns:
         Table: The goal details table containing information about each goal in the game
     """
-    # Create a new table to store the goal details
-    goal_details = Table()
-
     # If there are no goals in the game, return an empty goal details table
     if not game.goals:
-        return goal_details
+        return Table()
+
+    # Create a new table to store the goal details
+    goal_details = Table(columns=len(GOALS_DETAILS_HEADER_ROW), rows=len(game.goals) + 1)
 
     # Set the headers for the goal details table
     for i, value in enumerate(GOALS_DETAILS_HEADER_ROW):
@@ -278,9 +291,9 @@ def get_penalty_details(game: Game) -> Table:
     Returns:
         Table: The penalty details table
     """
-    penalty_details = Table()
     if not game.penalties:
-        return penalty_details
+        return Table()
+    penalty_details = Table(columns=len(PENALTY_DETAILS_HEADER_ROW), rows=len(game.penalties) + 1)
     for i, value in enumerate(PENALTY_DETAILS_HEADER_ROW):
         penalty_details.set(i, 0, value)
     for i, penalty in enumerate(reversed(game.penalties)):
@@ -303,14 +316,15 @@ def get_start_time_table(game: Game) -> Table:
     Returns:
         Table: The start time table
     """
-    start_time = Table()
+    start_time = Table(columns=len(START_TIME_HEADER_ROW), rows=2)
     for i, value in enumerate(START_TIME_HEADER_ROW):
         start_time.set(i, 0, value)
-    start_time.set(0,1, game.start_time.astimezone(datetime_util.PT).strftime(datetime_util.START_TIME_FORMAT_NO_TZ))
-    start_time.set(1,1, game.start_time.astimezone(datetime_util.MT).strftime(datetime_util.START_TIME_FORMAT_NO_TZ))
-    start_time.set(2,1, game.start_time.astimezone(datetime_util.CT).strftime(datetime_util.START_TIME_FORMAT_NO_TZ))
-    start_time.set(3,1, game.start_time.astimezone(datetime_util.ET).strftime(datetime_util.START_TIME_FORMAT_NO_TZ))
-    start_time.set(4,1, game.start_time.astimezone(datetime_util.AT).strftime(datetime_util.START_TIME_FORMAT_NO_TZ))
+    start_times = datetime_util.get_start_times(game.start_time)
+    start_time.set(0,1, start_times.pt)
+    start_time.set(1,1, start_times.mt)
+    start_time.set(2,1, start_times.ct)
+    start_time.set(3,1, start_times.et)
+    start_time.set(4,1, start_times.at)
     return start_time
 
 
@@ -354,17 +368,19 @@ def get_day_score_overview_table(games: list[Game]) -> Table:
     Returns:
         Table: The score overview table
     """
-    score_overview = Table()
+    score_overview = Table(columns=len(DAY_OVERVIEW_HEADER_ROW), rows=len(games) + 1)
     for i, value in enumerate(DAY_OVERVIEW_HEADER_ROW):
         score_overview.set(i, 0, value)
-    for i, game in enumerate(games):
-        game_type = game.get_game_type()
+    game_types = [game.get_game_type() for game in games]
+    comments = comments_dao.get_comments([game.id for game, game_type in zip(games, game_types) if game_type in environment_util.comment_post_types])
+    game_day_threads = game_day_threads_dao.get_game_day_threads([game.id for game, game_type in zip(games, game_types) if game_type in environment_util.gdt_post_types])
+    for i, (game, game_type) in enumerate(zip(games, game_types)):
         link = ""
         if game_type in environment_util.comment_post_types:
-            comment = comments_dao.get_comment(game.id)
+            comment = comments.get(game.id)
             link = f"[LINK]({comment.get_comment_url()})" if comment else ""
         elif game_type in environment_util.gdt_post_types:
-            game_day_thread = game_day_threads_dao.get_game_day_thread(game.id)
+            game_day_thread = game_day_threads.get(game.id)
             link = game_day_thread.get_game_day_thread_url() if game_day_thread else ""
         score_overview.set(0, i + 1, f"{game.away_team.get_team_table_entry()}{f' {game.away_team_stats.goals}' if game.game_info.is_game_started() else ''} - {game.home_team.get_team_table_entry()}{f' {game.home_team_stats.goals}' if game.game_info.is_game_started() else ''}")
         score_overview.set(1, i + 1, f'{get_formatted_time_clock_time(game.game_info) if game.game_info.is_game_started() else get_formatted_game_start_time(game.start_time)}')
@@ -372,22 +388,34 @@ def get_day_score_overview_table(games: list[Game]) -> Table:
     return score_overview
 
 
+# The rendered sections of the game details, by the slice of the game they were rendered from
+render_cache = RenderCache()
+
+
 class Table:
     """
-    Table class for rendering SelfGrowingTable in Markdown format.
+    Table class for rendering a 2D grid of cells in Markdown format.
 
-    Use set(x, y, value) to assign a value to a cell in the SelfGrowingTable.
+    Use set(x, y, value) to assign a value to a cell, where x is the column and y is the row. Row 0 is the header row.
     Tables can be rendered in Markdown format with render().
+
+    Cells are stored row-major in a grid of empty strings. If the shape of the table is known up front, pass it to the
+    constructor so that the grid never has to grow. Otherwise, the grid grows as cells are set outside of it.
     """
-    def __init__(self):
+    def __init__(self, columns: int = 1, rows: int = 1):
         """
         Initialize the table
+
+        Args:
+            columns: The number of columns to preallocate. Defaults to 1.
+            rows: The number of rows to preallocate, including the header row. Defaults to 1.
         """
-        self.data = SelfGrowingTable(lambda: SelfGrowingTable(str))
+        self.columns = max(columns, 1)
+        self.rows = [[''] * self.columns for _ in range(max(rows, 1))]
         self.max_x = 0
         self.max_y = 0
 
-    def set(self, x: int, y: int, value: str):
+    def set(self, x: int, y: int, value):
         """
         Set a value in the table
 
@@ -399,11 +427,43 @@ class Table:
         Returns:
             None
         """
+        if x >= self.columns:
+            self._grow_columns(x + 1)
+        if y >= len(self.rows):
+            self._grow_rows(y + 1)
         if x > self.max_x:
             self.max_x = x
         if y > self.max_y:
             self.max_y = y
-        self.data[x][y] = value
+        self.rows[y][x] = value
+
+    def get(self, x: int, y: int):
+        """
+        Get a value from the table
+
+        Args:
+            x: The x coordinate
+            y: The y coordinate
+
+        Returns:
+            The value of the cell, or an empty string if it hasn't been set
+        """
+        if x >= self.columns or y >= len(self.rows):
+            return ''
+        return self.rows[y][x]
+
+    def _grow_columns(self, columns: int):
+        # At least double the capacity, so that setting one column at a time stays linear overall
+        columns = max(columns, self.columns * 2)
+        padding = [''] * (columns - self.columns)
+        for row in self.rows:
+            row.extend(padding)
+        self.columns = columns
+
+    def _grow_rows(self, rows: int):
+        # At least double the capacity, so that setting one row at a time stays linear overall
+        rows = max(rows, len(self.rows) * 2)
+        self.rows.extend([''] * self.columns for _ in range(rows - len(self.rows)))
 
     def render(self) -> str:
         """
@@ -412,42 +472,13 @@ class Table:
         Returns:
             str: The table in Markdown format
         """
-        out = ''
         if self.max_x == 0 and self.max_y == 0:
-            return out
-        for i in range(0, self.max_x + 1):
-            out = out + f'| {self.data[i][0]} '
-        out += '|\n'
-        for i in range(0, self.max_x + 1):
-            out += '|:-:'
-        out += '|\n'
-        for j in range(1, self.max_y + 1):
-            for i in range(0, self.max_x + 1):
-                out = out + f'| {self.data[i][j]} '
-            out += '|\n'
-        return out[:-1]
-
-
-# I'm not gonna lie, I have no freakin' clue how this works. It's some black magic.
-# I shamelessly stole this from here:
-# https://stackoverflow.com/questions/44629273/how-to-dynamically-resize-2d-list-in-python
-class SelfGrowingTable(list):
-    """
-    SelfGrowingTable class for storing data in a 2D list in such way that the list grows automatically.
-    """
-
-    def __init__(self, default_factory, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.default_factory = default_factory
-
-    def _extend(self, index):
-        while len(self) <= index:
-            self.append(self.default_factory())
-
-    def __getitem__(self, index):
-        self._extend(index)
-        return super().__getitem__(index)
-
-    def __setitem__(self, index, value):
-        self._extend(index)
-        super().__setitem__(index, value)
+            return ''
+        width = self.max_x + 1
+        lines = [self._render_row(self.rows[0], width), '|:-:' * width + '|']
+        lines.extend(self._render_row(self.rows[y], width) for y in range(1, self.max_y + 1))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _render_row(row: list, width: int) -> str:
+        return ''.join([f'| {row[x]} ' for x in range(width)]) + '|'
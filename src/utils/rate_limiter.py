@@ -0,0 +1,161 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+BUCKET_POST = "post"
+BUCKET_COMMENT = "comment"
+BUCKET_FEATURE = "feature"
+
+# (capacity, tokens per second) of each bucket. Well below Lemmy's default limit of 180 API calls a minute, and low
+#  enough that a burst of creates at the start of a night doesn't trip the stricter limits on new posts and comments.
+DEFAULT_BUCKETS = {
+    BUCKET_POST: (10, 0.5),
+    BUCKET_COMMENT: (10, 0.5),
+    BUCKET_FEATURE: (4, 0.1),
+}
+
+# At most this many retries, refilled at RETRY_BUDGET_PER_SECOND, are spent across all calls. When Lemmy is down,
+#  calls fail fast instead of every call retrying in turn.
+RETRY_BUDGET = 10
+RETRY_BUDGET_PER_SECOND = 0.1
+
+
+class TokenBucket:
+    """
+    A token bucket: up to `capacity` calls can be made at once, then `rate` calls per second.
+    """
+
+    def __init__(self, capacity: float, rate: float, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the bucket, full.
+
+        Args:
+            capacity (float): The maximum number of tokens.
+            rate (float): The number of tokens added per second.
+            clock (Callable[[], float], optional): Returns the current time in seconds. Defaults to time.monotonic.
+            sleep (Callable[[float], None], optional): Sleeps for a number of seconds. Defaults to time.sleep.
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token if one is available.
+
+        Returns:
+            bool: True if a token was taken.
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting for one if none is available.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: the n-th retry waits a random time between 0 and base_delay * 2^n seconds,
+    capped at max_delay.
+    """
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    rng: random.Random = field(default_factory=random.Random)
+
+    def get_delay(self, retry: int) -> float:
+        """
+        Get how long to wait before a retry.
+
+        Args:
+            retry (int): The number of retries made so far.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+
+@dataclass
+class RequestStats:
+    throttled: int = 0
+    throttled_seconds: float = 0.0
+    retried: int = 0
+    gave_up: int = 0
+    retry_budget_exhausted: int = 0
+
+
+class RateLimiter:
+    """
+    The token buckets of the Lemmy calls, by kind of call, and the retry budget they share.
+    """
+
+    def __init__(self, buckets: Optional[dict[str, tuple[float, float]]] = None, retry_budget: float = RETRY_BUDGET,
+                 retry_budget_per_second: float = RETRY_BUDGET_PER_SECOND, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            buckets (Optional[dict[str, tuple[float, float]]], optional): The capacity and rate of each bucket. Defaults to None. If None, DEFAULT_BUCKETS will be used.
+            retry_budget (float, optional): The maximum number of retries that can be spent at once. Defaults to RETRY_BUDGET.
+            retry_budget_per_second (float, optional): How fast retries are added back to the budget. Defaults to RETRY_BUDGET_PER_SECOND.
+            clock (Callable[[], float], optional): Returns the current time in seconds. Defaults to time.monotonic.
+            sleep (Callable[[float], None], optional): Sleeps for a number of seconds. Defaults to time.sleep.
+        """
+        buckets = buckets if buckets is not None else DEFAULT_BUCKETS
+        self.buckets = {name: TokenBucket(capacity, rate, clock, sleep) for name, (capacity, rate) in buckets.items()}
+        self.retry_budget = TokenBucket(retry_budget, retry_budget_per_second, clock, sleep)
+        self.sleep = sleep
+
+    def acquire(self, bucket: str) -> float:
+        """
+        Wait until a call of a kind can be made.
+
+        Args:
+            bucket (str): BUCKET_POST, BUCKET_COMMENT or BUCKET_FEATURE.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        return self.buckets[bucket].acquire()
+
+    def try_spend_retry(self) -> bool:
+        """
+        Take a retry from the retry budget.
+
+        Returns:
+            bool: False if the budget is spent and the call shouldn't be retried.
+        """
+        return self.retry_budget.try_acquire()
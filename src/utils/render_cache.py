@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+TAG = "RenderCache"
+
+# Enough for every section of every game on a busy night
+DEFAULT_MAX_ENTRIES = 512
+
+
+class RenderCache:
+    """
+    Caches rendered sections of a post by the input they were rendered from, so that a section whose input hasn't
+    changed since the last render isn't built and rendered again.
+
+    The key of a section is its name and its input. The datatypes are frozen and compare by value, so two inputs have
+    the same key exactly when they would render the same.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of sections to keep. The least recently used section is evicted first.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, Hashable], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, section: str, section_input: Hashable, render: Callable[[], str]) -> str:
+        """
+        Get a rendered section, rendering it if its input isn't cached.
+
+        Args:
+            section (str): The name of the section.
+            section_input (Hashable): Everything the section is rendered from.
+            render (Callable[[], str]): Renders the section.
+
+        Returns:
+            str: The rendered section.
+        """
+        key = (section, section_input)
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return rendered
+            self.misses += 1
+        rendered = render()
+        with self._lock:
+            self._entries[key] = rendered
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+    def invalidate(self):
+        """
+        Remove every section from the cache.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get the hit and miss counters.
+
+        Returns:
+            dict: The number of hits, misses and cached sections.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from src.datatypes.game import Game
+from src.utils.log_util import LOGGER
+
+TAG = "ScheduleCache"
+
+
+class ScheduleCache:
+    """
+    Caches the scheduled games by day, so that the schedule doesn't have to be fetched from the NHL API every cycle.
+    Entries expire after a TTL and can be invalidated explicitly.
+    """
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds (float): How long a day stays in the cache after it was fetched.
+            clock (Callable[[], float], optional): Returns the current time in seconds. Defaults to time.monotonic.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._days: dict[str, tuple[float, list[Game]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, day: str, allow_expired: bool = False) -> Optional[list[Game]]:
+        """
+        Get the scheduled games for a day. Expired days are kept until they are fetched again, so that they can still be
+        used when the NHL API is down.
+
+        Args:
+            day (str): The day, e.g. '2023-11-10'.
+            allow_expired (bool, optional): Whether to return the day even if it has expired. Defaults to False.
+
+        Returns:
+            Optional[list[Game]]: A copy of the cached games, or None if the day is not cached or has expired.
+        """
+        with self._lock:
+            cached = self._days.get(day)
+            if cached is None:
+                return None
+            fetched_at, games = cached
+            if not allow_expired and self.clock() - fetched_at >= self.ttl_seconds:
+                LOGGER.d(TAG, f"get(): schedule for {day} expired")
+                return None
+            return list(games)
+
+    def put(self, day: str, games: list[Game]):
+        """
+        Store the scheduled games for a day.
+
+        Args:
+            day (str): The day, e.g. '2023-11-10'.
+            games (list[Game]): The scheduled games for that day.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._days[day] = (self.clock(), list(games))
+
+    def invalidate(self, day: Optional[str] = None):
+        """
+        Remove a day from the cache, or every day if no day is given.
+
+        Args:
+            day (Optional[str]): The day to remove. Defaults to None.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if day is None:
+                self._days.clear()
+            else:
+                self._days.pop(day, None)
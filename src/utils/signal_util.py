@@ -1,5 +1,6 @@
 import signal
 import threading
+from typing import Callable
 
 TAG = "signal_util"
 
@@ -15,6 +16,7 @@ class SignalUtil:
         """
         Initialize the SignalUtil
         """
+        self.interrupt_listeners: list[Callable[[], None]] = []
 
         # Register the interrupt function for SIGINT and SIGTERM
         signal.signal(signal.SIGINT, self.interrupt)
@@ -31,12 +33,27 @@ class SignalUtil:
             None
         """
         self.is_interrupted = True
-        from src.utils import logger
-        logger.i(TAG, f"interrupt(): interrupted. args: {args}")
+        from src.utils.log_util import LOGGER
+        LOGGER.i(TAG, f"interrupt(): interrupted. args: {args}")
+        for listener in self.interrupt_listeners:
+            listener()
         self.condition.acquire()
         self.condition.notify()
         self.condition.release()
 
+    def add_interrupt_listener(self, listener: Callable[[], None]):
+        """
+        Add a function to call when the program is interrupted. It is called from the signal handler, so it should
+        only tell something to stop rather than wait for it.
+
+        Args:
+            listener: The function to call.
+
+        Returns:
+            None
+        """
+        self.interrupt_listeners.append(listener)
+
     def wait(self, timeout: float):
         """
         Wait function that allows for the program to gracefully exit if interrupted. Use this function in the main loop instead of time.sleep().
@@ -1,6 +1,11 @@
+import dataclasses
+import json
 import unittest
+from datetime import datetime, timezone
 
+import tests.test_constants as test_constants
 from src.datatypes.game import Game, GameType
+from src.utils import nhl_api_client
 
 
 class TestGame(unittest.TestCase):
@@ -28,6 +33,27 @@ class TestGame(unittest.TestCase):
         game = Game(9999949999, None, None, None, None, None, None, None, None, None)
         self.assertEqual(game.get_game_type(), GameType.ALLSTAR)
 
+    def test_parsed_game_is_hashable_and_frozen(self):
+        with open(f"{test_constants.TEST_RES_PATH}/2022020158_landing.json", "r") as file:
+            landing = json.load(file)
+        game = nhl_api_client.parse_game(landing)
+        same_game = nhl_api_client.parse_game(landing)
+        self.assertIsInstance(game.goals, tuple)
+        self.assertIsInstance(game.penalties, tuple)
+        self.assertIsInstance(game.home_team_stats.periods, tuple)
+        self.assertEqual(game, same_game)
+        self.assertEqual(hash(game), hash(same_game))
+        self.assertEqual(1, len({game, same_game}))
+        self.assertFalse(hasattr(game, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            game.goals = ()
+
+    def test_replace_converts_lists(self):
+        game = Game(2023020193, None, None, datetime(2023, 11, 11, 0, 30, tzinfo=timezone.utc), None, None, None, [], None, None)
+        replaced = dataclasses.replace(game, penalties=[])
+        self.assertEqual((), replaced.penalties)
+        self.assertEqual(game.start_time, replaced.start_time)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from src.datatypes.teams import Teams
+from src.datatypes.teams import Team, Teams
 
 
 class TestTeams(unittest.TestCase):
@@ -10,5 +10,12 @@ class TestTeams(unittest.TestCase):
     def test_get_default_team(self):
         self.assertEqual(Teams['BAD ABBREVIATION'], Teams.ERR)
 
+    def test_teams_are_hashable(self):
+        team = Team(28, 'SJS', 'San Jose', 'Sharks', '')
+        self.assertEqual(team, Teams.SJS.value)
+        self.assertEqual(hash(team), hash(Teams.SJS.value))
+        self.assertIn(team, {Teams.SJS.value, Teams.ANA.value})
+        self.assertNotEqual(team, 28)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,77 @@
+import os
+import unittest
+from unittest.mock import MagicMock
+
+import tests.test_constants as test_constants
+from src.db.comments.comments_dao import CommentsDao
+from src.db.db_manager import DbManager
+
+
+class TestCommentsDao(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(test_constants.TEST_DB_PATH):
+            os.remove(test_constants.TEST_DB_PATH)
+        else:
+            print("test.db doesn't exist. Skipping deleting it.")
+        self.db_manager = DbManager(test_constants.TEST_DB_PATH)
+        self.comments_dao = CommentsDao(self.db_manager)
+
+    def test_insert_and_get(self):
+        self.comments_dao.insert_comment(1234, 4321)
+        comment = self.comments_dao.get_comment(4321)
+        self.assertEqual(1234, comment.comment_id, "comment_id didn't match")
+        self.assertEqual(4321, comment.game_id, "game_id didn't match")
+
+    def test_get_comments(self):
+        self.comments_dao.insert_comment(1, 11)
+        self.comments_dao.insert_comment(2, 22)
+        self.comments_dao.insert_comment(3, 33)
+        comments = self.comments_dao.get_comments([11, 33, 44])
+        self.assertEqual({11, 33}, set(comments.keys()))
+        self.assertEqual(1, comments[11].comment_id)
+        self.assertEqual(3, comments[33].comment_id)
+
+    def test_get_comments_empty(self):
+        self.assertEqual({}, self.comments_dao.get_comments([]))
+
+    def test_warm_cache_then_no_reads(self):
+        # Set up
+        CommentsDao(self.db_manager).insert_comment(1, 11)
+        self.comments_dao.warm_cache()
+        self.comments_dao.get_comment(22)
+        old_cursor = self.db_manager.cursor
+        self.db_manager.cursor = MagicMock()
+
+        # Execute
+        comment = self.comments_dao.get_comment(11)
+        missing_comment = self.comments_dao.get_comment(22)
+        comments = self.comments_dao.get_comments([11, 22])
+
+        # Restore
+        cursor = self.db_manager.cursor
+        self.db_manager.cursor = old_cursor
+
+        # Verify
+        cursor.execute.assert_not_called()
+        self.assertEqual(1, comment.comment_id)
+        self.assertIsNone(missing_comment)
+        self.assertEqual({11}, set(comments.keys()))
+
+    def test_cache_updated_on_insert_and_delete(self):
+        self.assertIsNone(self.comments_dao.get_comment(11))
+        self.comments_dao.insert_comment(1, 11)
+        self.assertEqual(1, self.comments_dao.get_comment(11).comment_id)
+        self.comments_dao.delete_comment(1)
+        self.assertIsNone(self.comments_dao.get_comment(11))
+
+    def test_cache_cleared_on_rollback(self):
+        with self.assertRaises(ValueError):
+            with self.db_manager.transaction():
+                self.comments_dao.insert_comment(1, 11)
+                raise ValueError()
+        self.assertIsNone(self.comments_dao.get_comment(11))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import unittest
+
+import tests.test_constants as test_constants
+from src.db.content_hashes.content_hashes_dao import ContentHashesDao, TARGET_TYPE_POST, TARGET_TYPE_COMMENT
+from src.db.db_manager import DbManager
+
+
+class TestContentHashesDao(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(test_constants.TEST_DB_PATH):
+            os.remove(test_constants.TEST_DB_PATH)
+        else:
+            print("test.db doesn't exist. Skipping deleting it.")
+        db_manager = DbManager(test_constants.TEST_DB_PATH)
+        self.content_hashes_dao = ContentHashesDao(db_manager)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.content_hashes_dao.get_content_hashes(TARGET_TYPE_POST, 1234))
+
+    def test_upsert_and_get(self):
+        record = self.content_hashes_dao.upsert_content_hashes(TARGET_TYPE_POST, 1234, "title_hash", "body_hash")
+        self.assertEqual(record, self.content_hashes_dao.get_content_hashes(TARGET_TYPE_POST, 1234))
+        self.assertEqual("title_hash", record.title_hash, "title_hash didn't match")
+        self.assertEqual("body_hash", record.body_hash, "body_hash didn't match")
+
+    def test_upsert_replaces(self):
+        self.content_hashes_dao.upsert_content_hashes(TARGET_TYPE_POST, 1234, "title_hash", "body_hash")
+        self.content_hashes_dao.upsert_content_hashes(TARGET_TYPE_POST, 1234, "title_hash", "new_body_hash")
+        self.assertEqual("new_body_hash", self.content_hashes_dao.get_content_hashes(TARGET_TYPE_POST, 1234).body_hash)
+
+    def test_posts_and_comments_are_separate(self):
+        self.content_hashes_dao.upsert_content_hashes(TARGET_TYPE_POST, 1234, "title_hash", "post_body_hash")
+        self.content_hashes_dao.upsert_content_hashes(TARGET_TYPE_COMMENT, 1234, None, "comment_body_hash")
+        self.assertEqual("post_body_hash", self.content_hashes_dao.get_content_hashes(TARGET_TYPE_POST, 1234).body_hash)
+        comment_hashes = self.content_hashes_dao.get_content_hashes(TARGET_TYPE_COMMENT, 1234)
+        self.assertIsNone(comment_hashes.title_hash)
+        self.assertEqual("comment_body_hash", comment_hashes.body_hash)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import random
 import sys
 import unittest
 import uuid
+from unittest.mock import MagicMock
 
 import tests.test_constants as test_constants
 from src.db.daily_threads.daily_threads_dao import DailyThreadsDao
@@ -16,8 +17,8 @@ class TestDailyThreadsDao(unittest.TestCase):
             os.remove(test_constants.TEST_DB_PATH)
         else:
             print("test.db doesn't exist. Skipping deleting it.")
-        db_manager = DbManager(test_constants.TEST_DB_PATH)
-        self.daily_threads_dao = DailyThreadsDao(db_manager)
+        self.db_manager = DbManager(test_constants.TEST_DB_PATH)
+        self.daily_threads_dao = DailyThreadsDao(self.db_manager)
 
     def test_insert_and_get(self):
         random.seed(str(uuid.uuid4()))
@@ -58,6 +59,34 @@ class TestDailyThreadsDao(unittest.TestCase):
         db_daily_thread = self.daily_threads_dao.get_daily_thread(today)
         self.assertEqual(db_daily_thread.is_featured, True, "is_featured didn't match on update")
 
+    def test_warm_cache_then_no_reads(self):
+        # Set up
+        today = datetime_util.today()
+        DailyThreadsDao(self.db_manager).insert_daily_thread(1234, today, False)
+        self.daily_threads_dao.warm_cache()
+        self.daily_threads_dao.get_daily_thread(datetime_util.tomorrow())
+        old_cursor = self.db_manager.cursor
+        self.db_manager.cursor = MagicMock()
+
+        # Execute
+        daily_thread = self.daily_threads_dao.get_daily_thread(today)
+        missing_daily_thread = self.daily_threads_dao.get_daily_thread(datetime_util.tomorrow())
+
+        # Restore
+        cursor = self.db_manager.cursor
+        self.db_manager.cursor = old_cursor
+
+        # Verify
+        cursor.execute.assert_not_called()
+        self.assertEqual(1234, daily_thread.post_id)
+        self.assertIsNone(missing_daily_thread)
+
+    def test_cache_updated_on_unfeature(self):
+        today = datetime_util.today()
+        self.daily_threads_dao.insert_daily_thread(1234, today, True)
+        self.daily_threads_dao.unfeature_daily_thread(1234)
+        self.assertFalse(self.daily_threads_dao.get_daily_thread(today).is_featured)
+
 
 if __name__ == '__main__':
     unittest.main()
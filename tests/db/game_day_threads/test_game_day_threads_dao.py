@@ -34,6 +34,14 @@ class TestGameDayThreadsClient(unittest.TestCase):
         self.assertEqual(post_record.game_id, game_id, "game_id didn't match")
         # self.assertEqual(post_record.post_type, post_type, "post_type didn't match")
 
+    def test_get_game_day_threads(self):
+        self.game_day_threads_dao.insert_game_day_thread(1, 11)
+        self.game_day_threads_dao.insert_game_day_thread(2, 22)
+        game_day_threads = self.game_day_threads_dao.get_game_day_threads([22, 33])
+        self.assertEqual([22], list(game_day_threads.keys()))
+        self.assertEqual(2, game_day_threads[22].post_id, "post_id didn't match")
+        self.assertEqual({}, self.game_day_threads_dao.get_game_day_threads([]))
+
 
 if __name__ == '__main__':
     unittest.main()
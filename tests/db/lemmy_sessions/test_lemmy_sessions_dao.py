@@ -0,0 +1,46 @@
+import os
+import unittest
+
+import tests.test_constants as test_constants
+from src.db.db_manager import DbManager
+from src.db.lemmy_sessions.lemmy_sessions_dao import LemmySessionsDao
+
+LEMMY_INSTANCE = "https://lemmy.example"
+EXPIRES_AT = "2024-01-01T00:00:00+00:00"
+
+
+class TestLemmySessionsDao(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(test_constants.TEST_DB_PATH):
+            os.remove(test_constants.TEST_DB_PATH)
+        else:
+            print("test.db doesn't exist. Skipping deleting it.")
+        db_manager = DbManager(test_constants.TEST_DB_PATH)
+        self.lemmy_sessions_dao = LemmySessionsDao(db_manager)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.lemmy_sessions_dao.get_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name"))
+
+    def test_upsert_and_get(self):
+        record = self.lemmy_sessions_dao.upsert_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name", "jwt", 1234, EXPIRES_AT)
+        self.assertEqual(record, self.lemmy_sessions_dao.get_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name"))
+        self.assertEqual("jwt", record.jwt, "jwt didn't match")
+        self.assertEqual(1234, record.community_id, "community_id didn't match")
+        self.assertEqual(EXPIRES_AT, record.expires_at, "expires_at didn't match")
+
+    def test_upsert_replaces(self):
+        self.lemmy_sessions_dao.upsert_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name", "jwt", 1234, EXPIRES_AT)
+        self.lemmy_sessions_dao.upsert_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name", "new_jwt", 1234, EXPIRES_AT)
+        self.assertEqual("new_jwt", self.lemmy_sessions_dao.get_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name").jwt)
+
+    def test_delete(self):
+        self.lemmy_sessions_dao.upsert_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name", "jwt", 1234, EXPIRES_AT)
+        self.lemmy_sessions_dao.upsert_lemmy_session(LEMMY_INSTANCE, "other_bot_name", "community_name", "jwt", 1234, EXPIRES_AT)
+        self.lemmy_sessions_dao.delete_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name")
+        self.assertIsNone(self.lemmy_sessions_dao.get_lemmy_session(LEMMY_INSTANCE, "bot_name", "community_name"))
+        self.assertIsNotNone(self.lemmy_sessions_dao.get_lemmy_session(LEMMY_INSTANCE, "other_bot_name", "community_name"))
+
+
+if __name__ == '__main__':
+    unittest.main()
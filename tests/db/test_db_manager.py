@@ -1,8 +1,10 @@
 import os
+import sqlite3
+import threading
 import unittest
 
 import tests.test_constants as test_constants
-from src.db.db_manager import DbManager
+from src.db.db_manager import DbManager, PRAGMA_PROFILE_WAL
 
 
 class TestDbClient(unittest.TestCase):
@@ -22,6 +24,118 @@ class TestDbClient(unittest.TestCase):
         self.db_manager.upgrade_db_schema()
         self.assertEqual(self.db_manager.get_db_schema_version(), self.db_manager.DB_SCHEMA_VERSION)
 
+    def test_game_id_indexes(self):
+        indexes = [val[0] for val in self.db_manager.cursor.execute("SELECT name FROM sqlite_master WHERE type='index'").fetchall()]
+        self.assertIn("comments_game_id_index", indexes)
+        self.assertIn("game_day_threads_game_id_index", indexes)
+
+    def test_default_pragma_profile(self):
+        self.assertEqual("delete", self.db_manager.cursor.execute("PRAGMA journal_mode").fetchone()[0])
+
+    def test_wal_pragma_profile(self):
+        self.db_manager.connection.close()
+        db_manager = DbManager(test_constants.TEST_DB_PATH, PRAGMA_PROFILE_WAL)
+        self.assertEqual("wal", db_manager.cursor.execute("PRAGMA journal_mode").fetchone()[0])
+        # NORMAL
+        self.assertEqual(1, db_manager.cursor.execute("PRAGMA synchronous").fetchone()[0])
+        # MEMORY
+        self.assertEqual(2, db_manager.cursor.execute("PRAGMA temp_store").fetchone()[0])
+        self.assertEqual(-8000, db_manager.cursor.execute("PRAGMA cache_size").fetchone()[0])
+        db_manager.connection.close()
+
+    def test_unknown_pragma_profile(self):
+        self.db_manager.connection.close()
+        db_manager = DbManager(test_constants.TEST_DB_PATH, "unknown")
+        self.assertEqual("delete", db_manager.cursor.execute("PRAGMA journal_mode").fetchone()[0])
+        db_manager.connection.close()
+
+    def _count_comments(self) -> int:
+        # A second connection only sees committed rows
+        connection = sqlite3.connect(test_constants.TEST_DB_PATH)
+        count = connection.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+        connection.close()
+        return count
+
+    def _insert_comment(self, comment_id: int):
+        self.db_manager.cursor.execute("INSERT INTO comments VALUES(?, ?)", (comment_id, comment_id))
+        self.db_manager.commit()
+
+    def test_commit_outside_transaction(self):
+        self._insert_comment(1)
+        self.assertEqual(1, self._count_comments())
+
+    def test_transaction_commits_once(self):
+        with self.db_manager.transaction():
+            self._insert_comment(1)
+            with self.db_manager.transaction():
+                self._insert_comment(2)
+            self.assertEqual(0, self._count_comments())
+        self.assertEqual(2, self._count_comments())
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.db_manager.transaction():
+                self._insert_comment(1)
+                raise ValueError()
+        self.assertEqual(0, self._count_comments())
+        self.assertEqual(0, self.db_manager.transaction_depth)
+
+    def test_transaction_commits_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.db_manager.transaction(rollback_on_error=False):
+                self._insert_comment(1)
+                raise ValueError()
+        self.assertEqual(1, self._count_comments())
+
+    def test_transactions_of_two_threads(self):
+        in_transaction = threading.Event()
+        errors = []
+
+        def write_from_other_thread():
+            in_transaction.wait(5)
+            try:
+                # Waits for the main thread's transaction to end, instead of joining it and being rolled back with it
+                with self.db_manager.transaction():
+                    self._insert_comment(2)
+                self._insert_comment(3)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=write_from_other_thread)
+        thread.start()
+        with self.assertRaises(ValueError):
+            with self.db_manager.transaction():
+                self._insert_comment(1)
+                in_transaction.set()
+                thread.join(0.2)
+                # The other thread is still waiting for this transaction to end
+                self.assertTrue(thread.is_alive())
+                self.assertEqual(0, self._count_comments())
+                raise ValueError()
+        thread.join(5)
+
+        self.assertEqual([], errors)
+        self.assertEqual(2, self._count_comments())
+        comment_ids = [val[0] for val in self.db_manager.cursor.execute("SELECT comment_id FROM comments").fetchall()]
+        self.assertEqual([2, 3], sorted(comment_ids))
+
+    def test_commit_from_other_thread_waits_for_transaction(self):
+        committed = threading.Event()
+
+        def commit_from_other_thread():
+            self.db_manager.commit()
+            committed.set()
+
+        with self.db_manager.transaction():
+            self._insert_comment(1)
+            thread = threading.Thread(target=commit_from_other_thread)
+            thread.start()
+            self.assertFalse(committed.wait(0.2))
+            self.assertEqual(1, self.db_manager.transaction_depth)
+        thread.join(5)
+        self.assertTrue(committed.is_set())
+        self.assertEqual(1, self._count_comments())
+
 
 if __name__ == '__main__':
     unittest.main()
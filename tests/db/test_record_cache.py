@@ -0,0 +1,41 @@
+import unittest
+
+from src.db.record_cache import RecordCache, MISSING
+
+
+class TestRecordCache(unittest.TestCase):
+    def test_get_missing(self):
+        cache = RecordCache()
+        self.assertIs(MISSING, cache.get(1))
+
+    def test_put_and_get(self):
+        cache = RecordCache()
+        cache.put(1, "record")
+        cache.put(2, None)
+        self.assertEqual("record", cache.get(1))
+        self.assertIsNone(cache.get(2))
+
+    def test_evicts_least_recently_used(self):
+        cache = RecordCache(max_entries=2)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        cache.get(1)
+        cache.put(3, "three")
+        self.assertEqual(2, len(cache))
+        self.assertEqual("one", cache.get(1))
+        self.assertIs(MISSING, cache.get(2))
+        self.assertEqual("three", cache.get(3))
+
+    def test_invalidate(self):
+        cache = RecordCache()
+        cache.put(1, "one")
+        cache.put(2, "two")
+        cache.invalidate(1)
+        self.assertIs(MISSING, cache.get(1))
+        self.assertEqual("two", cache.get(2))
+        cache.invalidate()
+        self.assertEqual(0, len(cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,15 @@
+class FakeClock:
+    """
+    A clock that only moves when slept on, for testing code that waits without waiting.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
@@ -0,0 +1,97 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+API_PATH = "/api/v3"
+FAKE_JWT = "header.eyJzdWIiOjF9.signature"
+COMMUNITY_ID = 1
+
+RATE_LIMITED = (429, json.dumps({"error": "rate_limit_error"}))
+BAD_GATEWAY = (502, "<html><head><title>502 Bad Gateway</title></head><body><center><h1>502 Bad Gateway</h1></center></body></html>")
+NOT_FOUND = (404, json.dumps({"error": "couldnt_find_post"}))
+
+
+class FakeLemmyServer:
+    """
+    A Lemmy instance on localhost that answers the calls the bot makes, for testing against real HTTP requests.
+
+    Errors to answer with can be queued per call, e.g. failures[("POST", "/post")] = [RATE_LIMITED]. Each queued error
+    answers one request, then the call succeeds again.
+    """
+
+    def __init__(self):
+        self.failures: dict[tuple[str, str], list[tuple[int, str]]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.next_id = 1
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self, "GET")
+
+            def do_POST(self):
+                server.handle(self, "POST")
+
+            def do_PUT(self):
+                server.handle(self, "PUT")
+
+            def log_message(self, *args):
+                pass
+
+        self.http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.http_server.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.http_server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.http_server.shutdown()
+        self.http_server.server_close()
+
+    def count(self, method: str, path: str) -> int:
+        with self.lock:
+            return self.requests.count((method, path))
+
+    def handle(self, request: BaseHTTPRequestHandler, method: str):
+        path = request.path.split("?")[0]
+        if path.startswith(API_PATH):
+            path = path[len(API_PATH):]
+        length = int(request.headers.get("Content-Length", 0))
+        if length:
+            request.rfile.read(length)
+        with self.lock:
+            self.requests.append((method, path))
+            failures = self.failures.get((method, path))
+            if failures:
+                status, body = failures.pop(0)
+            else:
+                status, body = 200, json.dumps(self.get_response(method, path))
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json" if body.startswith("{") else "text/html")
+        request.send_header("Content-Length", str(len(body.encode())))
+        request.end_headers()
+        request.wfile.write(body.encode())
+
+    def get_response(self, method: str, path: str) -> dict:
+        if path == "/nodeinfo/2.0.json":
+            return {"software": {"name": "lemmy", "version": "0.19.3"}}
+        if path == "/user/login":
+            return {"jwt": FAKE_JWT}
+        if path == "/community":
+            return {"community_view": {"community": {"id": COMMUNITY_ID}}}
+        if path == "/comment" or path == "/comment/delete":
+            return {"comment_view": {"comment": {"id": self._get_id(method)}}}
+        return {"post_view": {"post": {"id": self._get_id(method)}}}
+
+    def _get_id(self, method: str) -> int:
+        new_id = self.next_id
+        if method == "POST":
+            self.next_id += 1
+        return new_id
@@ -3,7 +3,9 @@ from datetime import datetime
 from unittest.mock import MagicMock
 
 import src.main as main
-from src.datatypes.game import Game
+from src.datatypes.game import Game, GameType
+from src.datatypes.game_info import GameInfo
+from src.datatypes.teams import Teams
 from src.db.comments.comments_dao import comments_dao
 from src.db.comments.comments_record import CommentsRecord
 from src.db.daily_threads.daily_threads_dao import daily_threads_dao
@@ -13,6 +15,7 @@ from src.utils import datetime_util
 from src.utils.log_util import LOGGER
 from src.utils import post_util
 from src.utils.environment_util import environment_util
+from src.utils.game_diff import game_differ
 from src.utils.lemmy_client import lemmy_client
 
 
@@ -24,6 +27,7 @@ class TestHandleDailyThread(unittest.TestCase):
 
         # Execute
         result = main.handle_daily_thread(games)
+        main.lemmy_writer.run_pending()
 
         # Verify
         self.assertIsNone(result)
@@ -38,6 +42,7 @@ class TestHandleDailyThread(unittest.TestCase):
 
         # Execute
         result = main.handle_daily_thread(games)
+        main.lemmy_writer.run_pending()
 
         # Restore old values
         environment_util.comment_post_types = old_comment_post_types
@@ -55,6 +60,7 @@ class TestHandleDailyThread(unittest.TestCase):
 
         # Execute
         result = main.handle_daily_thread(games)
+        main.lemmy_writer.run_pending()
 
         # Restore old values
         environment_util.comment_post_types = old_comment_post_types
@@ -68,6 +74,7 @@ class TestHandleDailyThread(unittest.TestCase):
 
         # Execute
         result = main.handle_daily_thread(games)
+        main.lemmy_writer.run_pending()
 
         # Verify
         self.assertIsNone(result)
@@ -78,7 +85,7 @@ class TestHandleDailyThread(unittest.TestCase):
         lemmy_client_update_daily_thread = lemmy_client.update_daily_thread
         post_util_get_daily_thread_title = post_util.get_daily_thread_title
         post_util_get_daily_thread_body = post_util.get_daily_thread_body
-        datetime_util_is_same_day = datetime_util.is_same_day
+        datetime_util_get_current_day_as_idlw = datetime_util.get_current_day_as_idlw
 
         # Set up
         games = [Game(2023020193, None, None, datetime.now(), None, None, None, None, None, None), Game(2023020194, None, None, datetime.now(), None, None, None, None, None, None)]
@@ -87,10 +94,11 @@ class TestHandleDailyThread(unittest.TestCase):
         lemmy_client.update_daily_thread = MagicMock(return_value=daily_thread)
         post_util.get_daily_thread_title = MagicMock(return_value="title")
         post_util.get_daily_thread_body = MagicMock(return_value="body")
-        datetime_util.is_same_day = MagicMock(return_value=True)
+        datetime_util.get_current_day_as_idlw = MagicMock(return_value=datetime_util.get_day_key(games[0].start_time))
 
         # Execute
         result = main.handle_daily_thread(games)
+        main.lemmy_writer.run_pending()
 
         # Verify
         self.assertEqual(result, daily_thread)
@@ -101,42 +109,62 @@ class TestHandleDailyThread(unittest.TestCase):
         lemmy_client.update_daily_thread = lemmy_client_update_daily_thread
         post_util.get_daily_thread_title = post_util_get_daily_thread_title
         post_util.get_daily_thread_body = post_util_get_daily_thread_body
-        datetime_util.is_same_day = datetime_util_is_same_day
+        datetime_util.get_current_day_as_idlw = datetime_util_get_current_day_as_idlw
 
     def test_create_new_daily_thread(self):
         # Save old values
         old_daily_threads_dao_get_daily_thread = daily_threads_dao.get_daily_thread
         lemmy_client_create_daily_thread = lemmy_client.create_daily_thread
         lemmy_client_feature_daily_thread = lemmy_client.feature_daily_thread
+        lemmy_client_create_comment = lemmy_client.create_comment
         post_util_get_daily_thread_title = post_util.get_daily_thread_title
         post_util_get_daily_thread_body = post_util.get_daily_thread_body
-        datetime_util_is_same_day = datetime_util.is_same_day
+        post_util_get_game_details = post_util.get_game_details
+        datetime_util_get_current_day_as_idlw = datetime_util.get_current_day_as_idlw
+        datetime_util_is_time_to_make_post = datetime_util.is_time_to_make_post
+        comments_dao_get_comment = comments_dao.get_comment
 
         # Set up
         games = [Game(2023020193, None, None, datetime.now(), None, None, None, None, None, None), Game(2023020194, None, None, datetime.now(), None, None, None, None, None, None)]
         created_daily_thread = DailyThreadsRecord(12341234, str(datetime.today()), True)
-        daily_threads_dao.get_daily_thread = MagicMock(return_value=None)
-        lemmy_client.create_daily_thread = MagicMock(return_value=created_daily_thread)
+        daily_threads = []
+        daily_threads_dao.get_daily_thread = MagicMock(side_effect=lambda date: daily_threads[0] if daily_threads else None)
+        lemmy_client.create_daily_thread = MagicMock(side_effect=lambda date, title, body: daily_threads.append(created_daily_thread) or created_daily_thread)
         lemmy_client.feature_daily_thread = MagicMock(return_value=None)
+        lemmy_client.create_comment = MagicMock()
         post_util.get_daily_thread_title = MagicMock(return_value="title")
         post_util.get_daily_thread_body = MagicMock(return_value="body")
-        datetime_util.is_same_day = MagicMock(return_value=True)
+        post_util.get_game_details = MagicMock(return_value="game_details")
+        datetime_util.get_current_day_as_idlw = MagicMock(return_value=datetime_util.get_day_key(games[0].start_time))
+        datetime_util.is_time_to_make_post = MagicMock(return_value=True)
+        comments_dao.get_comment = MagicMock(return_value=None)
 
         # Execute
         result = main.handle_daily_thread(games)
+        for game in games:
+            main.handle_comment(result, game)
+        main.lemmy_writer.run_pending()
 
         # Verify
-        self.assertEqual(result, created_daily_thread)
+        # The daily thread is created on the Lemmy writer, so there is none yet when handle_daily_thread returns. The
+        #  comments of the cycle are queued after it, and made in it.
+        self.assertIsNone(result)
         lemmy_client.create_daily_thread.assert_called_with(datetime_util.get_current_day_as_idlw(), post_util.get_daily_thread_title(), post_util.get_daily_thread_body())
         lemmy_client.feature_daily_thread.assert_called_with(created_daily_thread.post_id)
+        self.assertEqual([(created_daily_thread.post_id, game.id, "game_details") for game in games],
+                         [call.args for call in lemmy_client.create_comment.call_args_list])
 
         # Restore
         daily_threads_dao.get_daily_thread = old_daily_threads_dao_get_daily_thread
         lemmy_client.create_daily_thread = lemmy_client_create_daily_thread
         lemmy_client.feature_daily_thread = lemmy_client_feature_daily_thread
+        lemmy_client.create_comment = lemmy_client_create_comment
         post_util.get_daily_thread_title = post_util_get_daily_thread_title
         post_util.get_daily_thread_body = post_util_get_daily_thread_body
-        datetime_util.is_same_day = datetime_util_is_same_day
+        post_util.get_game_details = post_util_get_game_details
+        datetime_util.get_current_day_as_idlw = datetime_util_get_current_day_as_idlw
+        datetime_util.is_time_to_make_post = datetime_util_is_time_to_make_post
+        comments_dao.get_comment = comments_dao_get_comment
 
 
 class TestHandleGameDayThread(unittest.TestCase):
@@ -160,6 +188,7 @@ class TestHandleGameDayThread(unittest.TestCase):
 
         # Execute
         main.handle_game_day_thread(game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         game_day_threads_dao.get_game_day_thread.assert_called_once_with(2023020193)
@@ -193,6 +222,7 @@ class TestHandleGameDayThread(unittest.TestCase):
 
         # Execute
         main.handle_game_day_thread(game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         game_day_threads_dao.get_game_day_thread.assert_called_once_with(2023020193)
@@ -225,9 +255,12 @@ class TestHandleGameDayThread(unittest.TestCase):
 
         # Execute
         main.handle_game_day_thread(game)
+        main.lemmy_writer.run_pending()
 
         # Verify
-        game_day_threads_dao.get_game_day_thread.assert_called_once_with(2023020193)
+        # Looked up again by the writer before creating the post
+        self.assertEqual(2, game_day_threads_dao.get_game_day_thread.call_count)
+        game_day_threads_dao.get_game_day_thread.assert_called_with(2023020193)
         post_util.get_title.assert_called_once_with(game)
         post_util.get_gdt_body.assert_called_once_with(game)
         lemmy_client.create_game_day_thread.assert_called_once_with(post_util.get_title.return_value, post_util.get_gdt_body.return_value, 2023020193)
@@ -257,6 +290,7 @@ class TestHandleGameDayThread(unittest.TestCase):
 
         # Execute
         main.handle_game_day_thread(game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         game_day_threads_dao.get_game_day_thread.assert_called_once_with(2023020193)
@@ -289,6 +323,7 @@ class TestHandleGameDayThread(unittest.TestCase):
 
         # Execute
         main.handle_game_day_thread(game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         game_day_threads_dao.get_game_day_thread.assert_called_once_with(2023020193)
@@ -319,6 +354,7 @@ class TestHandleComment(unittest.TestCase):
 
         # Execute
         main.handle_comment(daily_thread, game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         LOGGER.d.assert_called_once_with("main", "Game or daily thread is None. Don't make a post. daily_thread is None: True, game is None: True")
@@ -346,6 +382,7 @@ class TestHandleComment(unittest.TestCase):
 
         # Execute
         main.handle_comment(daily_thread, game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         lemmy_client.update_comment.assert_called_once_with(456, "game_details")
@@ -373,6 +410,7 @@ class TestHandleComment(unittest.TestCase):
 
         # Execute
         main.handle_comment(daily_thread, game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         lemmy_client.update_comment.assert_not_called()
@@ -403,6 +441,7 @@ class TestHandleComment(unittest.TestCase):
 
         # Execute
         main.handle_comment(daily_thread, game)
+        main.lemmy_writer.run_pending()
 
         # Verify
         lemmy_client.update_comment.assert_not_called()
@@ -417,5 +456,151 @@ class TestHandleComment(unittest.TestCase):
         LOGGER.i = old_logger_i
 
 
+class TestMergeGamesWithSchedule(unittest.TestCase):
+
+    @staticmethod
+    def _game(game_id: int, game_clock: str = "--") -> Game:
+        return Game(game_id, None, None, datetime(2023, 11, 10, 19), None, GameInfo(current_period="0", game_clock=game_clock), None, None, None, None)
+
+    def test_merge(self):
+        schedule = [self._game(1), self._game(2), self._game(3)]
+        games = [self._game(3, "FINAL"), None, self._game(1, "1st")]
+
+        merged, unmatched = main.merge_games_with_schedule(schedule, games)
+
+        self.assertEqual([games[2], schedule[1], games[0]], merged)
+        self.assertEqual([], unmatched)
+        self.assertEqual([self._game(1), self._game(2), self._game(3)], schedule)
+
+    def test_merge_reports_unmatched_games(self):
+        schedule = [self._game(1)]
+        games = [self._game(1, "1st"), self._game(4, "FINAL")]
+
+        merged, unmatched = main.merge_games_with_schedule(schedule, games)
+
+        self.assertEqual([games[0]], merged)
+        self.assertEqual([games[1]], unmatched)
+
+    def test_merge_multi_day_schedules(self):
+        schedules = {"2023-11-10": [self._game(1), self._game(2)], "2023-11-11": [self._game(3)], "2023-11-12": []}
+        games = [self._game(3, "FINAL"), self._game(2, "FINAL"), self._game(5, "FINAL")]
+
+        merged, unmatched = main.merge_games_with_schedules(schedules, games)
+
+        self.assertEqual({"2023-11-10": [schedules["2023-11-10"][0], games[1]], "2023-11-11": [games[0]], "2023-11-12": []}, merged)
+        self.assertEqual([games[2]], unmatched)
+
+
+class TestFilterGamesBySelectedTeams(unittest.TestCase):
+
+    def test_filter_games_by_selected_teams(self):
+        # Save old values
+        old_team_ids = environment_util.team_ids
+
+        # Set up
+        environment_util.team_ids = frozenset([Teams.SJS.value.id, Teams.NYR.value.id])
+        home_game = Game(1, Teams.ANA.value, Teams.SJS.value, None, None, None, None, None, None, None)
+        away_game = Game(2, Teams.NYR.value, Teams.DAL.value, None, None, None, None, None, None, None)
+        other_game = Game(3, Teams.ANA.value, Teams.DAL.value, None, None, None, None, None, None, None)
+
+        # Execute
+        filtered = main.filter_games_by_selected_teams([home_game, None, other_game, away_game])
+
+        # Restore
+        environment_util.team_ids = old_team_ids
+
+        # Verify
+        self.assertEqual([home_game, away_game], filtered)
+
+
+class TestSkipUnchangedGames(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(2023020193, None, None, datetime(2023, 11, 10, 19), None, GameInfo(current_period="1st", game_clock="10:00"), None, None, None, None)
+        game_differ.forget(self.game.id)
+
+    def tearDown(self):
+        game_differ.forget(self.game.id)
+
+    def _write_game_day_thread_edit(self, update_return_value, is_content_sent_return_value):
+        # Save old values
+        old_update_game_day_thread = lemmy_client.update_game_day_thread
+        old_is_content_sent = lemmy_client.is_content_sent
+
+        # Set up
+        lemmy_client.update_game_day_thread = MagicMock(return_value=update_return_value)
+        lemmy_client.is_content_sent = MagicMock(return_value=is_content_sent_return_value)
+        game_differ.diff(self.game)
+
+        # Execute
+        main.write_game_day_thread_edit("title", "body", 123, self.game.id)
+
+        # Restore
+        lemmy_client.update_game_day_thread = old_update_game_day_thread
+        lemmy_client.is_content_sent = old_is_content_sent
+
+    def test_sent_edit_keeps_the_snapshot(self):
+        self._write_game_day_thread_edit(True, False)
+        self.assertIsNone(game_differ.diff(self.game))
+
+    def test_skipped_edit_keeps_the_snapshot(self):
+        self._write_game_day_thread_edit(False, True)
+        self.assertIsNone(game_differ.diff(self.game))
+
+    def test_failed_edit_forgets_the_snapshot(self):
+        self._write_game_day_thread_edit(False, False)
+        self.assertEqual([], game_differ.diff(self.game))
+
+    def test_failed_comment_edit_forgets_the_snapshot(self):
+        # Save old values
+        old_update_comment = lemmy_client.update_comment
+        old_is_content_sent = lemmy_client.is_content_sent
+
+        # Set up
+        lemmy_client.update_comment = MagicMock(side_effect=Exception("Error encountered while PUT on endpoint comment"))
+        lemmy_client.is_content_sent = MagicMock(return_value=False)
+        game_differ.diff(self.game)
+
+        # Execute
+        with self.assertRaises(Exception):
+            main.write_comment_edit(456, "content", self.game.id)
+
+        # Restore
+        lemmy_client.update_comment = old_update_comment
+        lemmy_client.is_content_sent = old_is_content_sent
+
+        # Verify
+        self.assertEqual([], game_differ.diff(self.game))
+
+    def test_is_game_posted(self):
+        # Save old values
+        old_gdt_post_types = environment_util.gdt_post_types
+        old_comment_post_types = environment_util.comment_post_types
+        old_get_game_day_thread = game_day_threads_dao.get_game_day_thread
+        old_get_comment = comments_dao.get_comment
+
+        # Set up
+        environment_util.gdt_post_types = [GameType.POSTSEASON]
+        environment_util.comment_post_types = [GameType.REGULAR]
+        game_day_threads_dao.get_game_day_thread = MagicMock(return_value=None)
+        comments_dao.get_comment = MagicMock(return_value=CommentsRecord(456, self.game.id))
+
+        # Execute
+        is_regular_game_posted = main.is_game_posted(self.game, GameType.REGULAR)
+        is_postseason_game_posted = main.is_game_posted(self.game, GameType.POSTSEASON)
+        is_preseason_game_posted = main.is_game_posted(self.game, GameType.PRESEASON)
+
+        # Restore
+        environment_util.gdt_post_types = old_gdt_post_types
+        environment_util.comment_post_types = old_comment_post_types
+        game_day_threads_dao.get_game_day_thread = old_get_game_day_thread
+        comments_dao.get_comment = old_get_comment
+
+        # Verify
+        self.assertTrue(is_regular_game_posted)
+        self.assertFalse(is_postseason_game_posted)
+        self.assertFalse(is_preseason_game_posted)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from src.utils.circuit_breaker import CircuitBreaker, CircuitState
+from tests.fake_clock import FakeClock
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.circuit_breaker = CircuitBreaker("test", 3, 60, self.clock.time)
+
+    def _fail(self, count: int):
+        for _ in range(count):
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.circuit_breaker.record_failure()
+
+    def test_opens_after_failures_in_a_row(self):
+        self._fail(2)
+        self.circuit_breaker.record_success()
+        self._fail(2)
+        self.assertEqual(CircuitState.CLOSED, self.circuit_breaker.state)
+        self._fail(1)
+        self.assertEqual(CircuitState.OPEN, self.circuit_breaker.state)
+        self.assertFalse(self.circuit_breaker.allow_request())
+        self.assertEqual(1, self.circuit_breaker.rejected)
+
+    def test_half_open_lets_one_probe_through(self):
+        self._fail(3)
+        self.clock.now = 59
+        self.assertFalse(self.circuit_breaker.allow_request())
+        self.clock.now = 60
+        self.assertTrue(self.circuit_breaker.allow_request())
+        self.assertEqual(CircuitState.HALF_OPEN, self.circuit_breaker.state)
+        self.assertFalse(self.circuit_breaker.allow_request())
+        self.circuit_breaker.record_success()
+        self.assertEqual(CircuitState.CLOSED, self.circuit_breaker.state)
+        self.assertTrue(self.circuit_breaker.allow_request())
+
+    def test_failed_probe_opens_again(self):
+        self._fail(3)
+        self.clock.now = 60
+        self._fail(1)
+        self.assertEqual(CircuitState.OPEN, self.circuit_breaker.state)
+        self.clock.now = 119
+        self.assertFalse(self.circuit_breaker.allow_request())
+        self.clock.now = 120
+        self.assertTrue(self.circuit_breaker.allow_request())
+
+    def test_reset(self):
+        self._fail(3)
+        self.circuit_breaker.reset()
+        self.assertEqual(CircuitState.CLOSED, self.circuit_breaker.state)
+        self.assertTrue(self.circuit_breaker.allow_request())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from datetime import datetime, timedelta
 
+from dateutil import parser
+
 from src.utils import datetime_util
 from src.utils.environment_util import environment_util
 
@@ -43,6 +45,35 @@ class TestDatetimeUtils(unittest.TestCase):
         end_time = current_time
         self.assertFalse(datetime_util.is_time_to_make_post(current_time, start_time, end_time))
 
+    def test_parse_datetime_matches_dateutil(self):
+        for datetime_string in ["2023-11-11T00:00:00Z", "2024-05-06T23:30:00Z", "2023-11-10T19:00:00-05:00", "2023-11-10"]:
+            parsed = datetime_util.parse_datetime(datetime_string)
+            expected = parser.parse(datetime_string)
+            self.assertEqual(expected, parsed, datetime_string)
+            self.assertEqual(expected.utcoffset(), parsed.utcoffset(), datetime_string)
+
+    def test_parse_datetime_falls_back_to_dateutil(self):
+        self.assertEqual(datetime(2023, 11, 10, 19, 0), datetime_util.parse_datetime("Nov 10 2023 7:00 PM"))
+        with self.assertRaises(ValueError):
+            datetime_util.parse_datetime("not a datetime")
+
+    def test_parse_datetime_is_memoized(self):
+        datetime_util.parse_datetime.cache_clear()
+        first = datetime_util.parse_datetime("2023-11-11T00:00:00Z")
+        second = datetime_util.parse_datetime("2023-11-11T00:00:00Z")
+        self.assertIs(first, second)
+        self.assertEqual(1, datetime_util.parse_datetime.cache_info().hits)
+
+    def test_get_start_times(self):
+        start_time = datetime_util.parse_datetime("2023-11-11T00:30:00Z")
+        start_times = datetime_util.get_start_times(start_time)
+        self.assertEqual("2023-11-10", start_times.day_key)
+        self.assertEqual("07:30PM EST", start_times.formatted)
+        self.assertEqual(("04:30PM", "05:30PM", "06:30PM", "07:30PM", "08:30PM"),
+                         (start_times.pt, start_times.mt, start_times.ct, start_times.et, start_times.at))
+        self.assertIs(start_times, datetime_util.get_start_times(datetime_util.parse_datetime("2023-11-11T00:30:00Z")))
+        self.assertTrue(datetime_util.is_same_day(start_time, "2023-11-10"))
+
     def test_next_day(self):
         today = datetime_util.today()
         tomorrow = datetime_util.tomorrow()
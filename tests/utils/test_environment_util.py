@@ -37,6 +37,17 @@ class TestEnvironmentUtil(unittest.TestCase):
 
         self.assertEqual(EnvironmentUtil.parse_game_types(provided), expected)
 
+    def test_load_on_first_access(self):
+        environment_util = EnvironmentUtil(EXAMPLE_ENV_FILE)
+        self.assertFalse(environment_util.is_loaded)
+        self.assertEqual("bot_name", environment_util.bot_name)
+        self.assertTrue(environment_util.is_loaded)
+
+    def test_unknown_attribute(self):
+        environment_util = EnvironmentUtil(EXAMPLE_ENV_FILE)
+        with self.assertRaises(AttributeError):
+            environment_util.unknown_attribute
+
     def test_load_example_dotenv(self):
         expected_bot_name = "bot_name"
         expected_password = "bot_password"
@@ -51,6 +62,9 @@ class TestEnvironmentUtil(unittest.TestCase):
         expected_teams = [Teams.SJS.value, Teams.NYR.value, Teams.DAL.value]
         expected_mins_before_game_start_to_create_post = 60
         expected_mins_after_game_end_to_update_post = 60
+        expected_max_concurrent_nhl_api_requests = 8
+        expected_schedule_cache_ttl_minutes = 60
+        expected_db_pragma_profile = 'wal'
         environment_util = EnvironmentUtil(EXAMPLE_ENV_FILE)
         self.assertEqual(expected_bot_name, environment_util.bot_name, "bot_name didn't match")
         self.assertEqual(expected_password, environment_util.password, "password didn't match")
@@ -63,8 +77,15 @@ class TestEnvironmentUtil(unittest.TestCase):
         self.assertEqual(expected_log_file_backup_count, environment_util.log_file_backup_count, "log_file_backup_count didn't match")
         self.assertEqual(expected_error_backup_count, environment_util.error_backup_count, "error_backup_count didn't match")
         self.assertEqual(expected_teams, environment_util.teams, "teams didn't match")
+        self.assertEqual(frozenset(team.id for team in expected_teams), environment_util.team_ids, "team_ids didn't match")
+        self.assertTrue(environment_util.is_team_selected(Teams.SJS.value))
+        self.assertFalse(environment_util.is_team_selected(Teams.ANA.value))
+        self.assertFalse(environment_util.is_team_selected(None))
         self.assertEqual(expected_mins_before_game_start_to_create_post, environment_util.minutes_before_game_start_to_create_post, "mins before game start didn't match")
         self.assertEqual(expected_mins_after_game_end_to_update_post, environment_util.minutes_after_game_end_to_update_post, "mins after game end didn't match")
+        self.assertEqual(expected_max_concurrent_nhl_api_requests, environment_util.max_concurrent_nhl_api_requests, "max concurrent nhl api requests didn't match")
+        self.assertEqual(expected_schedule_cache_ttl_minutes, environment_util.schedule_cache_ttl_minutes, "schedule cache ttl minutes didn't match")
+        self.assertEqual(expected_db_pragma_profile, environment_util.db_pragma_profile, "db pragma profile didn't match")
 
     def test_load_example_dotenv_no_teams(self):
         expected_bot_name = "bot_name"
@@ -80,6 +101,9 @@ class TestEnvironmentUtil(unittest.TestCase):
         expected_teams = Teams.get_all_teams()
         expected_mins_before_game_start_to_create_post = 60
         expected_mins_after_game_end_to_update_post = 60
+        expected_max_concurrent_nhl_api_requests = 4
+        expected_schedule_cache_ttl_minutes = 30
+        expected_db_pragma_profile = 'default'
         environment_util = EnvironmentUtil(EXAMPLE_ENV_FILE_NO_TEAMS)
         self.assertEqual(expected_bot_name, environment_util.bot_name, "bot_name didn't match")
         self.assertEqual(expected_password, environment_util.password, "password didn't match")
@@ -94,6 +118,9 @@ class TestEnvironmentUtil(unittest.TestCase):
         self.assertEqual(expected_teams, environment_util.teams, "teams didn't match")
         self.assertEqual(expected_mins_before_game_start_to_create_post, environment_util.minutes_before_game_start_to_create_post, "mins before game start didn't match")
         self.assertEqual(expected_mins_after_game_end_to_update_post, environment_util.minutes_after_game_end_to_update_post, "mins after game end didn't match")
+        self.assertEqual(expected_max_concurrent_nhl_api_requests, environment_util.max_concurrent_nhl_api_requests, "max concurrent nhl api requests didn't match")
+        self.assertEqual(expected_schedule_cache_ttl_minutes, environment_util.schedule_cache_ttl_minutes, "schedule cache ttl minutes didn't match")
+        self.assertEqual(expected_db_pragma_profile, environment_util.db_pragma_profile, "db pragma profile didn't match")
 
     def test_load_example_dotenv_no_log_config(self):
         expected_bot_name = "bot_name"
@@ -109,6 +136,9 @@ class TestEnvironmentUtil(unittest.TestCase):
         expected_teams = [Teams.SJS.value, Teams.NYR.value, Teams.DAL.value]
         expected_mins_before_game_start_to_create_post = 60
         expected_mins_after_game_end_to_update_post = 60
+        expected_max_concurrent_nhl_api_requests = 8
+        expected_schedule_cache_ttl_minutes = 60
+        expected_db_pragma_profile = 'wal'
         environment_util = EnvironmentUtil(EXAMPLE_ENV_FILE_NO_LOG_CONFIG)
         self.assertEqual(expected_bot_name, environment_util.bot_name, "bot_name didn't match")
         self.assertEqual(expected_password, environment_util.password, "password didn't match")
@@ -123,6 +153,9 @@ class TestEnvironmentUtil(unittest.TestCase):
         self.assertEqual(expected_teams, environment_util.teams, "teams didn't match")
         self.assertEqual(expected_mins_before_game_start_to_create_post, environment_util.minutes_before_game_start_to_create_post, "mins before game start didn't match")
         self.assertEqual(expected_mins_after_game_end_to_update_post, environment_util.minutes_after_game_end_to_update_post, "mins after game end didn't match")
+        self.assertEqual(expected_max_concurrent_nhl_api_requests, environment_util.max_concurrent_nhl_api_requests, "max concurrent nhl api requests didn't match")
+        self.assertEqual(expected_schedule_cache_ttl_minutes, environment_util.schedule_cache_ttl_minutes, "schedule cache ttl minutes didn't match")
+        self.assertEqual(expected_db_pragma_profile, environment_util.db_pragma_profile, "db pragma profile didn't match")
 
     def test_cast_int_with_default(self):
         provided = '1'
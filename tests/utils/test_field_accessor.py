@@ -0,0 +1,51 @@
+import unittest
+
+import pydash
+
+from src.utils.field_accessor import compile_path
+
+
+class TestFieldAccessor(unittest.TestCase):
+
+    def test_path(self):
+        self.assertEqual("summary.linescore.byPeriod", compile_path("summary", "linescore", "byPeriod").path)
+
+    def test_no_keys(self):
+        self.assertRaises(ValueError, compile_path)
+
+    def test_matches_pydash_get(self):
+        obj = {
+            "id": 1,
+            "clock": {"timeRemaining": "12:34", "inIntermission": False},
+            "summary": {"linescore": {"totals": {"home": 3, "away": None}}},
+            "teamAbbrev": "SJS",
+            "list": [1, 2],
+        }
+        paths = [
+            ("id",),
+            ("missing",),
+            ("clock", "timeRemaining"),
+            ("clock", "inIntermission"),
+            ("clock", "missing"),
+            ("missing", "timeRemaining"),
+            ("summary", "linescore", "totals", "home"),
+            ("summary", "linescore", "totals", "away"),
+            ("summary", "linescore", "missing", "home"),
+            ("teamAbbrev", "default"),
+            ("list", "home"),
+        ]
+        for keys in paths:
+            with self.subTest(keys=keys):
+                self.assertEqual(pydash.get(obj, ".".join(keys), "default"), compile_path(*keys)(obj, "default"))
+
+    def test_non_dict_object(self):
+        self.assertEqual(0, compile_path("home")(None, 0))
+        self.assertEqual(0, compile_path("home")([], 0))
+        self.assertEqual(0, compile_path("home", "away")("string", 0))
+
+    def test_default_is_none(self):
+        self.assertIsNone(compile_path("home")({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import dataclasses
+import json
+import unittest
+
+import tests.test_constants as test_constants
+from src.datatypes.game_events import GameFinalized, GoalAdded, PenaltyAdded, PeriodChanged, ScoreChanged
+from src.datatypes.game_info import GameInfo
+from src.datatypes.goal import Goal
+from src.utils import nhl_api_client
+from src.utils.game_diff import GameDiffer, diff_games
+
+LANDING_IN_PROGRESS = f"{test_constants.TEST_RES_PATH}/2023020574_landing_in_progress.json"
+LANDING_INTERMISSION = f"{test_constants.TEST_RES_PATH}/2023020574_landing_intermission.json"
+
+
+def _parse(fixture: str):
+    with open(fixture, "r") as file:
+        return nhl_api_client.parse_game(json.load(file))
+
+
+class TestDiffGames(unittest.TestCase):
+
+    def setUp(self):
+        self.in_progress = _parse(LANDING_IN_PROGRESS)
+        self.intermission = _parse(LANDING_INTERMISSION)
+
+    def test_same_game(self):
+        self.assertEqual([], diff_games(self.in_progress, self.in_progress))
+
+    def test_penalties_added(self):
+        events = diff_games(self.in_progress, self.intermission)
+        self.assertEqual([PenaltyAdded(self.in_progress.id, penalty) for penalty in self.intermission.penalties[-3:]], events)
+
+    def test_penalties_at_the_same_time(self):
+        # Two of the new penalties are at 10:50 of the 1st. Only the one that is new again is added.
+        old = dataclasses.replace(self.intermission, penalties=self.intermission.penalties[:-2])
+        events = diff_games(old, self.intermission)
+        self.assertEqual([PenaltyAdded(old.id, self.intermission.penalties[-2]), PenaltyAdded(old.id, self.intermission.penalties[-1])], events)
+
+    def test_goal_added_and_score_changed(self):
+        team = self.in_progress.home_team
+        goal = Goal(period="2nd", time="01:00", team=team, strength="Even Strength", description="A goal")
+        home_team_stats = dataclasses.replace(self.in_progress.home_team_stats, goals=self.in_progress.home_team_stats.goals + 1)
+        new = dataclasses.replace(self.in_progress, goals=self.in_progress.goals + (goal,), home_team_stats=home_team_stats,
+                                  game_info=GameInfo(current_period="2nd", game_clock="19:00"))
+
+        events = diff_games(self.in_progress, new)
+
+        self.assertEqual([
+            PeriodChanged(new.id, "1st", "2nd"),
+            GoalAdded(new.id, goal),
+            ScoreChanged(new.id, new.away_team_stats.goals, new.home_team_stats.goals),
+        ], events)
+
+    def test_corrected_goal_is_not_added(self):
+        goals = tuple(dataclasses.replace(goal, description=f"{goal.description} (corrected)") for goal in self.in_progress.goals)
+        self.assertEqual([], diff_games(self.in_progress, dataclasses.replace(self.in_progress, goals=goals)))
+
+    def test_game_finalized(self):
+        new = dataclasses.replace(self.in_progress, game_info=GameInfo(current_period="1st", game_clock="FINAL"))
+        self.assertEqual([GameFinalized(new.id)], diff_games(self.in_progress, new))
+        self.assertEqual([], diff_games(new, new))
+
+    def test_scheduled_game(self):
+        scheduled = dataclasses.replace(self.in_progress, away_team_stats=None, home_team_stats=None, goals=None, penalties=None,
+                                        game_info=GameInfo(current_period="1st", game_clock="--"))
+        self.assertEqual([GoalAdded(self.in_progress.id, goal) for goal in self.in_progress.goals]
+                         + [PenaltyAdded(self.in_progress.id, penalty) for penalty in self.in_progress.penalties]
+                         + [ScoreChanged(self.in_progress.id, self.in_progress.away_team_stats.goals, self.in_progress.home_team_stats.goals)],
+                         diff_games(scheduled, self.in_progress))
+
+
+class TestGameDiffer(unittest.TestCase):
+
+    def setUp(self):
+        self.differ = GameDiffer(max_snapshots=2)
+        self.in_progress = _parse(LANDING_IN_PROGRESS)
+        self.intermission = _parse(LANDING_INTERMISSION)
+
+    def test_first_snapshot(self):
+        self.assertEqual([], self.differ.diff(self.in_progress))
+
+    def test_unchanged_game(self):
+        self.differ.diff(self.in_progress)
+        self.assertIsNone(self.differ.diff(_parse(LANDING_IN_PROGRESS)))
+
+    def test_changed_game(self):
+        self.differ.diff(self.in_progress)
+        self.assertEqual(3, len(self.differ.diff(self.intermission)))
+        self.assertIsNone(self.differ.diff(self.intermission))
+
+    def test_clock_only_change(self):
+        self.differ.diff(self.in_progress)
+        self.assertEqual([], self.differ.diff(dataclasses.replace(self.in_progress, game_info=GameInfo(current_period="1st", game_clock="09:30"))))
+
+    def test_forget(self):
+        self.differ.diff(self.in_progress)
+        self.differ.forget(self.in_progress.id)
+        self.assertEqual([], self.differ.diff(self.in_progress))
+
+    def test_evicts_oldest_snapshot(self):
+        self.differ.diff(self.in_progress)
+        self.differ.diff(dataclasses.replace(self.in_progress, id=1))
+        self.differ.diff(dataclasses.replace(self.in_progress, id=2))
+        self.assertEqual([], self.differ.diff(self.in_progress))
+        self.assertIsNone(self.differ.diff(dataclasses.replace(self.in_progress, id=2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from src.utils.http_cache import HttpCache
+
+
+class TestHttpCache(unittest.TestCase):
+
+    def test_put_and_get(self):
+        cache = HttpCache()
+        body = {"id": 1}
+        cache.put("url", '"etag"', "Wed, 21 Oct 2015 07:28:00 GMT", body)
+        entry = cache.get("url")
+        self.assertIs(body, entry.body)
+        self.assertEqual({"If-None-Match": '"etag"', "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}, HttpCache.get_conditional_headers(entry))
+
+    def test_put_without_validators_is_not_stored(self):
+        cache = HttpCache()
+        cache.put("url", '"etag"', None, {"id": 1})
+        cache.put("url", None, None, {"id": 2})
+        self.assertIsNone(cache.get("url"))
+        self.assertEqual({}, HttpCache.get_conditional_headers(None))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = HttpCache(max_entries=2)
+        cache.put("a", '"a"', None, {})
+        cache.put("b", '"b"', None, {})
+        cache.get("a")
+        cache.put("c", '"c"', None, {})
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_invalidate(self):
+        cache = HttpCache()
+        cache.put("a", '"a"', None, {})
+        cache.put("b", '"b"', None, {})
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+        cache.invalidate()
+        self.assertEqual(0, cache.get_stats()["entries"])
+
+    def test_stats(self):
+        cache = HttpCache()
+        cache.record_hit()
+        cache.record_hit()
+        cache.record_miss()
+        self.assertEqual({"hits": 2, "misses": 1, "entries": 0}, cache.get_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,30 @@
+import base64
+import json
+import os
 import random
 import sys
+import threading
 import unittest
 import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import tests.test_constants as test_constants
 from src.db.comments.comments_dao import CommentsDao
+from src.db.content_hashes.content_hashes_dao import ContentHashesDao, TARGET_TYPE_COMMENT, TARGET_TYPE_POST
 from src.db.daily_threads.daily_threads_dao import DailyThreadsDao
 from src.db.daily_threads.daily_threads_record import DailyThreadsRecord
 from src.db.db_manager import DbManager
 from src.db.game_day_threads.game_day_threads_dao import GameDayThreadsDao
+from src.db.lemmy_sessions.lemmy_sessions_dao import LemmySessionsDao
 from src.utils import datetime_util
 from src.utils.environment_util import EnvironmentUtil
-from src.utils.lemmy_client import LemmyClient
+from src.utils.lemmy_client import LemmyClient, get_jwt_expiry, is_transient_error, LEMMY_SESSION_TTL, REQUEST_TIMEOUT
+from src.utils.rate_limiter import BUCKET_COMMENT, BUCKET_FEATURE, BUCKET_POST, RateLimiter, RetryPolicy
 import pydash
+import requests
+from tests.fake_clock import FakeClock
+from tests.fake_lemmy_server import FakeLemmyServer, BAD_GATEWAY, NOT_FOUND, RATE_LIMITED
 
 # This is a dummy post on lemmy.world that is safe to spam comments to
 TEST_POST_URL = "https://lemmy.world/post/14305925"
@@ -32,9 +44,12 @@ class TestLemmyClient(unittest.TestCase):
         self.game_day_threads_dao = GameDayThreadsDao(self.db_manager)
         self.daily_threads_dao = DailyThreadsDao(self.db_manager)
         self.comments_dao = CommentsDao(self.db_manager)
+        self.content_hashes_dao = ContentHashesDao(self.db_manager)
+        self.lemmy_sessions_dao = LemmySessionsDao(self.db_manager)
         TestLemmyClient.lemmy_client = LemmyClient(environment_util.lemmy_instance, environment_util.bot_name,
                                         environment_util.password, environment_util.community_name,
-                                        self.game_day_threads_dao, self.daily_threads_dao, self.comments_dao)
+                                        self.game_day_threads_dao, self.daily_threads_dao, self.comments_dao,
+                                        self.content_hashes_dao, self.lemmy_sessions_dao)
 
     def test_create_comment(self):
         # This test actually creates a comment on a lemmy instance.
@@ -86,5 +101,354 @@ class TestLemmyClient(unittest.TestCase):
             cls.lemmy_client.delete_post(cls.result_daily_thread.post_id)
 
 
+class TestLemmyClientSkipsUnchangedEdits(unittest.TestCase):
+
+    def setUp(self) -> None:
+        db_manager = DbManager(test_constants.TEST_DB_PATH)
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            mock_lemmy.return_value.discover_community.return_value = 1
+            mock_lemmy.return_value._requestor._auth.token = "jwt"
+            mock_lemmy.return_value.post.create.return_value = {"post_view": {"post": {"id": random.randint(0, sys.maxsize)}}}
+            mock_lemmy.return_value.comment.create.return_value = {"comment_view": {"comment": {"id": random.randint(0, sys.maxsize)}}}
+            self.lemmy_client = LemmyClient("https://lemmy.example", "bot_name", "password", "community_name",
+                                            GameDayThreadsDao(db_manager), DailyThreadsDao(db_manager), CommentsDao(db_manager), ContentHashesDao(db_manager),
+                                            LemmySessionsDao(db_manager))
+            self.lemmy_client.log_in()
+
+    def test_update_game_day_thread(self):
+        game_id = random.randint(0, sys.maxsize)
+        post_id = self.lemmy_client.create_game_day_thread("title", "body", game_id)
+        self.assertFalse(self.lemmy_client.update_game_day_thread("title", "body", post_id))
+        self.assertTrue(self.lemmy_client.update_game_day_thread("title", "new body", post_id))
+        self.assertTrue(self.lemmy_client.update_game_day_thread("new title", "new body", post_id))
+        self.assertFalse(self.lemmy_client.update_game_day_thread("new title", "new body", post_id))
+        self.assertEqual(2, self.lemmy_client.lemmy.post.edit.call_count)
+        edit_stats = self.lemmy_client.pop_edit_stats()
+        self.assertEqual(2, edit_stats.sent)
+        self.assertEqual(2, edit_stats.skipped)
+        self.assertEqual(0, self.lemmy_client.pop_edit_stats().sent)
+
+    def test_pop_edit_stats_from_other_thread(self):
+        game_id = random.randint(0, sys.maxsize)
+        comment = self.lemmy_client.create_comment(1, game_id, "content")
+        edits = 200
+
+        def update_comments():
+            for _ in range(edits):
+                self.lemmy_client.update_comment(comment.comment_id, "content")
+
+        thread = threading.Thread(target=update_comments)
+        thread.start()
+        skipped = 0
+        while thread.is_alive():
+            skipped += self.lemmy_client.pop_edit_stats().skipped
+        thread.join()
+        skipped += self.lemmy_client.pop_edit_stats().skipped
+        self.assertEqual(edits, skipped)
+
+    def test_update_comment(self):
+        game_id = random.randint(0, sys.maxsize)
+        comment = self.lemmy_client.create_comment(1, game_id, "content")
+        self.assertFalse(self.lemmy_client.update_comment(comment.comment_id, "content"))
+        self.assertTrue(self.lemmy_client.update_comment(comment.comment_id, "new content"))
+        self.lemmy_client.lemmy.comment.edit.assert_called_once_with(comment_id=comment.comment_id, content="new content")
+
+    def test_is_content_sent(self):
+        game_id = random.randint(0, sys.maxsize)
+        comment = self.lemmy_client.create_comment(1, game_id, "content")
+        self.assertTrue(self.lemmy_client.is_content_sent(TARGET_TYPE_COMMENT, comment.comment_id, "content"))
+        self.assertFalse(self.lemmy_client.is_content_sent(TARGET_TYPE_COMMENT, comment.comment_id, "new content"))
+        self.lemmy_client.lemmy.comment.edit.return_value = None
+        self.assertFalse(self.lemmy_client.update_comment(comment.comment_id, "new content"))
+        self.assertFalse(self.lemmy_client.is_content_sent(TARGET_TYPE_COMMENT, comment.comment_id, "new content"))
+        self.assertFalse(self.lemmy_client.is_content_sent(TARGET_TYPE_POST, random.randint(0, sys.maxsize), "body"))
+
+
+class TestLemmyClientLogIn(unittest.TestCase):
+
+    def setUp(self) -> None:
+        if os.path.exists(test_constants.TEST_DB_PATH):
+            os.remove(test_constants.TEST_DB_PATH)
+        db_manager = DbManager(test_constants.TEST_DB_PATH)
+        self.content_hashes_dao = ContentHashesDao(db_manager)
+        self.lemmy_sessions_dao = LemmySessionsDao(db_manager)
+
+    def _create_lemmy_client(self) -> LemmyClient:
+        return LemmyClient("https://lemmy.example", "bot_name", "password", "community_name",
+                           client_content_hashes_dao=self.content_hashes_dao, client_lemmy_sessions_dao=self.lemmy_sessions_dao)
+
+    @staticmethod
+    def _set_up_mock_lemmy(mock_lemmy, token: str = "jwt"):
+        mock_lemmy.return_value.discover_community.return_value = 1
+        mock_lemmy.return_value._requestor._auth.token = token
+
+    def test_log_in_on_first_use(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            lemmy_client = self._create_lemmy_client()
+            mock_lemmy.assert_not_called()
+            self.assertEqual(1, lemmy_client.community_id)
+            lemmy_client.delete_post(1)
+            mock_lemmy.assert_called_once()
+            mock_lemmy.return_value.log_in.assert_called_once_with("bot_name", "password")
+
+    def test_community_not_found(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            mock_lemmy.return_value.discover_community.return_value = None
+            with self.assertRaises(ValueError):
+                self._create_lemmy_client().log_in()
+
+    def test_log_in_failed(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            mock_lemmy.return_value.log_in.return_value = False
+            with self.assertRaises(ValueError):
+                self._create_lemmy_client().log_in()
+
+    def test_log_in_raised(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            mock_lemmy.return_value.log_in.side_effect = Exception('{"error":"incorrect_login"}')
+            with self.assertRaises(ValueError):
+                self._create_lemmy_client().log_in()
+
+    def test_community_lookup_raised(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            mock_lemmy.return_value.discover_community.side_effect = Exception('{"error":"couldnt_find_community"}')
+            with self.assertRaises(ValueError):
+                self._create_lemmy_client().log_in()
+
+    def test_raises_on_failed_requests(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            self._create_lemmy_client().log_in()
+            mock_lemmy.assert_called_once_with("https://lemmy.example", raise_exceptions=True, request_timeout=REQUEST_TIMEOUT)
+
+    def test_reuses_stored_session(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            self._create_lemmy_client().log_in()
+            mock_lemmy.reset_mock()
+            lemmy_client = self._create_lemmy_client()
+            lemmy_client.log_in()
+            mock_lemmy.return_value.log_in.assert_not_called()
+            mock_lemmy.return_value.discover_community.assert_not_called()
+            mock_lemmy.return_value._requestor._auth.set_token.assert_called_once_with("jwt")
+            self.assertEqual(1, lemmy_client.community_id)
+
+    def test_expired_session(self):
+        expires_at = datetime_util.get_current_time_as_utc() - timedelta(minutes=1)
+        self.lemmy_sessions_dao.upsert_lemmy_session("https://lemmy.example", "bot_name", "community_name", "old_jwt", 1, expires_at.isoformat())
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy, "new_jwt")
+            self._create_lemmy_client().log_in()
+            mock_lemmy.return_value.log_in.assert_called_once_with("bot_name", "password")
+        self.assertEqual("new_jwt", self.lemmy_sessions_dao.get_lemmy_session("https://lemmy.example", "bot_name", "community_name").jwt)
+
+    def test_logs_in_again_when_token_rejected(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            lemmy_client = self._create_lemmy_client()
+            lemmy_client.log_in()
+            mock_lemmy.return_value.post.delete.side_effect = [Exception('Error encountered while Request.POST on endpoint /post/delete: {"error":"not_logged_in"}'), {"post_view": {}}]
+            self.assertEqual({"post_view": {}}, lemmy_client.delete_post(1))
+            self.assertEqual(2, mock_lemmy.return_value.log_in.call_count)
+            self.assertEqual(2, mock_lemmy.return_value.post.delete.call_count)
+
+    def test_failed_login_again_doesnt_raise(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            lemmy_client = self._create_lemmy_client()
+            lemmy_client.log_in()
+            mock_lemmy.return_value.post.delete.side_effect = Exception('Error encountered while Request.POST on endpoint /post/delete: {"error":"not_logged_in"}')
+            mock_lemmy.side_effect = requests.ConnectionError()
+            self.assertIsNone(lemmy_client.delete_post(1))
+            self.assertEqual(1, mock_lemmy.return_value.post.delete.call_count)
+
+    def test_connection_failed(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            mock_lemmy.side_effect = requests.ConnectionError()
+            with self.assertRaises(ValueError):
+                self._create_lemmy_client().log_in()
+
+    def test_other_errors_dont_log_in_again(self):
+        with patch("src.utils.lemmy_client.Lemmy") as mock_lemmy:
+            self._set_up_mock_lemmy(mock_lemmy)
+            lemmy_client = self._create_lemmy_client()
+            lemmy_client.log_in()
+            mock_lemmy.return_value.post.delete.side_effect = Exception('Error encountered while Request.POST on endpoint /post/delete: {"error":"couldnt_find_post"}')
+            self.assertIsNone(lemmy_client.delete_post(1))
+            mock_lemmy.return_value.log_in.assert_called_once()
+
+
+class TestLemmyClientAgainstFakeServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        if os.path.exists(test_constants.TEST_DB_PATH):
+            os.remove(test_constants.TEST_DB_PATH)
+        self.db_manager = DbManager(test_constants.TEST_DB_PATH)
+        self.server = FakeLemmyServer()
+        self.server.start()
+        self.clock = FakeClock()
+        self.lemmy_client = self._create_lemmy_client(self.db_manager, RateLimiter(clock=self.clock.time, sleep=self.clock.sleep))
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _create_lemmy_client(self, db_manager: DbManager, rate_limiter: RateLimiter) -> LemmyClient:
+        return LemmyClient(self.server.url, "bot_name", "password", "community_name",
+                           GameDayThreadsDao(db_manager), DailyThreadsDao(db_manager), CommentsDao(db_manager), ContentHashesDao(db_manager),
+                           LemmySessionsDao(db_manager), rate_limiter, RetryPolicy(max_attempts=4, rng=random.Random(0)))
+
+    def test_retries_rate_limited_create(self):
+        self.server.failures[("POST", "/post")] = [RATE_LIMITED, RATE_LIMITED]
+        self.assertNotEqual(-1, self.lemmy_client.create_game_day_thread("title", "body", 1))
+        self.assertEqual(3, self.server.count("POST", "/post"))
+        request_stats = self.lemmy_client.pop_request_stats()
+        self.assertEqual(2, request_stats.retried)
+        self.assertEqual(2, len(self.clock.sleeps))
+        self.assertEqual(0, self.lemmy_client.pop_request_stats().retried)
+
+    def test_doesnt_retry_create_on_server_error(self):
+        # The post may have been created before the proxy gave up on Lemmy
+        self.server.failures[("POST", "/post")] = [BAD_GATEWAY]
+        self.assertEqual(-1, self.lemmy_client.create_game_day_thread("title", "body", 1))
+        self.assertEqual(1, self.server.count("POST", "/post"))
+
+    def test_failed_create_comment_isnt_stored(self):
+        self.server.failures[("POST", "/comment")] = [BAD_GATEWAY, BAD_GATEWAY]
+        self.assertIsNone(self.lemmy_client.create_comment(1, 1, "content"))
+        self.assertIsNone(self.lemmy_client.create_comment(1, 2, "content"))
+        self.assertIsNone(CommentsDao(self.db_manager).get_comment(1))
+        self.assertIsNone(CommentsDao(self.db_manager).get_comment(2))
+        self.assertIsNone(ContentHashesDao(self.db_manager).get_content_hashes(TARGET_TYPE_COMMENT, -1))
+
+    def test_retries_edit_on_server_error(self):
+        post_id = self.lemmy_client.create_game_day_thread("title", "body", 1)
+        self.server.failures[("PUT", "/post")] = [BAD_GATEWAY]
+        self.assertTrue(self.lemmy_client.update_game_day_thread("title", "new body", post_id))
+        self.assertEqual(2, self.server.count("PUT", "/post"))
+        self.assertEqual(1, self.lemmy_client.pop_request_stats().retried)
+
+    def test_gives_up_after_max_attempts(self):
+        comment = self.lemmy_client.create_comment(1, 1, "content")
+        self.server.failures[("PUT", "/comment")] = [BAD_GATEWAY] * 4
+        self.assertFalse(self.lemmy_client.update_comment(comment.comment_id, "new content"))
+        self.assertEqual(4, self.server.count("PUT", "/comment"))
+        request_stats = self.lemmy_client.pop_request_stats()
+        self.assertEqual(3, request_stats.retried)
+        self.assertEqual(1, request_stats.gave_up)
+        # The failed edit isn't remembered as sent
+        self.assertTrue(self.lemmy_client.update_comment(comment.comment_id, "new content"))
+        self.assertEqual(5, self.server.count("PUT", "/comment"))
+
+    def test_retry_budget(self):
+        clock = FakeClock()
+        lemmy_client = self._create_lemmy_client(self.db_manager,
+                                                  RateLimiter(retry_budget=1, retry_budget_per_second=0.0001, clock=clock.time, sleep=clock.sleep))
+        self.server.failures[("POST", "/post/delete")] = [BAD_GATEWAY]
+        self.assertIsNotNone(lemmy_client.delete_post(1))
+        self.server.failures[("POST", "/post/delete")] = [BAD_GATEWAY]
+        self.assertIsNone(lemmy_client.delete_post(2))
+        self.assertEqual(3, self.server.count("POST", "/post/delete"))
+        request_stats = lemmy_client.pop_request_stats()
+        self.assertEqual(1, request_stats.retried)
+        self.assertEqual(1, request_stats.retry_budget_exhausted)
+
+    def test_doesnt_retry_other_errors(self):
+        self.server.failures[("POST", "/post/delete")] = [NOT_FOUND]
+        self.assertIsNone(self.lemmy_client.delete_post(1))
+        self.assertEqual(1, self.server.count("POST", "/post/delete"))
+        self.assertEqual(0, self.lemmy_client.pop_request_stats().retried)
+
+    def test_throttles_by_bucket(self):
+        clock = FakeClock()
+        buckets = {BUCKET_POST: (2, 1.0), BUCKET_COMMENT: (2, 1.0), BUCKET_FEATURE: (1, 0.5)}
+        lemmy_client = self._create_lemmy_client(self.db_manager,
+                                                  RateLimiter(buckets, clock=clock.time, sleep=clock.sleep))
+        for post_id in range(4):
+            lemmy_client.delete_post(post_id)
+        self.assertAlmostEqual(2, clock.now)
+        lemmy_client.delete_comment(1)
+        lemmy_client.delete_comment(2)
+        lemmy_client.feature_daily_thread(1)
+        self.assertAlmostEqual(2, clock.now)
+        lemmy_client.unfeature_daily_thread(1)
+        self.assertAlmostEqual(4, clock.now)
+        request_stats = lemmy_client.pop_request_stats()
+        self.assertEqual(3, request_stats.throttled)
+        self.assertAlmostEqual(4, request_stats.throttled_seconds)
+        self.assertEqual(4, self.server.count("POST", "/post/delete"))
+        self.assertEqual(2, self.server.count("POST", "/post/feature"))
+
+    def test_pop_request_stats_from_other_thread(self):
+        clock = FakeClock()
+        buckets = {BUCKET_POST: (1, 1.0), BUCKET_COMMENT: (1, 1.0), BUCKET_FEATURE: (1, 1.0)}
+        lemmy_client = self._create_lemmy_client(self.db_manager,
+                                                  RateLimiter(buckets, clock=clock.time, sleep=clock.sleep))
+        lemmy_client.log_in()
+        requests_count = 50
+
+        def delete_posts():
+            for post_id in range(requests_count):
+                lemmy_client.delete_post(post_id)
+
+        thread = threading.Thread(target=delete_posts)
+        thread.start()
+        throttled = 0
+        while thread.is_alive():
+            throttled += lemmy_client.pop_request_stats().throttled
+        thread.join()
+        throttled += lemmy_client.pop_request_stats().throttled
+        self.assertEqual(requests_count - 1, throttled)
+
+    def test_retries_when_connection_fails(self):
+        self.lemmy_client.log_in()
+        self.server.stop()
+        self.assertIsNone(self.lemmy_client.delete_post(1))
+        request_stats = self.lemmy_client.pop_request_stats()
+        self.assertEqual(3, request_stats.retried)
+        self.assertEqual(1, request_stats.gave_up)
+
+
+class TestIsTransientError(unittest.TestCase):
+
+    def test_transient_errors(self):
+        self.assertTrue(is_transient_error(Exception('Error encountered while Request.POST on endpoint /post: {"error":"rate_limit_error"}')))
+        self.assertTrue(is_transient_error(Exception("Error encountered while Request.PUT on endpoint /post: <html><head><title>503 Service Temporarily Unavailable</title>")))
+        self.assertTrue(is_transient_error(requests.ConnectionError()))
+        self.assertTrue(is_transient_error(requests.Timeout()))
+
+    def test_other_errors(self):
+        self.assertFalse(is_transient_error(Exception('Error encountered while Request.POST on endpoint /post/delete: {"error":"couldnt_find_post"}')))
+        self.assertFalse(is_transient_error(Exception('Error encountered while Request.POST on endpoint /post: {"error":"not_logged_in"}')))
+        self.assertFalse(is_transient_error(ValueError("post 5021 not found")))
+
+    def test_json_server_errors_arent_transient(self):
+        # The status code of Lemmy's own 5xx errors isn't in the exception, and the body is the same as for a 4xx error
+        self.assertFalse(is_transient_error(Exception('Error encountered while Request.PUT on endpoint /post: {"error":"unknown","message":"database error"}')))
+
+
+class TestGetJwtExpiry(unittest.TestCase):
+    NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    @staticmethod
+    def _jwt(claims: dict) -> str:
+        payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+        return f"header.{payload}.signature"
+
+    def test_no_exp(self):
+        self.assertEqual(self.NOW + LEMMY_SESSION_TTL, get_jwt_expiry(self._jwt({"sub": 1, "iat": 0}), self.NOW))
+
+    def test_exp_sooner_than_ttl(self):
+        exp = self.NOW + timedelta(hours=1)
+        self.assertEqual(exp, get_jwt_expiry(self._jwt({"sub": 1, "exp": int(exp.timestamp())}), self.NOW))
+
+    def test_not_a_jwt(self):
+        self.assertEqual(self.NOW + LEMMY_SESSION_TTL, get_jwt_expiry("not a jwt", self.NOW))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,111 @@
+import random
+import sqlite3
+import sys
+import threading
+import unittest
+
+import tests.test_constants as test_constants
+from src.db.comments.comments_dao import CommentsDao
+from src.db.db_manager import DbManager
+from src.utils.lemmy_writer import LemmyWriter, PRIORITY_CREATE, PRIORITY_EDIT
+
+
+class TestLemmyWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.db_manager = DbManager(test_constants.TEST_DB_PATH)
+        self.comments_dao = CommentsDao(self.db_manager)
+        self.lemmy_writer = LemmyWriter(self.db_manager)
+        self.sent = []
+
+    @staticmethod
+    def _is_comment_committed(comment_id: int) -> bool:
+        # A second connection only sees committed rows
+        connection = sqlite3.connect(test_constants.TEST_DB_PATH)
+        val = connection.execute("SELECT * FROM comments WHERE comment_id=?", (comment_id,)).fetchone()
+        connection.close()
+        return val is not None
+
+    def _write(self, value):
+        return lambda: self.sent.append(value)
+
+    def test_coalesces_writes_to_the_same_target(self):
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, self._write("post 1 body 1"))
+        self.lemmy_writer.submit(("post", 2), PRIORITY_EDIT, self._write("post 2 body 1"))
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, self._write("post 1 body 2"))
+        self.assertEqual(2, self.lemmy_writer.get_pending_count())
+
+        self.assertEqual(2, self.lemmy_writer.run_pending())
+
+        # The latest write of post 1 keeps the place of the first one
+        self.assertEqual(["post 1 body 2", "post 2 body 1"], self.sent)
+        stats = self.lemmy_writer.pop_stats()
+        self.assertEqual(3, stats.submitted)
+        self.assertEqual(1, stats.coalesced)
+        self.assertEqual(2, stats.sent)
+
+    def test_creates_before_edits(self):
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, self._write("edit"))
+        self.lemmy_writer.submit(("game_day_thread", 2), PRIORITY_CREATE, self._write("create"))
+        self.lemmy_writer.run_pending()
+        self.assertEqual(["create", "edit"], self.sent)
+
+    def test_failed_write_doesnt_stop_the_others(self):
+        def fail():
+            raise ValueError()
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, fail)
+        self.lemmy_writer.submit(("post", 2), PRIORITY_EDIT, self._write("post 2"))
+        self.lemmy_writer.run_pending()
+        self.assertEqual(["post 2"], self.sent)
+        stats = self.lemmy_writer.pop_stats()
+        self.assertEqual(1, stats.failed)
+        self.assertEqual(1, stats.sent)
+
+    def test_drops_writes_after_stop(self):
+        self.lemmy_writer.stop()
+        self.assertFalse(self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, self._write("post 1")))
+        self.assertEqual(0, self.lemmy_writer.get_pending_count())
+
+    def test_thread_sends_writes_and_drains(self):
+        released = threading.Event()
+        self.lemmy_writer.start()
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, lambda: (released.wait(5), self.sent.append("post 1")))
+        self.lemmy_writer.submit(("post", 2), PRIORITY_EDIT, self._write("post 2"))
+        released.set()
+        self.assertTrue(self.lemmy_writer.drain(5))
+        self.assertEqual(["post 1", "post 2"], self.sent)
+        self.assertFalse(self.lemmy_writer.thread.is_alive())
+
+    def test_drain_without_thread(self):
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, self._write("post 1"))
+        self.assertTrue(self.lemmy_writer.drain())
+        self.assertEqual(["post 1"], self.sent)
+
+    def test_create_is_committed_before_the_next_write(self):
+        comment_id = random.randint(0, sys.maxsize)
+        self.lemmy_writer.submit(("game_comment", 1), PRIORITY_CREATE, lambda: self.comments_dao.insert_comment(comment_id, 1))
+        self.lemmy_writer.submit(("game_comment", 2), PRIORITY_CREATE, lambda: self.sent.append(self._is_comment_committed(comment_id)))
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, lambda: self.sent.append(self._is_comment_committed(comment_id)))
+        self.lemmy_writer.run_pending()
+        self.assertEqual([True, True], self.sent)
+
+    def test_drain_timeout_commits_the_writes_so_far(self):
+        comment_id = random.randint(0, sys.maxsize)
+        released = threading.Event()
+
+        def insert_and_wait():
+            self.comments_dao.insert_comment(comment_id, 1)
+            released.wait(5)
+
+        self.lemmy_writer.start()
+        self.lemmy_writer.submit(("post", 1), PRIORITY_EDIT, insert_and_wait)
+        try:
+            self.assertFalse(self.lemmy_writer.drain(0.2))
+            self.assertTrue(self._is_comment_committed(comment_id))
+        finally:
+            released.set()
+            self.lemmy_writer.thread.join(5)
+
+
+if __name__ == '__main__':
+    unittest.main()
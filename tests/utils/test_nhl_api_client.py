@@ -1,6 +1,8 @@
 import datetime
 import json
+import time
 import unittest
+from unittest.mock import MagicMock
 
 import requests
 from dateutil.tz import tzutc
@@ -15,6 +17,9 @@ from src.datatypes.shootout import Shootout
 from src.datatypes.team_stats import TeamStats
 from src.datatypes.teams import Team
 from src.utils import nhl_api_client
+from src.utils.circuit_breaker import CircuitBreaker, CircuitState
+from src.utils.rate_limiter import RetryPolicy
+from tests.fake_clock import FakeClock
 
 LANDING_TEST_FILE_PATH = f"{test_constants.TEST_RES_PATH}/2022020158_landing.json"
 SCHEDULED_LANDING_TEST_FILE_PATH = f"{test_constants.TEST_RES_PATH}/2023020576_landing.json"
@@ -33,6 +38,15 @@ class TestNhlApiClient(unittest.TestCase):
         with open(LANDING_OT2, "r") as file:
             json_string = file.read()
             self.landing_ot2 = json.loads(json_string)
+        # Retry without waiting, and don't let the failures of one test open the circuit for the next
+        self.old_retry_policy = nhl_api_client.retry_policy
+        nhl_api_client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+        nhl_api_client.circuit_breaker.reset()
+        nhl_api_client.last_good_games.clear()
+
+    def tearDown(self):
+        nhl_api_client.retry_policy = self.old_retry_policy
+        nhl_api_client.circuit_breaker.reset()
 
     def test_parse_goals(self):
         expected = [Goal(period='1st', time='05:16', team=Team(id=24, abbreviation='ANA', city='Anaheim', name='Ducks', logo_url='https://lemmy.ca/pictrs/image/9efd8b21-3414-4e4f-8be3-559809ec133a.png'), strength='Even Strength', description='Adam Henrique (1) wrist shot, assists: Kevin Shattenkirk (3)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335809960112'), Goal(period='1st', time='06:18', team=Team(id=28, abbreviation='SJS', city='San Jose', name='Sharks', logo_url='https://lemmy.ca/pictrs/image/a278e5aa-6f6f-4cdb-a0dc-03630b03a3a9.png'), strength='Even Strength', description='Erik Karlsson (7) wrist shot, assists: Evgeny Svechnikov (3), Tomas Hertl (6)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335811710112'), Goal(period='1st', time='06:41', team=Team(id=28, abbreviation='SJS', city='San Jose', name='Sharks', logo_url='https://lemmy.ca/pictrs/image/a278e5aa-6f6f-4cdb-a0dc-03630b03a3a9.png'), strength='Even Strength', description='Erik Karlsson (8) slap shot, assists: Jaycob Megna (4), Nico Sturm (1)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335810655112'), Goal(period='1st', time='10:52', team=Team(id=24, abbreviation='ANA', city='Anaheim', name='Ducks', logo_url='https://lemmy.ca/pictrs/image/9efd8b21-3414-4e4f-8be3-559809ec133a.png'), strength='Even Strength', description='Frank Vatrano (4) wrist shot, assists: Isac Lundestrom (4), Jakob Silfverberg (1)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335810159112'), Goal(period='1st', time='19:45', team=Team(id=24, abbreviation='ANA', city='Anaheim', name='Ducks', logo_url='https://lemmy.ca/pictrs/image/9efd8b21-3414-4e4f-8be3-559809ec133a.png'), strength='Even Strength', description='Adam Henrique (2) backhand shot, assists: Trevor Zegras (2), Kevin Shattenkirk (4)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335808677112'), Goal(period='2nd', time='03:28', team=Team(id=28, abbreviation='SJS', city='San Jose', name='Sharks', logo_url='https://lemmy.ca/pictrs/image/a278e5aa-6f6f-4cdb-a0dc-03630b03a3a9.png'), strength='Power Play', description='Timo Meier (2) backhand shot, assists: Alexander Barabanov (4), Erik Karlsson (6)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335810650112'), Goal(period='2nd', time='15:10', team=Team(id=24, abbreviation='ANA', city='Anaheim', name='Ducks', logo_url='https://lemmy.ca/pictrs/image/9efd8b21-3414-4e4f-8be3-559809ec133a.png'), strength='Even Strength', description='Ryan Strome (2) deflected shot, assists: John Klingberg (3), Troy Terry (7)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335810252112'), Goal(period='2nd', time='15:31', team=Team(id=28, abbreviation='SJS', city='San Jose', name='Sharks', logo_url='https://lemmy.ca/pictrs/image/a278e5aa-6f6f-4cdb-a0dc-03630b03a3a9.png'), strength='Even Strength', description='Timo Meier (3)  shot, assists: None', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335810713112'), Goal(period='3rd', time='11:31', team=Team(id=24, abbreviation='ANA', city='Anaheim', name='Ducks', logo_url='https://lemmy.ca/pictrs/image/9efd8b21-3414-4e4f-8be3-559809ec133a.png'), strength='Even Strength', description='Max Comtois (2) wrist shot, assists: Troy Terry (8), Nathan Beaulieu (1)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335811310112'), Goal(period='3rd', time='17:48', team=Team(id=28, abbreviation='SJS', city='San Jose', name='Sharks', logo_url='https://lemmy.ca/pictrs/image/a278e5aa-6f6f-4cdb-a0dc-03630b03a3a9.png'), strength='Even Strength', description='Erik Karlsson (9) wrist shot, assists: Alexander Barabanov (5), Tomas Hertl (7)', video_url='https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId=6335810352112'), Goal(period='SO', time='00:00', team=Team(id=24, abbreviation='ANA', city='Anaheim', name='Ducks', logo_url='https://lemmy.ca/pictrs/image/9efd8b21-3414-4e4f-8be3-559809ec133a.png'), strength='Even Strength', description='Troy Terry (4) backhand shot, assists: None', video_url='')]
@@ -52,6 +66,26 @@ class TestNhlApiClient(unittest.TestCase):
         print(game)
         self.assertEqual(game, expected)
 
+    def test_get_period_ordinal(self):
+        self.assertEqual("1st", nhl_api_client.get_period_ordinal(1, "REG"))
+        self.assertEqual("2nd", nhl_api_client.get_period_ordinal(2, "REG"))
+        self.assertEqual("3rd", nhl_api_client.get_period_ordinal(3, "REG"))
+        self.assertEqual("OT", nhl_api_client.get_period_ordinal(4, "OT"))
+        self.assertEqual("OT2", nhl_api_client.get_period_ordinal(5, "OT", 2))
+        self.assertEqual("OT5", nhl_api_client.get_period_ordinal(8, "OT", 5))
+        self.assertEqual("SO", nhl_api_client.get_period_ordinal(5, "SO"))
+        self.assertEqual("", nhl_api_client.get_period_ordinal(4, "BAD"))
+
+    def test_get_period_ordinal_fallback(self):
+        self.assertEqual("4th", nhl_api_client.get_period_ordinal(4, "REG"))
+        self.assertEqual("11th", nhl_api_client.get_period_ordinal(11, "REG"))
+        self.assertEqual("12th", nhl_api_client.get_period_ordinal(12, "REG"))
+        self.assertEqual("13th", nhl_api_client.get_period_ordinal(13, "REG"))
+        self.assertEqual("21st", nhl_api_client.get_period_ordinal(21, "REG"))
+        self.assertEqual("22nd", nhl_api_client.get_period_ordinal(22, "REG"))
+        self.assertEqual("103rd", nhl_api_client.get_period_ordinal(103, "REG"))
+        self.assertEqual("111th", nhl_api_client.get_period_ordinal(111, "REG"))
+
     def test_parse_scheduled_game(self):
         expected = Game(id=2023020576, away_team=Team(id=15, abbreviation='WSH', city='Washington', name='Capitals', logo_url='https://lemmy.ca/pictrs/image/045d8587-6591-4ab6-8414-819cfcea5029.png'), home_team=Team(id=5, abbreviation='PIT', city='Pittsburgh', name='Penguins', logo_url='https://lemmy.ca/pictrs/image/3b955364-fc3a-4a6e-b2b1-2b3cd062b4c0.png'), start_time=datetime.datetime(2024, 1, 3, 0, 30, tzinfo=tzutc()), end_time=None, game_info=GameInfo(current_period='', game_clock='--'), away_team_stats=TeamStats(goals=0, shots=0, blocked=0, hits=0, fo_wins=0.0, giveaways=0, takeaways=0, pp_fraction='0/0', periods=[], shootout=Shootout(scores=0, attempts=0, has_been_played=False)), home_team_stats=TeamStats(goals=0, shots=0, blocked=0, hits=0, fo_wins=0.0, giveaways=0, takeaways=0, pp_fraction='0/0', periods=[], shootout=Shootout(scores=0, attempts=0, has_been_played=False)), goals=[], penalties=[])
         game = nhl_api_client.parse_game(self.scheduled_landing)
@@ -85,6 +119,288 @@ class TestNhlApiClient(unittest.TestCase):
         print(games)
         self.assertEqual(expected, games)
 
+    def test_get_games_concurrent_keeps_schedule_order(self):
+        # Save old values
+        old_get_landing = nhl_api_client.get_landing
+
+        # Set up
+        landings = {
+            2022020158: self.landing,
+            2023020576: self.scheduled_landing,
+            2023030144: self.landing_ot2,
+        }
+
+        def get_landing(game_id):
+            # Make the first game in the schedule finish last
+            time.sleep(0.1 if game_id == 2022020158 else 0)
+            return landings.get(game_id, {})
+
+        nhl_api_client.get_landing = get_landing
+        schedule = [Game(game_id, None, None, None, None, None, None, None, None, None) for game_id in [2022020158, 1234, 2023020576, 2023030144]]
+
+        # Execute
+        games = nhl_api_client.get_games(schedule, max_workers=4)
+
+        # Restore
+        nhl_api_client.get_landing = old_get_landing
+
+        # Verify
+        self.assertEqual([nhl_api_client.parse_game(self.landing), None, nhl_api_client.parse_game(self.scheduled_landing), nhl_api_client.parse_game(self.landing_ot2)], games)
+
+    def test_get_games_sequential_matches_concurrent(self):
+        # Save old values
+        old_get_landing = nhl_api_client.get_landing
+
+        # Set up
+        nhl_api_client.get_landing = MagicMock(side_effect=lambda game_id: self.landing if game_id == 2022020158 else {})
+        schedule = [Game(game_id, None, None, None, None, None, None, None, None, None) for game_id in [2022020158, 1234]]
+
+        # Execute
+        sequential = nhl_api_client.get_games(schedule, max_workers=1)
+        concurrent = nhl_api_client.get_games(schedule, max_workers=2)
+
+        # Restore
+        nhl_api_client.get_landing = old_get_landing
+
+        # Verify
+        self.assertEqual(sequential, concurrent)
+        self.assertIsNone(sequential[1])
+
+    def test_get_landing_uses_shared_session(self):
+        # Set up
+        fake_session = MagicMock()
+        fake_session.get.return_value = MagicMock(status_code=200, headers={}, text=json.dumps(self.landing))
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        nhl_api_client.landing_cache.invalidate()
+
+        # Execute
+        landing = nhl_api_client.get_landing(2022020158)
+
+        # Verify
+        fake_session.get.assert_called_once_with(nhl_api_client.get_landing_url(2022020158), timeout=nhl_api_client.REQUEST_TIMEOUT, headers={})
+        self.assertEqual(self.landing, landing)
+
+    def test_get_game_not_modified_reuses_parsed_game(self):
+        # Set up
+        full_response = MagicMock(status_code=200, headers={"ETag": '"abc"'}, text=json.dumps(self.landing))
+        not_modified_response = MagicMock(status_code=304, headers={"ETag": '"abc"'}, text="")
+        fake_session = MagicMock()
+        fake_session.get.side_effect = [full_response, not_modified_response]
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        old_parse_game = nhl_api_client.parse_game
+        nhl_api_client.parse_game = MagicMock(side_effect=old_parse_game)
+        nhl_api_client.landing_cache.invalidate()
+        old_stats = nhl_api_client.landing_cache.get_stats()
+
+        # Execute
+        first = nhl_api_client.get_game(2022020158)
+        second = nhl_api_client.get_game(2022020158)
+        stats = nhl_api_client.landing_cache.get_stats()
+        parse_game_call_count = nhl_api_client.parse_game.call_count
+
+        # Restore
+        nhl_api_client.parse_game = old_parse_game
+        nhl_api_client.landing_cache.invalidate()
+
+        # Verify
+        self.assertEqual(nhl_api_client.parse_game(self.landing), first)
+        self.assertIs(first, second)
+        self.assertEqual(1, parse_game_call_count)
+        self.assertEqual({}, fake_session.get.call_args_list[0].kwargs["headers"])
+        self.assertEqual({"If-None-Match": '"abc"'}, fake_session.get.call_args_list[1].kwargs["headers"])
+        self.assertEqual(old_stats["hits"] + 1, stats["hits"])
+        self.assertEqual(old_stats["misses"] + 1, stats["misses"])
+
+    def test_get_landing_timeout_returns_empty_dict(self):
+        # Set up
+        fake_session = MagicMock()
+        fake_session.get.side_effect = requests.exceptions.Timeout()
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+
+        # Execute
+        landing = nhl_api_client.get_landing(2022020158)
+
+        # Verify
+        self.assertEqual({}, landing)
+
+    def test_create_session(self):
+        session = nhl_api_client.create_session(pool_size=3)
+        adapter = session.get_adapter(nhl_api_client.NHL_API_BASE_URL)
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual(nhl_api_client.CONNECTION_KEEP_ALIVE, session.headers[nhl_api_client.HEADER_CONNECTION])
+        self.assertEqual(nhl_api_client.ACCEPT_ENCODING, session.headers[nhl_api_client.HEADER_ACCEPT_ENCODING])
+
+    def test_get_schedule_fills_whole_week_from_one_request(self):
+        # Set up
+        game_week = {"gameWeek": [
+            {"date": "2023-11-10", "games": [{"id": 2023020193, "awayTeam": {"id": 28}, "homeTeam": {"id": 3}, "startTimeUTC": "2023-11-11T00:00:00Z"}]},
+            {"date": "2023-11-11", "games": [{"id": 2023020200, "awayTeam": {"id": 25}, "homeTeam": {"id": 6}, "startTimeUTC": "2023-11-12T00:30:00Z"},
+                                             {"id": 2023020201, "awayTeam": {"id": 9999}, "homeTeam": {"id": 6}, "startTimeUTC": "2023-11-11T23:00:00Z"}]},
+            {"date": "2023-11-12", "games": []},
+        ]}
+        fake_session = MagicMock()
+        fake_session.get.return_value = MagicMock(status_code=200, headers={}, text=json.dumps(game_week))
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        nhl_api_client.get_schedule_cache().invalidate()
+
+        # Execute
+        first_day = nhl_api_client.get_schedule("2023-11-10")
+        second_day = nhl_api_client.get_schedule("2023-11-11")
+        third_day = nhl_api_client.get_schedule("2023-11-12")
+        request_count_before_invalidate = fake_session.get.call_count
+        nhl_api_client.get_schedule_cache().invalidate("2023-11-11")
+        nhl_api_client.get_schedule("2023-11-11")
+        request_count_after_invalidate = fake_session.get.call_count
+
+        # Restore
+        nhl_api_client.get_schedule_cache().invalidate()
+
+        # Verify
+        self.assertEqual([2023020193], [game.id for game in first_day])
+        # The game with an unknown team can't be parsed, so it is left out
+        self.assertEqual([2023020200], [game.id for game in second_day])
+        self.assertEqual([], third_day)
+        self.assertEqual(1, request_count_before_invalidate)
+        self.assertEqual(2, request_count_after_invalidate)
+
+    def test_get_schedule_reuses_parsed_games(self):
+        # Set up
+        game_week = {"gameWeek": [{"date": "2023-11-10", "games": [{"id": 2023020193, "awayTeam": {"id": 28}, "homeTeam": {"id": 3}, "startTimeUTC": "2023-11-11T00:00:00Z"}]}]}
+        fake_session = MagicMock()
+        fake_session.get.return_value = MagicMock(status_code=200, headers={}, text=json.dumps(game_week))
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        nhl_api_client.get_schedule_cache().invalidate()
+
+        # Execute
+        first = nhl_api_client.get_schedule("2023-11-10")
+        first.clear()
+        second = nhl_api_client.get_schedule("2023-11-10")
+        third = nhl_api_client.get_schedule("2023-11-10")
+
+        # Restore
+        nhl_api_client.get_schedule_cache().invalidate()
+
+        # Verify
+        self.assertEqual(1, len(second))
+        self.assertIs(second[0], third[0])
+        fake_session.get.assert_called_once()
+
+    def test_get_landing_retries_server_errors(self):
+        # Set up
+        fake_session = MagicMock()
+        fake_session.get.side_effect = [MagicMock(status_code=503, headers={}, text="<html>503 Service Unavailable</html>"),
+                                        MagicMock(status_code=200, headers={}, text="<html>Something went wrong</html>"),
+                                        MagicMock(status_code=200, headers={}, text=json.dumps(self.landing))]
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        nhl_api_client.landing_cache.invalidate()
+
+        # Execute
+        landing = nhl_api_client.get_landing(2022020158)
+
+        # Verify
+        self.assertEqual(self.landing, landing)
+        self.assertEqual(3, fake_session.get.call_count)
+        self.assertEqual(0, nhl_api_client.circuit_breaker.failures)
+
+    def test_get_landing_doesnt_retry_client_errors(self):
+        # Set up
+        fake_session = MagicMock()
+        fake_session.get.return_value = MagicMock(status_code=404, headers={}, text="<html>Not Found</html>")
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        nhl_api_client.landing_cache.invalidate()
+
+        # Execute
+        landing = nhl_api_client.get_landing(2022020158)
+
+        # Verify
+        self.assertEqual({}, landing)
+        fake_session.get.assert_called_once()
+        self.assertEqual(0, nhl_api_client.circuit_breaker.failures)
+
+    def test_circuit_opens_and_probes(self):
+        # Set up
+        clock = FakeClock()
+        fake_session = MagicMock()
+        fake_session.get.side_effect = requests.exceptions.ConnectionError()
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        old_circuit_breaker = nhl_api_client.circuit_breaker
+        nhl_api_client.circuit_breaker = CircuitBreaker("NHL API", 2, 60, clock.time)
+        nhl_api_client.landing_cache.invalidate()
+
+        # Execute
+        nhl_api_client.get_landing(2022020158)
+        nhl_api_client.get_landing(2022020158)
+        request_count_when_opened = fake_session.get.call_count
+        state_when_opened = nhl_api_client.circuit_breaker.state
+        landing_when_open = nhl_api_client.get_landing(2022020158)
+        request_count_when_open = fake_session.get.call_count
+        clock.now = 60
+        fake_session.get.side_effect = None
+        fake_session.get.return_value = MagicMock(status_code=200, headers={}, text=json.dumps(self.landing))
+        landing_after_probe = nhl_api_client.get_landing(2022020158)
+        request_count_after_probe = fake_session.get.call_count
+        state_after_probe = nhl_api_client.circuit_breaker.state
+
+        # Restore
+        nhl_api_client.circuit_breaker = old_circuit_breaker
+
+        # Verify
+        self.assertEqual(6, request_count_when_opened)
+        self.assertEqual(CircuitState.OPEN, state_when_opened)
+        self.assertEqual({}, landing_when_open)
+        self.assertEqual(6, request_count_when_open)
+        self.assertEqual(self.landing, landing_after_probe)
+        self.assertEqual(7, request_count_after_probe)
+        self.assertEqual(CircuitState.CLOSED, state_after_probe)
+
+    def test_get_game_falls_back_to_last_good_game(self):
+        # Set up
+        fake_session = MagicMock()
+        fake_session.get.side_effect = [MagicMock(status_code=200, headers={}, text=json.dumps(self.landing))] + [requests.exceptions.Timeout()] * 6
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        nhl_api_client.landing_cache.invalidate()
+
+        # Execute
+        first = nhl_api_client.get_game(2022020158)
+        second = nhl_api_client.get_game(2022020158)
+        unknown = nhl_api_client.get_game(2023020576)
+
+        # Verify
+        self.assertIsNotNone(first)
+        self.assertIs(first, second)
+        self.assertIsNone(unknown)
+
+    def test_get_schedule_falls_back_to_expired_schedule(self):
+        # Set up
+        game_week = {"gameWeek": [{"date": "2023-11-10", "games": [{"id": 2023020193, "awayTeam": {"id": 28}, "homeTeam": {"id": 3}, "startTimeUTC": "2023-11-11T00:00:00Z"}]}]}
+        fake_session = MagicMock()
+        fake_session.get.side_effect = [MagicMock(status_code=200, headers={}, text=json.dumps(game_week))] + [requests.exceptions.Timeout()] * 3
+        old_session = nhl_api_client.set_session(fake_session)
+        self.addCleanup(nhl_api_client.set_session, old_session)
+        nhl_api_client.get_schedule_cache().invalidate()
+
+        # Execute
+        first = nhl_api_client.get_schedule("2023-11-10")
+        nhl_api_client.get_schedule_cache().ttl_seconds, old_ttl_seconds = 0, nhl_api_client.get_schedule_cache().ttl_seconds
+        second = nhl_api_client.get_schedule("2023-11-10")
+
+        # Restore
+        nhl_api_client.get_schedule_cache().ttl_seconds = old_ttl_seconds
+        nhl_api_client.get_schedule_cache().invalidate()
+
+        # Verify
+        self.assertEqual(4, fake_session.get.call_count)
+        self.assertEqual([game.id for game in first], [game.id for game in second])
+
     def test_get_penalty_types(self):
         # This is a really dumb test, but I wasn't sure how map.get with default values works in python, so I wanted to write a scratch for it just to be sure I understood it.
         # But I figured if I am writing a scratch, I might as well keep it as a test case to reference later in case I forget. :)
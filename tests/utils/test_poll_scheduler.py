@@ -0,0 +1,138 @@
+import unittest
+from datetime import datetime, timedelta
+
+import pytz
+
+from src.datatypes.game import Game
+from src.datatypes.game_info import GameInfo
+from src.utils import poll_scheduler
+from src.utils.environment_util import environment_util
+from src.utils.nhl_api_client import GameState
+from src.utils.poll_scheduler import PollScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2023, 11, 11, 0, 0, tzinfo=pytz.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += timedelta(seconds=seconds)
+
+
+def create_game(game_id: int, start_time: datetime, game_clock: str = "--") -> Game:
+    return Game(game_id, None, None, start_time, None, GameInfo(current_period="1st", game_clock=game_clock), None, None, None, None)
+
+
+class TestPollScheduler(unittest.TestCase):
+
+    def setUp(self):
+        # Save old values
+        self.old_minutes_before_game_start_to_create_post = environment_util.minutes_before_game_start_to_create_post
+        self.old_minutes_after_game_end_to_update_post = environment_util.minutes_after_game_end_to_update_post
+
+        # Set up
+        environment_util.minutes_before_game_start_to_create_post = 60
+        environment_util.minutes_after_game_end_to_update_post = 10
+        self.clock = FakeClock()
+        self.scheduler = PollScheduler(clock=self.clock)
+
+    def tearDown(self):
+        # Restore
+        environment_util.minutes_before_game_start_to_create_post = self.old_minutes_before_game_start_to_create_post
+        environment_util.minutes_after_game_end_to_update_post = self.old_minutes_after_game_end_to_update_post
+
+    def test_get_game_state(self):
+        start_time = self.clock.now
+        self.assertEqual(GameState.PRE, poll_scheduler.get_game_state(create_game(1, start_time, "--")))
+        self.assertEqual(GameState.LIVE, poll_scheduler.get_game_state(create_game(1, start_time, "12:34")))
+        self.assertEqual(GameState.LIVE, poll_scheduler.get_game_state(create_game(1, start_time, "INT")))
+        self.assertEqual(GameState.FINAL, poll_scheduler.get_game_state(create_game(1, start_time, "FINAL")))
+
+    def test_new_games_are_due(self):
+        schedule = [create_game(1, self.clock.now), create_game(2, self.clock.now)]
+        self.assertEqual(schedule, self.scheduler.get_due_games(schedule))
+
+    def test_poll_interval_depends_on_game_state(self):
+        # Set up
+        schedule = [create_game(1, self.clock.now), create_game(2, self.clock.now), create_game(3, self.clock.now), create_game(4, self.clock.now)]
+        games = [create_game(1, self.clock.now, "--"), create_game(2, self.clock.now, "12:34"), create_game(3, self.clock.now, "INT"), create_game(4, self.clock.now, "FINAL")]
+
+        # Execute
+        self.scheduler.update(schedule, games)
+
+        # Verify
+        self.assertEqual([], self.scheduler.get_due_games(schedule))
+        self.assertEqual(poll_scheduler.LIVE_POLL_SECONDS, self.scheduler.get_seconds_until_next_poll(schedule))
+        self.clock.advance(poll_scheduler.LIVE_POLL_SECONDS)
+        self.assertEqual([schedule[1]], self.scheduler.get_due_games(schedule))
+        self.clock.advance(poll_scheduler.INTERMISSION_POLL_SECONDS - poll_scheduler.LIVE_POLL_SECONDS)
+        self.assertEqual([schedule[0], schedule[1], schedule[2]], self.scheduler.get_due_games(schedule))
+        self.clock.advance(poll_scheduler.FINAL_POLL_SECONDS - poll_scheduler.INTERMISSION_POLL_SECONDS)
+        self.assertEqual(schedule, self.scheduler.get_due_games(schedule))
+
+    def test_failed_game_is_retried(self):
+        # Set up
+        schedule = [create_game(1, self.clock.now)]
+
+        # Execute
+        self.scheduler.update(schedule, [None])
+
+        # Verify
+        self.assertEqual([], self.scheduler.get_due_games(schedule))
+        self.assertEqual([], self.scheduler.get_latest_games())
+        self.clock.advance(poll_scheduler.ERROR_POLL_SECONDS)
+        self.assertEqual(schedule, self.scheduler.get_due_games(schedule))
+
+    def test_final_game_stops_being_polled(self):
+        # Set up
+        schedule = [create_game(1, self.clock.now)]
+        final_game = create_game(1, self.clock.now, "FINAL")
+
+        # Execute
+        self.scheduler.update(schedule, [final_game])
+        self.clock.advance(poll_scheduler.FINAL_POLL_SECONDS)
+        self.scheduler.update(schedule, [final_game])
+        self.clock.advance(10 * 60)
+        due_after_window = self.scheduler.get_due_games(schedule)
+        self.scheduler.update(schedule, [final_game])
+
+        # Verify
+        self.assertEqual(schedule, due_after_window)
+        self.assertEqual([], self.scheduler.get_due_games(schedule))
+        self.clock.advance(60 * 60)
+        self.assertEqual([], self.scheduler.get_due_games(schedule))
+        self.assertEqual(poll_scheduler.MAX_SLEEP_SECONDS, self.scheduler.get_seconds_until_next_poll(schedule))
+
+    def test_sleep_until_post_window_opens(self):
+        # Set up
+        schedule = [create_game(1, self.clock.now + timedelta(minutes=70))]
+
+        # Execute
+        result = self.scheduler.get_seconds_until_next_poll(schedule)
+
+        # Verify
+        self.assertEqual(10 * 60, result)
+
+    def test_sleep_is_capped(self):
+        schedule = [create_game(1, self.clock.now + timedelta(days=1))]
+        self.assertEqual(poll_scheduler.MAX_SLEEP_SECONDS, self.scheduler.get_seconds_until_next_poll(schedule))
+        self.assertEqual(poll_scheduler.MAX_SLEEP_SECONDS, self.scheduler.get_seconds_until_next_poll([]))
+
+    def test_games_removed_from_schedule_are_forgotten(self):
+        # Set up
+        schedule = [create_game(1, self.clock.now), create_game(2, self.clock.now)]
+        self.scheduler.update(schedule, [create_game(1, self.clock.now, "12:34"), create_game(2, self.clock.now, "12:34")])
+
+        # Execute
+        self.scheduler.get_due_games(schedule[1:])
+
+        # Verify
+        self.assertEqual([2], [game.id for game in self.scheduler.get_latest_games()])
+        self.assertEqual([schedule[0]], self.scheduler.get_due_games(schedule[:1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,11 @@
+import copy
+import dataclasses
 import datetime
+import glob
+import json
+import os
 import unittest
+from unittest.mock import MagicMock
 
 from dateutil.tz import tzutc
 
@@ -13,9 +19,15 @@ from src.datatypes.shootout import Shootout
 from src.datatypes.team_stats import TeamStats
 from src.datatypes.teams import Team
 from src.db.comments.comments_dao import comments_dao
+from src.db.game_day_threads.game_day_threads_dao import game_day_threads_dao
+from src.utils import nhl_api_client
 from src.utils.environment_util import environment_util
 from src.utils.post_util import Table
 from src.datatypes.game import GameType
+import tests.test_constants as test_constants
+
+GOLDEN_PATH = f"{test_constants.TEST_RES_PATH}/golden"
+LANDING_FIXTURES = sorted(glob.glob(f"{test_constants.TEST_RES_PATH}/*_landing*.json"))
 
 
 # TODO: add tests for each table function
@@ -249,5 +261,116 @@ I am open source! Report issues, contribute, and fund me [on my GitHub page](htt
         self.assertEqual(thread_body, expected)
 
 
+class TestTable(unittest.TestCase):
+
+    def test_empty_table(self):
+        self.assertEqual("", Table().render())
+        self.assertEqual("", Table(columns=5, rows=5).render())
+
+    def test_preallocated_table_matches_growing_table(self):
+        growing = Table()
+        preallocated = Table(columns=3, rows=4)
+        for table in [growing, preallocated]:
+            table.set(2, 3, "c")
+            table.set(0, 0, "a")
+            table.set(1, 1, 2)
+        self.assertEqual(growing.render(), preallocated.render())
+        self.assertEqual(2, growing.max_x)
+        self.assertEqual(3, growing.max_y)
+
+    def test_set_outside_preallocated_shape(self):
+        expected = """| a |  |  |
+|:-:|:-:|:-:|
+|  |  |  |
+|  |  | b |"""
+        table = Table(columns=1, rows=1)
+        table.set(0, 0, "a")
+        table.set(2, 2, "b")
+        self.assertEqual(expected, table.render())
+
+    def test_get(self):
+        table = Table()
+        table.set(1, 1, "a")
+        self.assertEqual("a", table.get(1, 1))
+        self.assertEqual("", table.get(0, 1))
+        self.assertEqual("", table.get(10, 10))
+        self.assertEqual(1, table.max_x)
+
+
+class TestGoldenBodies(unittest.TestCase):
+    """
+    Renders the bodies for every landing fixture and compares them byte for byte with the files in tests/res/golden.
+    """
+
+    def setUp(self):
+        self.maxDiff = None
+        self.games = {}
+        for fixture in LANDING_FIXTURES:
+            with open(fixture, "r") as file:
+                self.games[os.path.basename(fixture)[:-len(".json")]] = nhl_api_client.parse_game(json.load(file))
+
+    def test_gdt_bodies(self):
+        post_util.render_cache.invalidate()
+        self.assertTrue(self.games)
+        for name, game in self.games.items():
+            with self.subTest(fixture=name):
+                with open(f"{GOLDEN_PATH}/{name}_gdt_body.md", "r") as file:
+                    self.assertEqual(file.read(), post_util.get_gdt_body(game))
+
+    def test_daily_thread_body(self):
+        # Save old values
+        old_get_comments = comments_dao.get_comments
+        old_get_game_day_threads = game_day_threads_dao.get_game_day_threads
+
+        # Set up
+        comments_dao.get_comments = MagicMock(return_value={})
+        game_day_threads_dao.get_game_day_threads = MagicMock(return_value={})
+
+        # Execute
+        thread_body = post_util.get_daily_thread_body(list(self.games.values()))
+
+        # Restore
+        comments_dao.get_comments = old_get_comments
+        game_day_threads_dao.get_game_day_threads = old_get_game_day_threads
+
+        # Verify
+        with open(f"{GOLDEN_PATH}/landings_daily_thread_body.md", "r") as file:
+            self.assertEqual(file.read(), thread_body)
+
+
 if __name__ == '__main__':
     unittest.main()
+
+
+class TestGameDetailsRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        with open(f"{test_constants.TEST_RES_PATH}/2022020158_landing.json", "r") as file:
+            self.game = nhl_api_client.parse_game(json.load(file))
+        post_util.render_cache.invalidate()
+        post_util.render_cache.hits = 0
+        post_util.render_cache.misses = 0
+
+    def test_unchanged_game_is_not_rendered_again(self):
+        details = post_util.get_game_details(self.game)
+        misses = post_util.render_cache.misses
+        self.assertEqual(details, post_util.get_game_details(copy.deepcopy(self.game)))
+        self.assertEqual(misses, post_util.render_cache.misses)
+
+    def test_gdt_body_and_comment_share_the_details(self):
+        details = post_util.get_game_details(self.game)
+        misses = post_util.render_cache.misses
+        self.assertIn(details, post_util.get_gdt_body(self.game))
+        self.assertEqual(misses, post_util.render_cache.misses)
+
+    def test_only_changed_sections_are_rendered_again(self):
+        post_util.get_game_details(self.game)
+        game = dataclasses.replace(self.game, penalties=self.game.penalties[:-1])
+        misses = post_util.render_cache.misses
+
+        details = post_util.get_game_details(game)
+
+        # The penalty details and the details they are part of
+        self.assertEqual(misses + 2, post_util.render_cache.misses)
+        post_util.render_cache.invalidate()
+        self.assertEqual(post_util.get_game_details(game), details)
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from src.utils.rate_limiter import BUCKET_COMMENT, BUCKET_POST, RateLimiter, RetryPolicy, TokenBucket
+from tests.fake_clock import FakeClock
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(2, 0.5, self.clock.time, self.clock.sleep)
+
+    def test_burst_then_rate(self):
+        self.assertEqual(0, self.bucket.acquire())
+        self.assertEqual(0, self.bucket.acquire())
+        self.assertAlmostEqual(2, self.bucket.acquire())
+        self.assertAlmostEqual(2, self.bucket.acquire())
+        self.assertAlmostEqual(4, self.clock.now)
+
+    def test_try_acquire(self):
+        self.assertTrue(self.bucket.try_acquire())
+        self.assertTrue(self.bucket.try_acquire())
+        self.assertFalse(self.bucket.try_acquire())
+        self.clock.now += 2
+        self.assertTrue(self.bucket.try_acquire())
+        self.assertEqual([], self.clock.sleeps)
+
+    def test_refill_is_capped(self):
+        self.bucket.acquire()
+        self.bucket.acquire()
+        self.clock.now += 100
+        self.assertTrue(self.bucket.try_acquire())
+        self.assertTrue(self.bucket.try_acquire())
+        self.assertFalse(self.bucket.try_acquire())
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_buckets_are_separate(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter({BUCKET_POST: (1, 1.0), BUCKET_COMMENT: (1, 1.0)}, clock=clock.time, sleep=clock.sleep)
+        self.assertEqual(0, rate_limiter.acquire(BUCKET_POST))
+        self.assertEqual(0, rate_limiter.acquire(BUCKET_COMMENT))
+        self.assertAlmostEqual(1, rate_limiter.acquire(BUCKET_POST))
+
+    def test_retry_budget(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter(retry_budget=2, retry_budget_per_second=0.1, clock=clock.time, sleep=clock.sleep)
+        self.assertTrue(rate_limiter.try_spend_retry())
+        self.assertTrue(rate_limiter.try_spend_retry())
+        self.assertFalse(rate_limiter.try_spend_retry())
+        clock.now += 10
+        self.assertTrue(rate_limiter.try_spend_retry())
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_delays_grow_and_are_capped(self):
+        retry_policy = RetryPolicy(base_delay=1, max_delay=5, rng=random.Random(0))
+        for retry, cap in [(0, 1), (1, 2), (2, 4), (3, 5), (10, 5)]:
+            delays = [retry_policy.get_delay(retry) for _ in range(100)]
+            self.assertTrue(all(0 <= delay <= cap for delay in delays), f"retry {retry}: {max(delays)} > {cap}")
+            self.assertGreater(max(delays), cap / 2)
+
+    def test_jitter(self):
+        retry_policy = RetryPolicy(rng=random.Random(0))
+        self.assertGreater(len({retry_policy.get_delay(2) for _ in range(10)}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.utils.render_cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = RenderCache(max_entries=2)
+
+    def test_renders_once_per_input(self):
+        render = MagicMock(return_value="rendered")
+        self.assertEqual("rendered", self.cache.get_or_render("section", (1, 2), render))
+        self.assertEqual("rendered", self.cache.get_or_render("section", (1, 2), render))
+        render.assert_called_once()
+        self.assertEqual({"hits": 1, "misses": 1, "entries": 1}, self.cache.get_stats())
+
+    def test_changed_input_renders_again(self):
+        self.assertEqual("a", self.cache.get_or_render("section", (1,), lambda: "a"))
+        self.assertEqual("b", self.cache.get_or_render("section", (1, 2), lambda: "b"))
+
+    def test_sections_are_keyed_separately(self):
+        self.assertEqual("a", self.cache.get_or_render("section a", (1,), lambda: "a"))
+        self.assertEqual("b", self.cache.get_or_render("section b", (1,), lambda: "b"))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.get_or_render("section", 1, lambda: "1")
+        self.cache.get_or_render("section", 2, lambda: "2")
+        self.cache.get_or_render("section", 1, lambda: "1")
+        self.cache.get_or_render("section", 3, lambda: "3")
+        render = MagicMock(return_value="1")
+        self.cache.get_or_render("section", 1, render)
+        render.assert_not_called()
+        render = MagicMock(return_value="2")
+        self.cache.get_or_render("section", 2, render)
+        render.assert_called_once()
+
+    def test_invalidate(self):
+        self.cache.get_or_render("section", 1, lambda: "1")
+        self.cache.invalidate()
+        render = MagicMock(return_value="1")
+        self.cache.get_or_render("section", 1, render)
+        render.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from datetime import datetime
+
+from src.datatypes.game import Game
+from src.utils.schedule_cache import ScheduleCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestScheduleCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ScheduleCache(ttl_seconds=60, clock=self.clock)
+        self.game = Game(2023020193, None, None, datetime(2023, 11, 11), None, None, None, None, None, None)
+
+    def test_get_missing_day(self):
+        self.assertIsNone(self.cache.get("2023-11-10"))
+
+    def test_put_and_get(self):
+        self.cache.put("2023-11-10", [self.game])
+        self.assertEqual([self.game], self.cache.get("2023-11-10"))
+
+    def test_empty_day_is_cached(self):
+        self.cache.put("2023-11-10", [])
+        self.assertEqual([], self.cache.get("2023-11-10"))
+
+    def test_expired_day(self):
+        self.cache.put("2023-11-10", [self.game])
+        self.clock.now = 59
+        self.assertIsNotNone(self.cache.get("2023-11-10"))
+        self.clock.now = 60
+        self.assertIsNone(self.cache.get("2023-11-10"))
+        self.assertEqual([self.game], self.cache.get("2023-11-10", allow_expired=True))
+
+    def test_returned_list_is_a_copy(self):
+        self.cache.put("2023-11-10", [self.game])
+        self.cache.get("2023-11-10").clear()
+        self.assertEqual([self.game], self.cache.get("2023-11-10"))
+
+    def test_invalidate(self):
+        self.cache.put("2023-11-10", [self.game])
+        self.cache.put("2023-11-11", [])
+        self.cache.invalidate("2023-11-10")
+        self.assertIsNone(self.cache.get("2023-11-10"))
+        self.assertIsNotNone(self.cache.get("2023-11-11"))
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get("2023-11-11"))
+
+
+if __name__ == '__main__':
+    unittest.main()